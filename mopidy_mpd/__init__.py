@@ -25,6 +25,16 @@ class Extension(ext.Extension):
         schema["zeroconf"] = config.String(optional=True)
         schema["command_blacklist"] = config.List(optional=True)
         schema["default_playlist_scheme"] = config.String()
+        schema["idle_batch_window"] = config.Integer(minimum=0)
+        schema["lookup_chunk_size"] = config.Integer(minimum=1)
+        schema["browse_concurrency"] = config.Integer(minimum=1)
+        schema["browse_max_entries"] = config.Integer(minimum=1)
+        schema["browse_index_size"] = config.Integer(minimum=1)
+        schema["persist_browse_index"] = config.Boolean()
+        schema["stats_cache_ttl"] = config.Integer(minimum=1)
+        schema["search_cache_size"] = config.Integer(minimum=0)
+        schema["search_cache_ttl"] = config.Integer(minimum=1)
+        schema["recv_buffer_size"] = config.Integer(minimum=1)
         return schema
 
     def setup(self, registry):
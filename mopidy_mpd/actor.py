@@ -2,9 +2,21 @@ import logging
 
 import pykka
 
-from mopidy import exceptions, listener, zeroconf
+from mopidy import exceptions, zeroconf
 from mopidy.core import CoreListener
-from mopidy_mpd import network, session, uri_mapper
+from mopidy_mpd import (
+    Extension,
+    idle_notifier,
+    library_stats,
+    network,
+    playlist_cache,
+    search_cache,
+    session,
+    status_cache,
+    tracklist_index,
+    tracklist_journal,
+    uri_mapper,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +44,34 @@ class MpdFrontend(pykka.ThreadingActor, CoreListener):
 
         self.hostname = network.format_hostname(config["mpd"]["hostname"])
         self.port = config["mpd"]["port"]
-        self.uri_map = uri_mapper.MpdUriMapper(core)
+        self.uri_map = uri_mapper.MpdUriMapper(
+            core, max_browse_entries=config["mpd"]["browse_index_size"]
+        )
+        if config["mpd"]["persist_browse_index"]:
+            self.browse_index_path = (
+                Extension.get_data_dir(config) / "browse_index.sqlite3"
+            )
+        else:
+            self.browse_index_path = None
+        self.tracklist_journal = tracklist_journal.TracklistJournal(core)
+        self.tracklist_index = tracklist_index.TracklistIndex(core)
+        self.status_cache = status_cache.StatusCache(core)
+        self.idle_notifier = idle_notifier.IdleNotifier(
+            window=config["mpd"]["idle_batch_window"]
+        )
+
+        self.library_stats = library_stats.LibraryStats(
+            core,
+            ttl=config["mpd"]["stats_cache_ttl"],
+            lookup_chunk_size=config["mpd"]["lookup_chunk_size"],
+        )
+        self.search_cache = search_cache.SearchCache(
+            max_size=config["mpd"]["search_cache_size"],
+            ttl=config["mpd"]["search_cache_ttl"],
+        )
+        self.playlist_cache = playlist_cache.PlaylistCache(
+            core, lookup_chunk_size=config["mpd"]["lookup_chunk_size"]
+        )
 
         self.zeroconf_name = config["mpd"]["zeroconf"]
         self.zeroconf_service = None
@@ -49,9 +88,17 @@ class MpdFrontend(pykka.ThreadingActor, CoreListener):
                     "config": config,
                     "core": core,
                     "uri_map": self.uri_map,
+                    "tracklist_journal": self.tracklist_journal,
+                    "tracklist_index": self.tracklist_index,
+                    "idle_notifier": self.idle_notifier,
+                    "library_stats": self.library_stats,
+                    "status_cache": self.status_cache,
+                    "search_cache": self.search_cache,
+                    "playlist_cache": self.playlist_cache,
                 },
                 max_connections=config["mpd"]["max_connections"],
                 timeout=config["mpd"]["connection_timeout"],
+                recv_buffer_size=config["mpd"]["recv_buffer_size"],
             )
         except OSError as exc:
             raise exceptions.FrontendError(f"MPD server startup failed: {exc}")
@@ -63,6 +110,9 @@ class MpdFrontend(pykka.ThreadingActor, CoreListener):
         return server
 
     def on_start(self):
+        if self.browse_index_path is not None:
+            self.uri_map.load_browse_index(self.browse_index_path)
+
         if self.zeroconf_name and not network.is_unix_socket(
             self.server.server_socket
         ):
@@ -80,6 +130,17 @@ class MpdFrontend(pykka.ThreadingActor, CoreListener):
             session_actor.stop()
 
         self.server.stop()
+        self.idle_notifier.stop()
+
+        logger.debug(
+            "MPD search cache: %(size)d/%(max_size)d queries cached, "
+            "%(hits)d hits, %(misses)d misses, %(expirations)d expirations, "
+            "%(evictions)d evictions",
+            self.search_cache.metrics(),
+        )
+
+        if self.browse_index_path is not None:
+            self.uri_map.save_browse_index(self.browse_index_path)
 
     def on_event(self, event, **kwargs):
         if event not in _CORE_EVENTS_TO_IDLE_SUBSYSTEMS:
@@ -87,8 +148,25 @@ class MpdFrontend(pykka.ThreadingActor, CoreListener):
                 "Got unexpected event: %s(%s)", event, ", ".join(kwargs)
             )
         else:
+            self.status_cache.invalidate()
+            if event == "tracklist_changed":
+                self.tracklist_journal.invalidate()
+                self.tracklist_index.invalidate()
+            elif event == "playlists_loaded":
+                self.uri_map.playlists_loaded()
+                self.playlist_cache.playlists_loaded()
+            elif event == "playlist_changed":
+                self.uri_map.playlist_changed(kwargs["playlist"])
+                self.playlist_cache.playlist_changed(kwargs["playlist"])
+            elif event == "playlist_deleted":
+                self.uri_map.playlist_deleted(kwargs["uri"])
+                self.playlist_cache.playlist_deleted(kwargs["uri"])
+            elif event in ("track_playback_started", "track_playback_resumed"):
+                self.library_stats.playback_started()
+            elif event in ("track_playback_paused", "track_playback_ended"):
+                self.library_stats.playback_stopped()
             self.send_idle(_CORE_EVENTS_TO_IDLE_SUBSYSTEMS[event])
 
     def send_idle(self, subsystem):
         if subsystem:
-            listener.send(session.MpdSession, subsystem)
+            self.idle_notifier.notify(subsystem)
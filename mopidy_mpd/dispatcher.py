@@ -1,9 +1,11 @@
+import collections
+import inspect
 import logging
 import re
 
 import pykka
 
-from mopidy_mpd import exceptions, protocol, tokenize
+from mopidy_mpd import exceptions, protocol, status_cache, tokenize
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +20,22 @@ class MpdDispatcher:
     back to the MPD session.
     """
 
-    _noidle = re.compile(r"^noidle$")
+    _noidle = "noidle"
 
-    def __init__(self, session=None, config=None, core=None, uri_map=None):
+    def __init__(
+        self,
+        session=None,
+        config=None,
+        core=None,
+        uri_map=None,
+        tracklist_journal=None,
+        tracklist_index=None,
+        idle_notifier=None,
+        library_stats=None,
+        status_cache=None,
+        search_cache=None,
+        playlist_cache=None,
+    ):
         self.config = config
         self.authenticated = False
         self.command_list_receiving = False
@@ -28,26 +43,36 @@ class MpdDispatcher:
         self.command_list = []
         self.command_list_index = None
         self.context = MpdContext(
-            self, session=session, config=config, core=core, uri_map=uri_map
+            self,
+            session=session,
+            config=config,
+            core=core,
+            uri_map=uri_map,
+            tracklist_journal=tracklist_journal,
+            tracklist_index=tracklist_index,
+            idle_notifier=idle_notifier,
+            library_stats=library_stats,
+            status_cache=status_cache,
+            search_cache=search_cache,
+            playlist_cache=playlist_cache,
         )
 
     def handle_request(self, request, current_command_list_index=None):
         """Dispatch incoming requests to the correct handler."""
         self.command_list_index = current_command_list_index
-        response = []
-        filter_chain = [
-            self._catch_mpd_ack_errors_filter,
-            self._authenticate_filter,
-            self._command_list_filter,
-            self._idle_filter,
-            self._add_ok_filter,
-            self._call_handler_filter,
-        ]
-        return self._call_next_filter(request, response, filter_chain)
-
-    def handle_idle(self, subsystem):
+        try:
+            response = self._handle_request(request)
+        except exceptions.MpdAckError as mpd_ack_error:
+            return [self._format_mpd_ack(mpd_ack_error)]
+        if inspect.isgenerator(response):
+            return self._catch_mpd_ack_errors_in_stream(response)
+        return response
+
+    def handle_idle(self, subsystem=None):
         # TODO: validate against mopidy_mpd/protocol/status.SUBSYSTEMS
-        self.context.events.add(subsystem)
+        if subsystem is not None:
+            self.context.events.add(subsystem)
+        self.context.collect_idle_events()
 
         subsystems = self.context.subscriptions.intersection(
             self.context.events
@@ -61,55 +86,74 @@ class MpdDispatcher:
         response.append("OK")
         self.context.subscriptions = set()
         self.context.events = set()
+        self.context.unregister_idle()
         self.context.session.send_lines(response)
 
-    def _call_next_filter(self, request, response, filter_chain):
-        if filter_chain:
-            next_filter = filter_chain.pop(0)
-            return next_filter(request, response, filter_chain)
-        else:
-            return response
+    def _handle_request(self, request):
+        # The request passes through these steps in order: authentication,
+        # queueing in command lists, idle state checks, calling the handler
+        # and adding the OK that ends a response outside of command lists.
+        if not self.authenticated:
+            self._authenticate(request)
 
-    # Filter: catch MPD ACK errors
+        if self._is_receiving_command_list(request):
+            self.command_list.append(request)
+            return []
+
+        is_noidle = request == self._noidle
+        if self._is_currently_idle():
+            if not is_noidle:
+                logger.debug(
+                    "Client sent us %s, only %s is allowed while in "
+                    "the idle state",
+                    repr(request),
+                    repr(self._noidle),
+                )
+                self.context.session.close()
+                return []
+        elif is_noidle:
+            return []  # noidle was called before idle
 
-    def _catch_mpd_ack_errors_filter(self, request, response, filter_chain):
         try:
-            return self._call_next_filter(request, response, filter_chain)
-        except exceptions.MpdAckError as mpd_ack_error:
-            if self.command_list_index is not None:
-                mpd_ack_error.index = self.command_list_index
-            return [mpd_ack_error.get_mpd_ack()]
+            response = self._format_response(self._call_handler(request))
+        except pykka.ActorDeadError as e:
+            logger.warning("Tried to communicate with dead actor.")
+            raise exceptions.MpdSystemError(e)
 
-    # Filter: authenticate
+        if self._is_currently_idle():
+            return []
 
-    def _authenticate_filter(self, request, response, filter_chain):
-        if self.authenticated:
-            return self._call_next_filter(request, response, filter_chain)
-        elif self.config["mpd"]["password"] is None:
-            self.authenticated = True
-            return self._call_next_filter(request, response, filter_chain)
-        else:
-            command_name = request.split(" ")[0]
-            command = protocol.commands.handlers.get(command_name)
-            if command and not command.auth_required:
-                return self._call_next_filter(request, response, filter_chain)
-            else:
-                raise exceptions.MpdPermissionError(command=command_name)
+        if self._is_receiving_command_list(
+            request
+        ) or self._is_processing_command_list(request):
+            # Command lists only end with a single OK after the last command
+            return list(response)
 
-    # Filter: command list
+        if inspect.isgenerator(response):
+            return self._add_ok_to_stream(response)
+        if not self._has_error(response):
+            response.append("OK")
+        return response
 
-    def _command_list_filter(self, request, response, filter_chain):
-        if self._is_receiving_command_list(request):
-            self.command_list.append(request)
-            return []
-        else:
-            response = self._call_next_filter(request, response, filter_chain)
-            if self._is_receiving_command_list(
-                request
-            ) or self._is_processing_command_list(request):
-                if response and response[-1] == "OK":
-                    response = response[:-1]
-            return response
+    def _catch_mpd_ack_errors_in_stream(self, response):
+        try:
+            yield from response
+        except exceptions.MpdAckError as mpd_ack_error:
+            yield self._format_mpd_ack(mpd_ack_error)
+
+    def _format_mpd_ack(self, mpd_ack_error):
+        if self.command_list_index is not None:
+            mpd_ack_error.index = self.command_list_index
+        return mpd_ack_error.get_mpd_ack()
+
+    def _authenticate(self, request):
+        if self.config["mpd"]["password"] is None:
+            self.authenticated = True
+            return
+        command_name = request.split(" ")[0]
+        command = protocol.commands.handlers.get(command_name)
+        if not command or command.auth_required:
+            raise exceptions.MpdPermissionError(command=command_name)
 
     def _is_receiving_command_list(self, request):
         return self.command_list_receiving and request != "command_list_end"
@@ -120,53 +164,16 @@ class MpdDispatcher:
             and request != "command_list_end"
         )
 
-    # Filter: idle
-
-    def _idle_filter(self, request, response, filter_chain):
-        if self._is_currently_idle() and not self._noidle.match(request):
-            logger.debug(
-                "Client sent us %s, only %s is allowed while in "
-                "the idle state",
-                repr(request),
-                repr("noidle"),
-            )
-            self.context.session.close()
-            return []
-
-        if not self._is_currently_idle() and self._noidle.match(request):
-            return []  # noidle was called before idle
-
-        response = self._call_next_filter(request, response, filter_chain)
-
-        if self._is_currently_idle():
-            return []
-        else:
-            return response
-
     def _is_currently_idle(self):
         return bool(self.context.subscriptions)
 
-    # Filter: add OK
-
-    def _add_ok_filter(self, request, response, filter_chain):
-        response = self._call_next_filter(request, response, filter_chain)
-        if not self._has_error(response):
-            response.append("OK")
-        return response
+    def _add_ok_to_stream(self, response):
+        yield from response
+        yield "OK"
 
     def _has_error(self, response):
         return response and response[-1].startswith("ACK")
 
-    # Filter: call handler
-
-    def _call_handler_filter(self, request, response, filter_chain):
-        try:
-            response = self._format_response(self._call_handler(request))
-            return self._call_next_filter(request, response, filter_chain)
-        except pykka.ActorDeadError as e:
-            logger.warning("Tried to communicate with dead actor.")
-            raise exceptions.MpdSystemError(e)
-
     def _call_handler(self, request):
         tokens = tokenize.split(request)
         # TODO: check that blacklist items are valid commands?
@@ -175,18 +182,44 @@ class MpdDispatcher:
             logger.warning("MPD client used blacklisted command: %s", tokens[0])
             raise exceptions.MpdDisabled(command=tokens[0])
         try:
-            return protocol.commands.call(tokens, context=self.context)
+            result = protocol.commands.call(tokens, context=self.context)
         except exceptions.MpdAckError as exc:
             if exc.command is None:
                 exc.command = tokens[0]
             raise
+        finally:
+            if tokens and tokens[0] not in status_cache.READ_ONLY_COMMANDS:
+                self.context.invalidate_status()
+        if inspect.isgenerator(result):
+            return self._call_handler_stream(result, tokens[0])
+        return result
+
+    def _call_handler_stream(self, result, command):
+        # Handlers returning generators run lazily while the response is
+        # sent, so errors must be handled as they are iterated over.
+        try:
+            yield from result
+        except exceptions.MpdAckError as exc:
+            if exc.command is None:
+                exc.command = command
+            raise
+        except pykka.ActorDeadError as e:
+            logger.warning("Tried to communicate with dead actor.")
+            raise exceptions.MpdSystemError(e)
 
     def _format_response(self, response):
+        if inspect.isgenerator(response):
+            return self._format_stream(response)
         formatted_response = []
         for element in self._listify_result(response):
             formatted_response.extend(self._format_lines(element))
         return formatted_response
 
+    def _format_stream(self, response):
+        for element in response:
+            for line in self._listify_result(element):
+                yield from self._format_lines(line)
+
     def _listify_result(self, result):
         if result is None:
             return []
@@ -239,19 +272,119 @@ class MpdContext:
     #: The subsytems that we want to be notified about in idle mode.
     subscriptions = None
 
+    #: The shared :class:`mopidy_mpd.tracklist_journal.TracklistJournal`, if
+    #: any.
+    tracklist_journal = None
+
+    #: The shared :class:`mopidy_mpd.tracklist_index.TracklistIndex`, if any.
+    tracklist_index = None
+
+    #: The shared :class:`mopidy_mpd.idle_notifier.IdleNotifier`, if any.
+    idle_notifier = None
+
+    #: The shared :class:`mopidy_mpd.library_stats.LibraryStats`, if any.
+    library_stats = None
+
+    #: The shared :class:`mopidy_mpd.status_cache.StatusCache`, if any.
+    status_cache = None
+
+    #: The shared :class:`mopidy_mpd.search_cache.SearchCache`, if any.
+    search_cache = None
+
+    #: The shared :class:`mopidy_mpd.playlist_cache.PlaylistCache`, if any.
+    playlist_cache = None
+
+    #: Results of the session's recent queries with a ``window``, by query.
+    #: Maps to tuples ``(expires, results)``.
+    query_results = None
+
+    #: The idle notifier version up to which changes are in :attr:`events`.
+    idle_version = 0
+
+    #: Maximum number of URIs to look up in one library lookup when browsing.
+    lookup_chunk_size = 100
+
+    #: Maximum number of directories to browse at the same time when browsing
+    #: recursively.
+    browse_concurrency = 4
+
+    #: Maximum number of entries to return from a single browse.
+    browse_max_entries = 100000
+
     _uri_map = None
 
     def __init__(
-        self, dispatcher, session=None, config=None, core=None, uri_map=None
+        self,
+        dispatcher,
+        session=None,
+        config=None,
+        core=None,
+        uri_map=None,
+        tracklist_journal=None,
+        tracklist_index=None,
+        idle_notifier=None,
+        library_stats=None,
+        status_cache=None,
+        search_cache=None,
+        playlist_cache=None,
     ):
         self.dispatcher = dispatcher
         self.session = session
         if config is not None:
             self.password = config["mpd"]["password"]
+            self.lookup_chunk_size = config["mpd"].get(
+                "lookup_chunk_size", self.lookup_chunk_size
+            )
+            self.browse_concurrency = config["mpd"].get(
+                "browse_concurrency", self.browse_concurrency
+            )
+            self.browse_max_entries = config["mpd"].get(
+                "browse_max_entries", self.browse_max_entries
+            )
         self.core = core
         self.events = set()
         self.subscriptions = set()
+        self.query_results = collections.OrderedDict()
         self._uri_map = uri_map
+        self.tracklist_journal = tracklist_journal
+        self.tracklist_index = tracklist_index
+        self.idle_notifier = idle_notifier
+        self.library_stats = library_stats
+        self.status_cache = status_cache
+        self.search_cache = search_cache
+        self.playlist_cache = playlist_cache
+        if idle_notifier is not None:
+            self.idle_version = idle_notifier.version
+
+    def collect_idle_events(self):
+        """
+        Add the subsystems the idle notifier has seen change since last time
+        to the pending :attr:`events`.
+        """
+        if self.idle_notifier is None:
+            return
+        changed, self.idle_version = self.idle_notifier.changes_since(
+            self.idle_version
+        )
+        self.events.update(changed)
+
+    def register_idle(self):
+        """Get notified by the idle notifier while waiting in idle."""
+        if self.idle_notifier is not None:
+            self.idle_notifier.register(self.session.actor_ref)
+
+    def unregister_idle(self):
+        """Stop getting notified by the idle notifier."""
+        if self.idle_notifier is not None:
+            self.idle_notifier.unregister(self.session.actor_ref)
+
+    def invalidate_status(self):
+        """
+        Invalidate the shared status snapshot after a command that may have
+        changed the player state, instead of waiting for the core event.
+        """
+        if self.status_cache is not None:
+            self.status_cache.invalidate()
 
     def lookup_playlist_uri_from_name(self, name):
         """
@@ -265,6 +398,25 @@ class MpdContext:
         """
         return self._uri_map.playlist_name_from_uri(uri)
 
+    def playlist_changed(self, playlist):
+        """
+        Update the playlist mapping right away for a playlist created or
+        renamed by this session, instead of waiting for the core event.
+        """
+        if playlist is not None:
+            self._uri_map.playlist_changed(playlist)
+            if self.playlist_cache is not None:
+                self.playlist_cache.playlist_changed(playlist)
+
+    def playlist_deleted(self, uri):
+        """
+        Update the playlist mapping right away for a playlist deleted by this
+        session, instead of waiting for the core event.
+        """
+        self._uri_map.playlist_deleted(uri)
+        if self.playlist_cache is not None:
+            self.playlist_cache.playlist_deleted(uri)
+
     def browse(self, path, recursive=True, lookup=True):
         """
         Browse the contents of a given directory path.
@@ -282,6 +434,11 @@ class MpdContext:
 
         For all entries that are not tracks, the returned ``data`` will be
         :class:`None`.
+
+        Directories are traversed breadth-first, each listed in the order
+        returned by the backend. Raises
+        :class:`~mopidy_mpd.exceptions.MpdSystemError` once more than
+        :attr:`browse_max_entries` entries have been found.
         """
 
         path_parts = re.findall(r"[^/]+", path or "")
@@ -289,37 +446,106 @@ class MpdContext:
 
         uri = self._uri_map.uri_from_name(root_path)
         if uri is None:
+            # Walk down to the path, naming the entries of each directory like
+            # browsing it does, so names made unique are found again.
+            path = ""
             for part in path_parts:
-                for ref in self.core.library.browse(uri).get():
-                    if ref.type != ref.TRACK and ref.name == part:
-                        uri = ref.uri
-                        break
-                else:
+                path = "/".join([path, part])
+                uri = self._find_browse_uri(uri, path)
+                if uri is None:
                     raise exceptions.MpdNoExistError("Not found")
             root_path = self._uri_map.insert(root_path, uri)
 
         if recursive:
             yield (root_path, None)
 
-        path_and_futures = [(root_path, self.core.library.browse(uri))]
-        while path_and_futures:
-            base_path, future = path_and_futures.pop()
-            for ref in future.get():
-                if ref.name is None or ref.uri is None:
-                    continue
-
+        # Directories are browsed breadth-first, with up to
+        # browse_concurrency browse requests in flight at any time.
+        pending = collections.deque()
+        in_flight = collections.deque(
+            [(root_path, self.core.library.browse(uri))]
+        )
+        num_entries = 0
+        while in_flight:
+            base_path, future = in_flight.popleft()
+            refs = [
+                ref
+                for ref in future.get()
+                if ref.name is not None and ref.uri is not None
+            ]
+
+            num_entries += len(refs)
+            if num_entries > self.browse_max_entries:
+                raise exceptions.MpdSystemError(
+                    f"Too many entries to browse, limit is "
+                    f"{self.browse_max_entries:d}"
+                )
+
+            entries = []
+            for ref in refs:
                 path = "/".join([base_path, ref.name.replace("/", "")])
                 path = self._uri_map.insert(path, ref.uri)
+                entries.append((path, ref))
+                if recursive and ref.type != ref.TRACK:
+                    pending.append((path, ref.uri))
 
-                if ref.type == ref.TRACK:
-                    if lookup:
-                        # TODO: can we lookup all the refs at once now?
-                        yield (path, self.core.library.lookup(uris=[ref.uri]))
-                    else:
-                        yield (path, ref)
-                else:
+            while pending and len(in_flight) < self.browse_concurrency:
+                path, uri = pending.popleft()
+                in_flight.append((path, self.core.library.browse(uri)))
+
+            if lookup:
+                lookups = self._lookup_tracks(
+                    [ref.uri for ref in refs if ref.type == ref.TRACK]
+                )
+
+            for path, ref in entries:
+                if ref.type != ref.TRACK:
                     yield (path, None)
-                    if recursive:
-                        path_and_futures.append(
-                            (path, self.core.library.browse(ref.uri))
-                        )
+                elif lookup:
+                    yield (path, lookups[ref.uri])
+                else:
+                    yield (path, ref)
+
+    def _find_browse_uri(self, parent_uri, path):
+        """
+        Browse the directory ``parent_uri``, and return the URI of the
+        directory in it named ``path``, or :class:`None`.
+        """
+        base_path = path.rsplit("/", 1)[0]
+        result = None
+        for ref in self.core.library.browse(parent_uri).get():
+            if ref.name is None or ref.uri is None:
+                continue
+            name = "/".join([base_path, ref.name.replace("/", "")])
+            name = self._uri_map.insert(name, ref.uri)
+            if name == path and ref.type != ref.TRACK:
+                result = ref.uri
+        return result
+
+    def _lookup_tracks(self, uris):
+        """
+        Look up the URIs in chunks of :attr:`lookup_chunk_size` URIs.
+
+        All lookups are started right away. Returns a dict mapping each URI to
+        a future for a dict with the lookup result for just that URI.
+        """
+        lookups = {}
+        for start in range(0, len(uris), self.lookup_chunk_size):
+            chunk = uris[start : start + self.lookup_chunk_size]
+            future = self.core.library.lookup(uris=chunk)
+            for uri in chunk:
+                lookups[uri] = _LookupFuture(future, uri)
+        return lookups
+
+
+class _LookupFuture:
+
+    """Future for the result of one URI in a lookup of several URIs."""
+
+    def __init__(self, future, uri):
+        self._future = future
+        self._uri = uri
+
+    def get(self, timeout=None):
+        result = self._future.get(timeout=timeout)
+        return {self._uri: result.get(self._uri, [])}
@@ -0,0 +1,108 @@
+import threading
+
+import pykka
+from gi.repository import GLib
+
+#: Default number of milliseconds to collect idle events for before notifying
+#: sessions.
+DEFAULT_WINDOW = 10
+
+#: Message told to sessions waiting in idle when subsystems have changed.
+IDLE_MESSAGE = {"idle": True}
+
+
+class IdleNotifier:
+
+    """
+    Coalesces idle events and notifies the MPD sessions waiting in idle.
+
+    Subsystems changed within the window are delivered as one batch, and only
+    sessions currently in idle are told about it. Every batch bumps the
+    notifier's version, so sessions not in idle can collect what changed since
+    the last version they saw once they enter idle.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._timeout_id = None
+        self._version = 0
+        # Maps subsystem to the version of the last batch that changed it.
+        self._changed = {}
+        # Maps actor URN to actor ref of the sessions waiting in idle.
+        self._idle_sessions = {}
+
+    @property
+    def version(self):
+        with self._lock:
+            return self._version
+
+    def notify(self, subsystem):
+        """Mark the subsystem as changed, notifying sessions after the window."""
+        with self._lock:
+            self._pending.add(subsystem)
+            if self.window > 0:
+                if self._timeout_id is None:
+                    self._timeout_id = GLib.timeout_add(
+                        self.window, self._timeout_callback
+                    )
+                return
+        self.flush()
+
+    def flush(self):
+        """Notify idle sessions about all pending changes right away."""
+        with self._lock:
+            if self._timeout_id is not None:
+                GLib.source_remove(self._timeout_id)
+                self._timeout_id = None
+            if not self._pending:
+                return
+            self._version += 1
+            for subsystem in self._pending:
+                self._changed[subsystem] = self._version
+            self._pending = set()
+            idle_sessions = list(self._idle_sessions.values())
+
+        for actor_ref in idle_sessions:
+            try:
+                actor_ref.tell(IDLE_MESSAGE)
+            except pykka.ActorDeadError:
+                self.unregister(actor_ref)
+
+    def stop(self):
+        """Cancel any pending notification."""
+        with self._lock:
+            if self._timeout_id is not None:
+                GLib.source_remove(self._timeout_id)
+                self._timeout_id = None
+            self._pending = set()
+
+    def changes_since(self, version):
+        """
+        Return a tuple ``(subsystems, version)`` with the subsystems changed
+        after the given version, and the current version.
+        """
+        with self._lock:
+            changed = {
+                subsystem
+                for subsystem, changed_version in self._changed.items()
+                if changed_version > version
+            }
+            return changed, self._version
+
+    def register(self, actor_ref):
+        """Notify the session actor about changes until unregistered."""
+        with self._lock:
+            self._idle_sessions[actor_ref.actor_urn] = actor_ref
+
+    def unregister(self, actor_ref):
+        """Stop notifying the session actor about changes."""
+        with self._lock:
+            self._idle_sessions.pop(actor_ref.actor_urn, None)
+
+    def _timeout_callback(self):
+        with self._lock:
+            self._timeout_id = None
+        self.flush()
+        return False
@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+#: Default number of seconds to cache library statistics for.
+DEFAULT_TTL = 3600
+
+#: Default number of seconds to wait for the library to be first counted.
+DEFAULT_FIRST_COUNT_TIMEOUT = 10
+
+# Maximum number of chunks of URIs to look up at the same time.
+_LOOKUP_CONCURRENCY = 4
+
+
+class LibraryStats:
+
+    """
+    Keeps the statistics reported by the ``stats`` command.
+
+    Counting the library is expensive, so the library statistics are computed
+    in a background thread the first time they are asked for, and cached until
+    they are older than the TTL or are invalidated by a library update. Clients
+    cache the statistics, so the first caller waits for the first count, up to
+    a timeout, instead of being told the library is empty.
+
+    Artists, albums and songs are counted with ``get_distinct``, so tracks
+    without an album are counted too. The song URIs are then looked up in
+    chunks to sum up their lengths. Songs are only counted for backends that
+    support distinct ``uri`` values, and songs that cannot be looked up add
+    nothing to the total playtime.
+
+    Uptime and playtime are tracked from the playback events passed on by the
+    frontend.
+    """
+
+    #: The Mopidy core API. An instance of :class:`mopidy.core.Core`.
+    core = None
+
+    def __init__(
+        self,
+        core=None,
+        ttl=DEFAULT_TTL,
+        lookup_chunk_size=100,
+        first_count_timeout=DEFAULT_FIRST_COUNT_TIMEOUT,
+    ):
+        self.core = core
+        self.ttl = ttl
+        self.lookup_chunk_size = lookup_chunk_size
+        self.first_count_timeout = first_count_timeout
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._playtime = 0.0
+        self._playing_since = None
+        self._library = {"artists": 0, "albums": 0, "songs": 0}
+        self._db_playtime = 0
+        self._db_update = 0
+        self._refreshed_at = None
+        self._refresh_thread = None
+        # Set once the library has been counted, or failed to be counted.
+        self._counted = threading.Event()
+
+    def playback_started(self):
+        """Start counting playtime, unless already counting."""
+        with self._lock:
+            if self._playing_since is None:
+                self._playing_since = time.monotonic()
+
+    def playback_stopped(self):
+        """Stop counting playtime."""
+        with self._lock:
+            if self._playing_since is not None:
+                self._playtime += time.monotonic() - self._playing_since
+                self._playing_since = None
+
+    def invalidate(self):
+        """Recompute the library statistics the next time they are used."""
+        with self._lock:
+            self._refreshed_at = None
+
+    def refresh(self):
+        """Recompute the library statistics right away."""
+        if self.core is None:
+            return
+
+        library, db_playtime = self._count_library()
+        with self._lock:
+            self._library = library
+            self._db_playtime = db_playtime
+            self._db_update = int(time.time())
+            self._refreshed_at = time.monotonic()
+        self._counted.set()
+        logger.debug("Refreshed MPD library statistics: %s", library)
+
+    def refresh_in_background(self):
+        """Recompute the library statistics, unless already doing so."""
+        with self._lock:
+            if self._refresh_thread is not None:
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_thread_main,
+                name="MpdLibraryStats",
+                daemon=True,
+            )
+            self._refresh_thread.start()
+
+    def get(self):
+        """
+        Return the statistics as a dict with the keys of the ``stats`` command.
+
+        Stale library statistics are returned as they are while they are
+        recomputed in the background. The first call waits for the library to
+        be counted, and reports it as empty if that times out.
+        """
+        if self.core is not None and not self._counted.is_set():
+            self.refresh_in_background()
+            if not self._counted.wait(self.first_count_timeout):
+                logger.debug(
+                    "Timed out waiting for MPD library statistics after %ds",
+                    self.first_count_timeout,
+                )
+
+        with self._lock:
+            now = time.monotonic()
+            stale = (
+                self._refreshed_at is None
+                or now - self._refreshed_at >= self.ttl
+            )
+            playtime = self._playtime
+            if self._playing_since is not None:
+                playtime += now - self._playing_since
+            result = dict(self._library)
+            result["uptime"] = int(now - self._started)
+            result["db_playtime"] = self._db_playtime
+            result["db_update"] = self._db_update
+            result["playtime"] = int(playtime)
+
+        if stale and self.core is not None:
+            self.refresh_in_background()
+        return result
+
+    def _refresh_thread_main(self):
+        try:
+            self.refresh()
+        except Exception as exc:
+            logger.warning("Failed to count MPD library statistics: %s", exc)
+        finally:
+            with self._lock:
+                self._refresh_thread = None
+            self._counted.set()
+
+    def _count_library(self):
+        futures = {
+            field: self.core.library.get_distinct(field)
+            for field in ("artist", "album", "uri")
+        }
+        artists = futures["artist"].get()
+        albums = [album for album in futures["album"].get() if album]
+        uris = sorted(uri for uri in futures["uri"].get() if uri)
+
+        chunks = [
+            uris[start : start + self.lookup_chunk_size]
+            for start in range(0, len(uris), self.lookup_chunk_size)
+        ]
+        db_playtime = 0
+        for start in range(0, len(chunks), _LOOKUP_CONCURRENCY):
+            futures = [
+                self.core.library.lookup(uris=chunk)
+                for chunk in chunks[start : start + _LOOKUP_CONCURRENCY]
+            ]
+            for future in futures:
+                for tracks in future.get().values():
+                    if tracks:
+                        db_playtime += tracks[0].length or 0
+
+        library = {
+            "artists": len(artists),
+            "albums": len(albums),
+            "songs": len(uris),
+        }
+        return library, db_playtime // 1000
@@ -1,4 +1,6 @@
+import collections
 import errno
+import itertools
 import logging
 import os
 import re
@@ -14,6 +16,19 @@ logger = logging.getLogger(__name__)
 
 CONTROL_CHARS = dict.fromkeys(range(32))
 
+#: Number of queued bytes at which a session is blocked from sending more
+#: data until the client has read enough of it.
+SEND_BUFFER_HIGH_WATER_MARK = 4 * 1024 * 1024
+
+#: Number of queued bytes below which a blocked session may send again.
+SEND_BUFFER_LOW_WATER_MARK = 1024 * 1024
+
+#: Maximum number of buffers to pass to a single ``sendmsg()`` call.
+MAX_SEND_CHUNKS = 64
+
+#: Default maximum number of bytes to read from a client in one go.
+DEFAULT_RECV_BUFFER_SIZE = 64 * 1024
+
 
 def get_systemd_socket():
     """Attempt to get a socket from systemd."""
@@ -120,11 +135,13 @@ class Server:
         protocol_kwargs=None,
         max_connections=5,
         timeout=30,
+        recv_buffer_size=DEFAULT_RECV_BUFFER_SIZE,
     ):
         self.protocol = protocol
         self.protocol_kwargs = protocol_kwargs or {}
         self.max_connections = max_connections
         self.timeout = timeout
+        self.recv_buffer_size = recv_buffer_size
         self.server_socket = self.create_server_socket(host, port)
         self.address = get_socket_address(host, port)
 
@@ -147,7 +164,7 @@ class Server:
             sock.bind((host, port))
 
         sock.setblocking(False)
-        sock.listen(1)
+        sock.listen(socket.SOMAXCONN)
         return sock
 
     def stop(self):
@@ -209,7 +226,12 @@ class Server:
 
     def init_connection(self, sock, addr):
         Connection(
-            self.protocol, self.protocol_kwargs, sock, addr, self.timeout
+            self.protocol,
+            self.protocol_kwargs,
+            sock,
+            addr,
+            self.timeout,
+            self.recv_buffer_size,
         )
 
 
@@ -222,7 +244,15 @@ class Connection:
     # false return value would only tell us that what we thought was registered
     # is already gone, there is really nothing more we can do.
 
-    def __init__(self, protocol, protocol_kwargs, sock, addr, timeout):
+    def __init__(
+        self,
+        protocol,
+        protocol_kwargs,
+        sock,
+        addr,
+        timeout,
+        recv_buffer_size=DEFAULT_RECV_BUFFER_SIZE,
+    ):
         sock.setblocking(False)
 
         self.host, self.port = addr[:2]  # IPv6 has larger addr
@@ -232,8 +262,15 @@ class Connection:
         self.protocol_kwargs = protocol_kwargs
         self.timeout = timeout
 
+        # Reused for every read, so draining the socket allocates nothing but
+        # the data handed to the actor.
+        self.recv_buffer = memoryview(bytearray(recv_buffer_size))
+
         self.send_lock = threading.Lock()
-        self.send_buffer = b""
+        self.send_buffer = collections.deque()
+        self.send_buffer_size = 0
+        self.send_drained = threading.Event()
+        self.send_drained.set()
 
         self.stopping = False
 
@@ -263,6 +300,7 @@ class Connection:
         self.disable_timeout()
         self.disable_recv()
         self.disable_send()
+        self.send_drained.set()
 
         try:
             self._sock.close()
@@ -270,23 +308,60 @@ class Connection:
             pass
 
     def queue_send(self, data):
-        """Try to send data to client exactly as is and queue rest."""
+        """Try to send data to client exactly as is and queue rest.
+
+        Blocks while the client has more than
+        :data:`SEND_BUFFER_HIGH_WATER_MARK` bytes left to read.
+        """
         self.send_lock.acquire(True)
-        self.send_buffer = self.send(self.send_buffer + data)
+        if data:
+            self.send_buffer.append(memoryview(data))
+            self.send_buffer_size += len(data)
+        self.send()
+        if self.send_buffer_size > SEND_BUFFER_HIGH_WATER_MARK:
+            self.send_drained.clear()
         self.send_lock.release()
         if self.send_buffer:
             self.enable_send()
-
-    def send(self, data):
-        """Send data to client, return any unsent data."""
-        try:
-            sent = self._sock.send(data)
-            return data[sent:]
-        except OSError as exc:
-            if exc.errno in (errno.EWOULDBLOCK, errno.EINTR):
-                return data
-            self.stop(f"Unexpected client error: {exc}")
-            return b""
+        if not self.send_drained.is_set():
+            self.wait_for_send_drained()
+
+    def wait_for_send_drained(self):
+        """Wait for the client to read the bulk of the queued data."""
+        timeout = self.timeout if self.timeout and self.timeout > 0 else None
+        if not self.send_drained.wait(timeout):
+            self.stop(f"Client not reading for {self.timeout:d}s")
+
+    def send(self):
+        """Send as much queued data as the socket accepts without blocking."""
+        while self.send_buffer:
+            chunks = list(itertools.islice(self.send_buffer, MAX_SEND_CHUNKS))
+            try:
+                if hasattr(self._sock, "sendmsg"):
+                    sent = self._sock.sendmsg(chunks)
+                else:
+                    sent = self._sock.send(chunks[0])
+            except OSError as exc:
+                if exc.errno in (errno.EWOULDBLOCK, errno.EINTR):
+                    return
+                self.stop(f"Unexpected client error: {exc}")
+                self.send_buffer.clear()
+                self.send_buffer_size = 0
+                return
+            self.consume_send_buffer(sent)
+            if sent < sum(len(chunk) for chunk in chunks):
+                return
+
+    def consume_send_buffer(self, sent):
+        """Drop ``sent`` bytes from the front of the send buffer."""
+        self.send_buffer_size -= sent
+        while sent:
+            chunk = self.send_buffer[0]
+            if sent < len(chunk):
+                self.send_buffer[0] = chunk[sent:]
+                return
+            sent -= len(chunk)
+            self.send_buffer.popleft()
 
     def enable_timeout(self):
         """Reactivate timeout mechanism."""
@@ -349,22 +424,35 @@ class Connection:
             self.stop(f"Bad client flags: {flags}")
             return True
 
-        try:
-            data = self._sock.recv(4096)
-        except OSError as exc:
-            if exc.errno not in (errno.EWOULDBLOCK, errno.EINTR):
-                self.stop(f"Unexpected client error: {exc}")
-            return True
-
-        if not data:
+        # Read all the data available, up to the size of the buffer, and pass
+        # it on to the actor as one message.
+        received = 0
+        closed = False
+        while received < len(self.recv_buffer):
+            try:
+                size = self._sock.recv_into(self.recv_buffer[received:])
+            except OSError as exc:
+                if exc.errno not in (errno.EWOULDBLOCK, errno.EINTR):
+                    self.stop(f"Unexpected client error: {exc}")
+                    return True
+                break
+            if not size:
+                closed = True
+                break
+            received += size
+
+        if received:
+            try:
+                self.actor_ref.tell(
+                    {"received": bytes(self.recv_buffer[:received])}
+                )
+            except pykka.ActorDeadError:
+                self.stop("Actor is dead.")
+                return True
+
+        if closed:
             self.disable_recv()
             self.actor_ref.tell({"close": True})
-            return True
-
-        try:
-            self.actor_ref.tell({"received": data})
-        except pykka.ActorDeadError:
-            self.stop("Actor is dead.")
 
         return True
 
@@ -379,7 +467,9 @@ class Connection:
             return True
 
         try:
-            self.send_buffer = self.send(self.send_buffer)
+            self.send()
+            if self.send_buffer_size <= SEND_BUFFER_LOW_WATER_MARK:
+                self.send_drained.set()
             if not self.send_buffer:
                 self.disable_send()
         finally:
@@ -414,11 +504,18 @@ class LineProtocol(pykka.ThreadingActor):
     #: What encoding to expect incoming data to be in, can be :class:`None`.
     encoding = "utf-8"
 
+    #: Maximum number of bytes in a received line. Connections sending longer
+    #: lines are closed. Can be :class:`None` to allow any length.
+    max_line_length = 1024 * 1024
+
     def __init__(self, connection):
         super().__init__()
         self.connection = connection
         self.prevent_timeout = False
-        self.recv_buffer = b""
+        self.recv_buffer = bytearray()
+        # Position in the receive buffer up to which there is no terminator,
+        # so data is only searched once.
+        self.recv_scan_offset = 0
 
         if self.delimiter:
             self.delimiter = re.compile(self.delimiter)
@@ -470,10 +567,44 @@ class LineProtocol(pykka.ThreadingActor):
         self.connection.stop("Actor is shutting down.")
 
     def parse_lines(self):
-        """Consume new data and yield any lines found."""
-        while re.search(self.terminator, self.recv_buffer):
-            line, self.recv_buffer = self.delimiter.split(self.recv_buffer, 1)
-            yield line
+        """
+        Consume new data and yield any lines found.
+
+        The buffer is only searched for terminators past the data searched by
+        earlier calls, and consumed lines are removed from it in one go, so
+        framing takes linear time however the data is received.
+        """
+        buffer = self.recv_buffer
+        limit = self.max_line_length
+        start = 0
+        try:
+            while True:
+                end = buffer.find(
+                    self.terminator, max(start, self.recv_scan_offset)
+                )
+                if end == -1:
+                    length = len(buffer) - start
+                    break
+                match = self.delimiter.search(
+                    buffer, start, end + len(self.terminator)
+                )
+                length = match.start() - start
+                if limit is not None and length > limit:
+                    break
+                yield bytes(buffer[start : match.start()])
+                start = match.end()
+        finally:
+            del buffer[:start]
+            self.recv_scan_offset = max(
+                0, len(buffer) - len(self.terminator) + 1
+            )
+
+        if limit is not None and length > limit:
+            buffer.clear()
+            self.recv_scan_offset = 0
+            self.connection.stop(
+                f"Client sent a line longer than {limit:d} bytes"
+            )
 
     def encode(self, line):
         """
@@ -0,0 +1,153 @@
+import collections
+import threading
+import time
+
+#: Default maximum number of playlists to keep the tracks of.
+DEFAULT_MAX_SIZE = 16
+
+# Maximum number of chunks of URIs, or of playlists, to look up at the same
+# time.
+_LOOKUP_CONCURRENCY = 4
+
+
+class PlaylistCache:
+
+    """
+    Keeps the tracks of recently listed stored playlists, and the last
+    modification times of all playlists.
+
+    Looking up all the tracks of a large playlist in the library is expensive,
+    so the tracks found are cached by playlist URI and last modification time.
+    Misses are looked up in chunks of URIs, several chunks at a time.
+
+    The last modification times are looked up once per playlist, several
+    playlists at a time. Playlists without a known modification time are
+    reported as modified when first seen, not every time they are listed.
+
+    The cache is shared between all MPD sessions. Playlists are updated or
+    dropped on the ``playlist_changed`` and ``playlist_deleted`` events passed
+    on by the frontend, and all of them are dropped on ``playlists_loaded``.
+    """
+
+    #: The Mopidy core API. An instance of :class:`mopidy.core.Core`.
+    core = None
+
+    def __init__(
+        self, core=None, lookup_chunk_size=100, max_size=DEFAULT_MAX_SIZE
+    ):
+        self.core = core
+        self.lookup_chunk_size = lookup_chunk_size
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._tracks = collections.OrderedDict()
+        self._last_modified = {}
+        # Bumped on every invalidation, so tracks looked up while a playlist
+        # changed are not cached.
+        self._generation = 0
+
+    def get_tracks(self, playlist):
+        """
+        Return the tracks of ``playlist`` as found in the library, in playlist
+        order.
+
+        The returned list is shared and must not be modified.
+        """
+        track_uris = tuple(track.uri for track in playlist.tracks)
+        key = (playlist.last_modified, track_uris)
+        with self._lock:
+            entry = self._tracks.get(playlist.uri)
+            if entry is not None and entry[0] == key:
+                self._tracks.move_to_end(playlist.uri)
+                return entry[1]
+            generation = self._generation
+
+        tracks = self._lookup(track_uris)
+
+        with self._lock:
+            if generation == self._generation and self.max_size > 0:
+                self._tracks[playlist.uri] = (key, tracks)
+                self._tracks.move_to_end(playlist.uri)
+                while len(self._tracks) > self.max_size:
+                    self._tracks.popitem(last=False)
+        return tracks
+
+    def get_last_modified(self, uris):
+        """
+        Return a dict mapping each playlist URI to its last modification time,
+        in milliseconds since the Unix epoch.
+
+        Playlists not known yet are looked up.
+        """
+        with self._lock:
+            result = {
+                uri: self._last_modified[uri]
+                for uri in uris
+                if uri in self._last_modified
+            }
+            generation = self._generation
+        missing = [uri for uri in dict.fromkeys(uris) if uri not in result]
+
+        for start in range(0, len(missing), _LOOKUP_CONCURRENCY):
+            chunk = missing[start : start + _LOOKUP_CONCURRENCY]
+            futures = [self.core.playlists.lookup(uri) for uri in chunk]
+            for uri, future in zip(chunk, futures):
+                playlist = future.get()
+                result[uri] = _last_modified(playlist)
+
+        if missing:
+            with self._lock:
+                if generation == self._generation:
+                    for uri in missing:
+                        self._last_modified[uri] = result[uri]
+        return result
+
+    def playlists_loaded(self):
+        """Forget everything about all playlists."""
+        with self._lock:
+            self._generation += 1
+            self._tracks.clear()
+            self._last_modified.clear()
+
+    def playlist_changed(self, playlist):
+        """
+        Forget the tracks of a playlist that was created or changed, and keep
+        its new last modification time.
+        """
+        with self._lock:
+            self._generation += 1
+            self._tracks.pop(playlist.uri, None)
+            self._last_modified[playlist.uri] = _last_modified(playlist)
+
+    def playlist_deleted(self, uri):
+        """Forget everything about a deleted playlist."""
+        with self._lock:
+            self._generation += 1
+            self._tracks.pop(uri, None)
+            self._last_modified.pop(uri, None)
+
+    def _lookup(self, uris):
+        unique_uris = list(dict.fromkeys(uris))
+        chunks = [
+            unique_uris[start : start + self.lookup_chunk_size]
+            for start in range(0, len(unique_uris), self.lookup_chunk_size)
+        ]
+
+        results = {}
+        for start in range(0, len(chunks), _LOOKUP_CONCURRENCY):
+            futures = [
+                self.core.library.lookup(uris=chunk)
+                for chunk in chunks[start : start + _LOOKUP_CONCURRENCY]
+            ]
+            for future in futures:
+                results.update(future.get())
+
+        tracks = []
+        for uri in uris:
+            tracks.extend(results.get(uri, []))
+        return tracks
+
+
+def _last_modified(playlist):
+    if playlist is None or playlist.last_modified is None:
+        return int(time.time() * 1000)
+    return playlist.last_modified
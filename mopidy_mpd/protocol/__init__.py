@@ -147,9 +147,6 @@ class Commands:
                 raise ValueError(f"{name} already registered")
 
             spec = inspect.getfullargspec(func)
-            defaults = dict(
-                zip(spec.args[-len(spec.defaults or []) :], spec.defaults or [])
-            )
 
             if not spec.args and not spec.varargs:
                 raise TypeError("Handler must accept at least one argument.")
@@ -165,29 +162,7 @@ class Commands:
             if spec.varkw or spec.kwonlyargs:
                 raise TypeError("Keyword arguments are not permitted")
 
-            def validate(*args, **kwargs):
-                if spec.varargs:
-                    return func(*args, **kwargs)
-
-                try:
-                    ba = inspect.signature(func).bind(*args, **kwargs)
-                    ba.apply_defaults()
-                    callargs = ba.arguments
-                except TypeError:
-                    raise exceptions.MpdArgError(
-                        f'wrong number of arguments for "{name}"'
-                    )
-
-                for key, value in callargs.items():
-                    default = defaults.get(key, object())
-                    if key in validators and value != default:
-                        try:
-                            callargs[key] = validators[key](value)
-                        except ValueError:
-                            raise exceptions.MpdArgError("incorrect arguments")
-
-                return func(**callargs)
-
+            validate = _compile_handler(name, func, spec, validators)
             validate.auth_required = auth_required
             validate.list_command = list_command
             self.handlers[name] = validate
@@ -212,5 +187,60 @@ class Commands:
         return self.handlers[tokens[0]](context, *tokens[1:])
 
 
+#: Marks arguments without a default value in argument binding plans.
+_NO_DEFAULT = object()
+
+
+def _compile_handler(name, func, spec, validators):
+    """Create a callable that validates and converts arguments for ``func``.
+
+    The number of arguments accepted, the default values and the converters
+    to run are worked out once, so calling the handler only needs to check
+    the number of arguments and convert those that have a converter.
+    """
+    if spec.varargs:
+
+        def call_varargs(*args):
+            return func(*args)
+
+        return call_varargs
+
+    defaults = spec.defaults or ()
+    max_args = len(spec.args)
+    min_args = max_args - len(defaults)
+    default_values = (_NO_DEFAULT,) * min_args + tuple(defaults)
+    converters = tuple(
+        (index, validators[arg], default_values[index])
+        for index, arg in enumerate(spec.args)
+        if arg in validators
+    )
+
+    def call_with_converters(*args):
+        if not min_args <= len(args) <= max_args:
+            raise exceptions.MpdArgError(
+                f'wrong number of arguments for "{name}"'
+            )
+        args = list(args)
+        for index, converter, default in converters:
+            # Converters are not applied to defaults, given or implicit
+            if index < len(args) and args[index] != default:
+                try:
+                    args[index] = converter(args[index])
+                except ValueError:
+                    raise exceptions.MpdArgError("incorrect arguments")
+        return func(*args)
+
+    def call_without_converters(*args):
+        if not min_args <= len(args) <= max_args:
+            raise exceptions.MpdArgError(
+                f'wrong number of arguments for "{name}"'
+            )
+        return func(*args)
+
+    if converters:
+        return call_with_converters
+    return call_without_converters
+
+
 #: Global instance to install commands into
 commands = Commands()
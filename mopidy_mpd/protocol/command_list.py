@@ -1,4 +1,22 @@
-from mopidy_mpd import exceptions, protocol
+import itertools
+
+from mopidy_mpd import exceptions, protocol, tokenize
+from mopidy_mpd.protocol import current_playlist
+
+#: Commands that are run together when they follow each other in a command
+#: list, mapped to the function running a batch of them.
+#:
+#: The functions are called with the context and a list of the arguments of
+#: each command. They run the commands from the start of the batch up to the
+#: first one they can not run or that would fail, and return a list with the
+#: response lines of each command run. The remaining commands are run one at a
+#: time as usual, so errors are reported as if there was no batching.
+BATCHED_COMMANDS = {
+    "add": current_playlist.add_batch,
+    "addid": current_playlist.addid_batch,
+    "deleteid": current_playlist.deleteid_batch,
+    "moveid": current_playlist.moveid_batch,
+}
 
 
 @protocol.commands.add("command_list_begin", list_command=False)
@@ -26,7 +44,6 @@ def command_list_begin(context):
 @protocol.commands.add("command_list_end", list_command=False)
 def command_list_end(context):
     """See :meth:`command_list_begin()`."""
-    # TODO: batch consecutive add commands
     if not context.dispatcher.command_list_receiving:
         raise exceptions.MpdUnknownCommand(command="command_list_end")
     context.dispatcher.command_list_receiving = False
@@ -38,10 +55,21 @@ def command_list_end(context):
         context.dispatcher.command_list_ok,
         False,
     )
+    commands = [_split(command) for command in command_list]
     command_list_response = []
-    for index, command in enumerate(command_list):
+    index = 0
+    while index < len(command_list):
+        batch_responses = _run_batch(context, commands, index)
+        for response in batch_responses:
+            command_list_response.extend(response)
+            if command_list_ok:
+                command_list_response.append("list_OK")
+        if batch_responses:
+            index += len(batch_responses)
+            continue
+
         response = context.dispatcher.handle_request(
-            command, current_command_list_index=index
+            command_list[index], current_command_list_index=index
         )
         command_list_response.extend(response)
         if command_list_response and command_list_response[-1].startswith(
@@ -50,9 +78,58 @@ def command_list_end(context):
             return command_list_response
         if command_list_ok:
             command_list_response.append("list_OK")
+        index += 1
     return command_list_response
 
 
+def _split(command):
+    try:
+        return tokenize.split(command)
+    except exceptions.MpdAckError:
+        return None  # Left for the dispatcher to report
+
+
+def _run_batch(context, commands, index):
+    """
+    Run the consecutive commands starting at ``index`` as a batch, if they can
+    be batched.
+
+    Returns the responses of the commands run. Commands not run are left for
+    the dispatcher, which also reports any errors.
+    """
+
+    def is_batched_with(tokens, name):
+        return tokens is not None and tokens[0] == name
+
+    if commands[index] is None:
+        return []
+    name = commands[index][0]
+    batch = BATCHED_COMMANDS.get(name)
+    blacklist = context.dispatcher.config["mpd"].get("command_blacklist", [])
+    if (
+        batch is None
+        or index + 1 == len(commands)
+        or not is_batched_with(commands[index + 1], name)
+        or name in blacklist
+        or not context.dispatcher.authenticated
+    ):
+        return []
+
+    # The arguments are produced lazily, as batches stop at the first command
+    # they can not run.
+    arguments = (
+        commands[i][1:]
+        for i in itertools.takewhile(
+            lambda i: is_batched_with(commands[i], name),
+            range(index, len(commands)),
+        )
+    )
+    responses = batch(context, arguments)
+    if responses:
+        context.invalidate_status()
+    return responses
+
+
 @protocol.commands.add("command_list_ok_begin", list_command=False)
 def command_list_ok_begin(context):
     """See :meth:`command_list_begin()`."""
@@ -1,6 +1,6 @@
 import urllib
 
-from mopidy_mpd import exceptions, protocol, translator
+from mopidy_mpd import exceptions, protocol, tracklist_index, translator
 
 
 @protocol.commands.add("add")
@@ -77,6 +77,71 @@ def addid(context, uri, songpos=None):
     return ("Id", tl_tracks[0].tlid)
 
 
+def add_batch(context, arguments):
+    """
+    Run consecutive ``add`` commands of track URIs from a command list with a
+    single addition to the tracklist.
+
+    See :data:`mopidy_mpd.protocol.command_list.BATCHED_COMMANDS`.
+    """
+    uris = []
+    for args in arguments:
+        if len(args) != 1 or urllib.parse.urlparse(args[0]).scheme == "":
+            break
+        uris.append(args[0])
+
+    uris, _ = _lookup_uris_in_batch(context, uris)
+    if uris:
+        context.core.tracklist.add(uris=uris).get()
+    return [[]] * len(uris)
+
+
+def addid_batch(context, arguments):
+    """
+    Run consecutive ``addid`` commands without a position from a command list
+    with a single addition to the tracklist.
+
+    See :data:`mopidy_mpd.protocol.command_list.BATCHED_COMMANDS`.
+    """
+    uris = []
+    for args in arguments:
+        if len(args) != 1 or not args[0]:
+            break
+        uris.append(args[0])
+
+    uris, tracks = _lookup_uris_in_batch(context, uris)
+    if not uris:
+        return []
+    tl_tracks = context.core.tracklist.add(uris=uris).get()
+
+    # Each song's id is the id of the first track added for its URI.
+    responses = []
+    position = 0
+    for uri in uris:
+        responses.append([f"Id: {tl_tracks[position].tlid:d}"])
+        position += len(tracks[uri])
+    return responses
+
+
+def _lookup_uris_in_batch(context, uris):
+    """
+    Look up the URIs with a single library lookup, and return the URIs before
+    the first one without tracks, and the tracks found for each URI.
+
+    The tracklist looks the URIs up again when they are added, as adding
+    tracks instead of URIs is deprecated. The batch still only does two
+    lookups for any number of commands, where running the commands one by
+    one does one lookup per command.
+    """
+    if not uris:
+        return [], {}
+    tracks = context.core.library.lookup(uris=uris).get()
+    for count, uri in enumerate(uris):
+        if not tracks.get(uri):
+            return uris[:count], tracks
+    return uris, tracks
+
+
 @protocol.commands.add("delete", songrange=protocol.RANGE)
 def delete(context, songrange):
     """
@@ -93,8 +158,10 @@ def delete(context, songrange):
     tl_tracks = context.core.tracklist.slice(start, end).get()
     if not tl_tracks:
         raise exceptions.MpdArgError("Bad song index", command="delete")
-    for tlid, _ in tl_tracks:
-        context.core.tracklist.remove({"tlid": [tlid]})
+    # Remove all tracks at once, so the tracklist only changes once
+    context.core.tracklist.remove(
+        {"tlid": [tlid for tlid, _ in tl_tracks]}
+    ).get()
 
 
 @protocol.commands.add("deleteid", tlid=protocol.UINT)
@@ -111,6 +178,37 @@ def deleteid(context, tlid):
         raise exceptions.MpdNoExistError("No such song")
 
 
+def deleteid_batch(context, arguments):
+    """
+    Run consecutive ``deleteid`` commands from a command list with a single
+    removal from the tracklist.
+
+    See :data:`mopidy_mpd.protocol.command_list.BATCHED_COMMANDS`.
+    """
+    tlids = []
+    for args in arguments:
+        if len(args) != 1 or not args[0].isdigit():
+            break
+        tlids.append(int(args[0]))
+    if not tlids:
+        return []
+
+    existing = {
+        tl_track.tlid
+        for tl_track in context.core.tracklist.filter({"tlid": tlids}).get()
+    }
+    count = 0
+    for tlid in tlids:
+        if tlid not in existing:
+            break
+        existing.remove(tlid)  # Deleting a song twice fails the second time
+        count += 1
+
+    if count:
+        context.core.tracklist.remove({"tlid": tlids[:count]}).get()
+    return [[]] * count
+
+
 @protocol.commands.add("clear")
 def clear(context):
     """
@@ -158,6 +256,39 @@ def moveid(context, tlid, to):
     context.core.tracklist.move(position, position + 1, to)
 
 
+def moveid_batch(context, arguments):
+    """
+    Run consecutive ``moveid`` commands from a command list, finding the
+    positions of all the songs with a single read of the tracklist.
+
+    The core can only move one range at a time, so every move is still a
+    change to the tracklist, but the moves are sent without waiting for each
+    other.
+
+    See :data:`mopidy_mpd.protocol.command_list.BATCHED_COMMANDS`.
+    """
+    moves = []
+    for args in arguments:
+        if len(args) != 2 or not (args[0].isdigit() and args[1].isdigit()):
+            break
+        moves.append((int(args[0]), int(args[1])))
+    if not moves:
+        return []
+
+    tlids = [tlid for tlid, _ in context.core.tracklist.get_tl_tracks().get()]
+    positions = []
+    for tlid, to in moves:
+        if tlid not in tlids or to > len(tlids):
+            break  # Left for the moveid command to handle
+        position = tlids.index(tlid)
+        tlids.insert(to, tlids.pop(position))
+        positions.append((position, to))
+
+    for position, to in positions:
+        context.core.tracklist.move(position, position + 1, to)
+    return [[]] * len(positions)
+
+
 @protocol.commands.add("playlist")
 def playlist(context):
     """
@@ -183,15 +314,11 @@ def playlistfind(context, tag, needle):
 
         Finds songs in the current playlist with strict matching.
     """
-    if tag == "filename":
-        tl_tracks = context.core.tracklist.filter({"uri": [needle]}).get()
-        if not tl_tracks:
-            return None
-        position = context.core.tracklist.index(tl_tracks[0]).get()
-        return translator.track_to_mpd_format(
-            tl_tracks[0], context.session.tagtypes, position=position
-        )
-    raise exceptions.MpdNotImplemented  # TODO
+    try:
+        matches = _get_tracklist_index(context).find(tag, needle)
+    except KeyError:
+        raise exceptions.MpdArgError("incorrect arguments")
+    return _tracks_with_positions_to_mpd_format(context, matches)
 
 
 @protocol.commands.add("playlistid", tlid=protocol.UINT)
@@ -213,7 +340,7 @@ def playlistid(context, tlid=None):
             tl_tracks[0], context.session.tagtypes, position=position
         )
     else:
-        return translator.tracks_to_mpd_format(
+        return translator.iter_tracks_to_mpd_format(
             context.core.tracklist.get_tl_tracks().get(),
             context.session.tagtypes,
         )
@@ -246,7 +373,7 @@ def playlistinfo(context, parameter=None):
         raise exceptions.MpdArgError("Bad song index")
     if end and end > len(tl_tracks):
         end = None
-    return translator.tracks_to_mpd_format(
+    return translator.iter_tracks_to_mpd_format(
         tl_tracks, context.session.tagtypes, start, end
     )
 
@@ -264,8 +391,30 @@ def playlistsearch(context, tag, needle):
     *GMPC:*
 
     - uses ``filename`` and ``any`` as tags
+
+    *Clarifications:*
+
+    - Matching ignores case, like newer MPD versions do.
     """
-    raise exceptions.MpdNotImplemented  # TODO
+    try:
+        matches = _get_tracklist_index(context).search(tag, needle)
+    except KeyError:
+        raise exceptions.MpdArgError("incorrect arguments")
+    return _tracks_with_positions_to_mpd_format(context, matches)
+
+
+def _get_tracklist_index(context):
+    if context.tracklist_index is not None:
+        return context.tracklist_index
+    return tracklist_index.TracklistIndex(context.core)
+
+
+def _tracks_with_positions_to_mpd_format(context, matches):
+    tagtypes = frozenset(context.session.tagtypes)
+    return [
+        translator.track_to_mpd_format(tl_track, tagtypes, position=position)
+        for position, tl_track in matches
+    ]
 
 
 @protocol.commands.add("plchanges", version=protocol.INT)
@@ -284,12 +433,12 @@ def plchanges(context, version):
 
     - Calls ``plchanges "-1"`` two times per second to get the entire playlist.
     """
-    # XXX Naive implementation that returns all tracks as changed
     tracklist_version = context.core.tracklist.get_version().get()
     if version < tracklist_version:
-        return translator.tracks_to_mpd_format(
-            context.core.tracklist.get_tl_tracks().get(),
-            context.session.tagtypes,
+        tagtypes = frozenset(context.session.tagtypes)
+        return (
+            translator.track_to_mpd_format(tl_track, tagtypes, position)
+            for position, tl_track in _tracklist_changes(context, version)
         )
     elif version == tracklist_version:
         # A version match could indicate this is just a metadata update, so
@@ -322,17 +471,27 @@ def plchangesposid(context, version):
         To detect songs that were deleted at the end of the playlist, use
         ``playlistlength`` returned by status command.
     """
-    # XXX Naive implementation that returns all tracks as changed
     if int(version) != context.core.tracklist.get_version().get():
         result = []
-        for position, (tlid, _) in enumerate(
-            context.core.tracklist.get_tl_tracks().get()
-        ):
+        for position, (tlid, _) in _tracklist_changes(context, version):
             result.append(("cpos", position))
             result.append(("Id", tlid))
         return result
 
 
+def _tracklist_changes(context, version):
+    """
+    Return ``(position, tl_track)`` pairs for the tracks that changed since
+    ``version``.
+
+    Falls back to returning the entire tracklist if there is no tracklist
+    journal to ask.
+    """
+    if context.tracklist_journal is not None:
+        return context.tracklist_journal.changes_since(version)
+    return list(enumerate(context.core.tracklist.get_tl_tracks().get()))
+
+
 @protocol.commands.add("prio", priority=protocol.UINT, position=protocol.RANGE)
 def prio(context, priority, position):
     """
@@ -1,9 +1,17 @@
 import functools
 import itertools
+import time
 
-from mopidy.models import Track
+from mopidy.models import Album, Artist, Track
 from mopidy_mpd import exceptions, protocol, translator
 
+#: Number of seconds a session keeps the results of a query with a ``window``,
+#: so paging through them does not run the query again.
+QUERY_RESULTS_TTL = 10
+
+#: Maximum number of queries a session keeps the results of.
+MAX_QUERY_RESULTS = 4
+
 _LIST_MAPPING = {
     "album": "album",
     "albumartist": "albumartist",
@@ -60,6 +68,110 @@ def _query_from_mpd_search_parameters(parameters, mapping):
     return query
 
 
+def _normalize_query(query):
+    """
+    Turn a query into a hashable key that is the same for all orderings of
+    its fields and values.
+    """
+    if not query:
+        return ()
+    return tuple(
+        sorted((field, tuple(sorted(values))) for field, values in query.items())
+    )
+
+
+def _search(context, query, exact=False):
+    """Search the library, through the shared search cache if any."""
+
+    def fetch():
+        return context.core.library.search(query=query, exact=exact).get()
+
+    if context.search_cache is None:
+        return fetch()
+    key = ("search", exact, _normalize_query(query))
+    return context.search_cache.get(key, fetch)
+
+
+def _get_distinct(context, field, query):
+    """
+    Get the distinct values of a field, through the shared search cache if
+    any.
+    """
+
+    def fetch():
+        return context.core.library.get_distinct(field, query).get()
+
+    if context.search_cache is None:
+        return fetch()
+    key = ("distinct", field, _normalize_query(query))
+    return context.search_cache.get(key, fetch)
+
+
+def _split_window(args, offset=0):
+    """
+    Split a trailing ``window START:END`` off the arguments of a query.
+
+    The query parameters after the first ``offset`` arguments come in pairs,
+    which tells a window apart from a ``window`` value being searched for.
+    Returns a tuple ``(args, window)``, where ``window`` is a slice or
+    :class:`None`.
+    """
+    args = list(args)
+    if (
+        len(args) - offset >= 2
+        and (len(args) - offset) % 2 == 0
+        and args[-2].lower() == "window"
+    ):
+        try:
+            window = protocol.RANGE(args[-1])
+        except ValueError:
+            raise exceptions.MpdArgError("Bad window")
+        return args[:-2], window
+    return args, None
+
+
+def _get_query_results(context, key, window, fetch):
+    """
+    Return the results of the query by calling ``fetch``, or from the
+    session's recent query results when paging through them with ``window``.
+    """
+    if window is None:
+        return fetch()
+
+    now = time.monotonic()
+    query_results = context.query_results
+    for expired_key in [
+        k for k, (expires, _) in query_results.items() if expires <= now
+    ]:
+        del query_results[expired_key]
+
+    if key in query_results:
+        results = query_results.pop(key)[1]
+    else:
+        results = fetch()
+    query_results[key] = (now + QUERY_RESULTS_TTL, results)
+    while len(query_results) > MAX_QUERY_RESULTS:
+        query_results.popitem(last=False)
+    return results
+
+
+def _iter_results_to_mpd_format(context, results, window):
+    """
+    Lazily format the artists, albums and tracks within the window.
+    """
+    if window is not None:
+        results = results[window]
+    tagtypes = frozenset(context.session.tagtypes)
+    for result in results:
+        if isinstance(result, Artist):
+            result = _artist_as_track(result)
+        elif isinstance(result, Album):
+            result = _album_as_track(result)
+        formatted_track = translator.track_to_mpd_format(result, tagtypes)
+        if formatted_track:
+            yield formatted_track
+
+
 def _get_field(field, search_results):
     return list(itertools.chain(*[getattr(r, field) for r in search_results]))
 
@@ -103,7 +215,7 @@ def count(context, *args):
         query = _query_from_mpd_search_parameters(args, _SEARCH_MAPPING)
     except ValueError:
         raise exceptions.MpdArgError("incorrect arguments")
-    results = context.core.library.search(query=query, exact=True).get()
+    results = _search(context, query, exact=True)
     result_tracks = _get_tracks(results)
     total_length = sum(t.length for t in result_tracks if t.length)
     return [
@@ -137,27 +249,37 @@ def find(context, *args):
 
     - also uses the search type "date".
     - uses "file" instead of "filename".
+
+    *Clarifications:*
+
+    - ``window START:END`` at the end limits the output to that range of the
+      results.
     """
+    args, window = _split_window(args)
     try:
         query = _query_from_mpd_search_parameters(args, _SEARCH_MAPPING)
     except ValueError:
         return
 
-    results = context.core.library.search(query=query, exact=True).get()
-    result_tracks = []
-    if (
-        "artist" not in query
-        and "albumartist" not in query
-        and "composer" not in query
-        and "performer" not in query
-    ):
-        result_tracks += [_artist_as_track(a) for a in _get_artists(results)]
-    if "album" not in query:
-        result_tracks += [_album_as_track(a) for a in _get_albums(results)]
-    result_tracks += _get_tracks(results)
-    return translator.tracks_to_mpd_format(
-        result_tracks, context.session.tagtypes
+    def fetch():
+        results = _search(context, query, exact=True)
+        found = []
+        if (
+            "artist" not in query
+            and "albumartist" not in query
+            and "composer" not in query
+            and "performer" not in query
+        ):
+            found += _get_artists(results)
+        if "album" not in query:
+            found += _get_albums(results)
+        found += _get_tracks(results)
+        return found
+
+    results = _get_query_results(
+        context, ("find",) + tuple(args), window, fetch
     )
+    return _iter_results_to_mpd_format(context, results, window)
 
 
 @protocol.commands.add("findadd")
@@ -256,11 +378,14 @@ def list_(context, *args):
                 Genre: Rock
                 OK
 
+    ``window START:END`` at the end limits the output to that range of the
+    values.
+
     *ncmpc:*
 
     - capitalizes the field argument.
     """
-    params = list(args)
+    params, window = _split_window(args, offset=1)
     if not params:
         raise exceptions.MpdArgError('too few arguments for "list"')
 
@@ -284,9 +409,17 @@ def list_(context, *args):
         except ValueError:
             return
 
+    def fetch():
+        # Sorted, so windows page through the values in a stable order.
+        return sorted(_get_distinct(context, field, query))
+
     name = _LIST_NAME_MAPPING[field]
-    result = context.core.library.get_distinct(field, query)
-    return [(name, value) for value in result.get()]
+    values = _get_query_results(
+        context, ("list", field_arg.lower()) + tuple(params), window, fetch
+    )
+    if window is not None:
+        values = values[window]
+    return [(name, value) for value in values]
 
 
 @protocol.commands.add("listall")
@@ -305,16 +438,16 @@ def listall(context, uri=None):
 
     .. warning:: This command is disabled by default in Mopidy installs.
     """
-    result = []
+    found = False
     for path, track_ref in context.browse(uri, lookup=False):
+        found = True
         if not track_ref:
-            result.append(("directory", path.lstrip("/")))
+            yield ("directory", path.lstrip("/"))
         else:
-            result.append(("file", track_ref.uri))
+            yield ("file", track_ref.uri)
 
-    if not result:
+    if not found:
         raise exceptions.MpdNoExistError("Not found")
-    return result
 
 
 @protocol.commands.add("listallinfo")
@@ -334,19 +467,14 @@ def listallinfo(context, uri=None):
 
     .. warning:: This command is disabled by default in Mopidy installs.
     """
-    result = []
+    tagtypes = frozenset(context.session.tagtypes)
     for path, lookup_future in context.browse(uri):
         if not lookup_future:
-            result.append(("directory", path.lstrip("/")))
+            yield ("directory", path.lstrip("/"))
         else:
             for tracks in lookup_future.get().values():
                 for track in tracks:
-                    result.extend(
-                        translator.track_to_mpd_format(
-                            track, context.session.tagtypes
-                        )
-                    )
-    return result
+                    yield translator.track_to_mpd_format(track, tagtypes)
 
 
 @protocol.commands.add("listfiles")
@@ -418,6 +546,10 @@ def rescan(context, uri=None):
 
         Same as ``update``, but also rescans unmodified files.
     """
+    if context.library_stats is not None:
+        context.library_stats.invalidate()
+    if context.search_cache is not None:
+        context.search_cache.invalidate()
     return {"updating_db": 0}  # TODO
 
 
@@ -446,18 +578,28 @@ def search(context, *args):
 
     - also uses the search type "date".
     - uses "file" instead of "filename".
+
+    *Clarifications:*
+
+    - ``window START:END`` at the end limits the output to that range of the
+      results.
     """
+    args, window = _split_window(args)
     try:
         query = _query_from_mpd_search_parameters(args, _SEARCH_MAPPING)
     except ValueError:
         return
-    results = context.core.library.search(query).get()
-    artists = [_artist_as_track(a) for a in _get_artists(results)]
-    albums = [_album_as_track(a) for a in _get_albums(results)]
-    tracks = _get_tracks(results)
-    return translator.tracks_to_mpd_format(
-        artists + albums + tracks, context.session.tagtypes
+
+    def fetch():
+        results = _search(context, query)
+        return (
+            _get_artists(results) + _get_albums(results) + _get_tracks(results)
+        )
+
+    results = _get_query_results(
+        context, ("search",) + tuple(args), window, fetch
     )
+    return _iter_results_to_mpd_format(context, results, window)
 
 
 @protocol.commands.add("searchadd")
@@ -514,6 +656,7 @@ def searchaddpl(context, *args):
     playlist = uri is not None and context.core.playlists.lookup(uri).get()
     if not playlist:
         playlist = context.core.playlists.create(playlist_name).get()
+        context.playlist_changed(playlist)
     tracks = list(playlist.tracks) + _get_tracks(results)
     playlist = playlist.replace(tracks=tracks)
     context.core.playlists.save(playlist)
@@ -536,6 +679,10 @@ def update(context, uri=None):
         identifying the update job. You can read the current job id in the
         ``status`` response.
     """
+    if context.library_stats is not None:
+        context.library_stats.invalidate()
+    if context.search_cache is not None:
+        context.search_cache.invalidate()
     return {"updating_db": 0}  # TODO
 
 
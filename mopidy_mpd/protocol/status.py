@@ -1,7 +1,5 @@
-import pykka
-
 from mopidy.core import PlaybackState
-from mopidy_mpd import exceptions, protocol, translator
+from mopidy_mpd import exceptions, protocol, status_cache, translator
 
 #: Subsystems that can be registered with idle command.
 SUBSYSTEMS = [
@@ -93,6 +91,10 @@ def idle(context, *subsystems):
     for subsystem in subsystems:
         context.subscriptions.add(subsystem)
 
+    # Register before collecting events, so no change can slip in between
+    context.register_idle()
+    context.collect_idle_events()
+
     active = context.subscriptions.intersection(context.events)
     if not active:
         context.session.prevent_timeout = True
@@ -101,6 +103,7 @@ def idle(context, *subsystems):
     response = []
     context.events = set()
     context.subscriptions = set()
+    context.unregister_idle()
 
     for subsystem in active:
         response.append(f"changed: {subsystem}")
@@ -112,8 +115,10 @@ def noidle(context):
     """See :meth:`_status_idle`."""
     if not context.subscriptions:
         return
+    context.collect_idle_events()
     context.subscriptions = set()
     context.events = set()
+    context.unregister_idle()
     context.session.prevent_timeout = False
 
 
@@ -133,15 +138,17 @@ def stats(context):
         - ``db_update``: last db update in UNIX time
         - ``playtime``: time length of music played
     """
-    return {
-        "artists": 0,  # TODO
-        "albums": 0,  # TODO
-        "songs": 0,  # TODO
-        "uptime": 0,  # TODO
-        "db_playtime": 0,  # TODO
-        "db_update": 0,  # TODO
-        "playtime": 0,  # TODO
-    }
+    if context.library_stats is None:
+        return {
+            "artists": 0,
+            "albums": 0,
+            "songs": 0,
+            "uptime": 0,
+            "db_playtime": 0,
+            "db_update": 0,
+            "playtime": 0,
+        }
+    return context.library_stats.get()
 
 
 @protocol.commands.add("status")
@@ -181,56 +188,43 @@ def status(context):
         - ``elapsed``: Higher resolution means time in seconds with three
           decimal places for millisecond precision.
     """
-    tl_track = context.core.playback.get_current_tl_track()
-    next_tlid = context.core.tracklist.get_next_tlid()
-
-    futures = {
-        "tracklist.length": context.core.tracklist.get_length(),
-        "tracklist.version": context.core.tracklist.get_version(),
-        "mixer.volume": context.core.mixer.get_volume(),
-        "tracklist.consume": context.core.tracklist.get_consume(),
-        "tracklist.random": context.core.tracklist.get_random(),
-        "tracklist.repeat": context.core.tracklist.get_repeat(),
-        "tracklist.single": context.core.tracklist.get_single(),
-        "playback.state": context.core.playback.get_state(),
-        "playback.current_tl_track": tl_track,
-        "tracklist.index": context.core.tracklist.index(tl_track.get()),
-        "tracklist.next_tlid": next_tlid,
-        "tracklist.next_index": context.core.tracklist.index(
-            tlid=next_tlid.get()
-        ),
-        "playback.time_position": context.core.playback.get_time_position(),
-    }
-    pykka.get_all(futures.values())
+    if context.tracklist_journal is not None:
+        # Record the tracklist version the client is told about, so it can
+        # ask for the changes since then with plchanges.
+        context.tracklist_journal.update()
+    if context.status_cache is not None:
+        values = context.status_cache.get()
+    else:
+        values = status_cache.StatusCache(context.core).get()
     result = [
-        ("volume", _status_volume(futures)),
-        ("repeat", _status_repeat(futures)),
-        ("random", _status_random(futures)),
-        ("single", _status_single(futures)),
-        ("consume", _status_consume(futures)),
-        ("playlist", _status_playlist_version(futures)),
-        ("playlistlength", _status_playlist_length(futures)),
-        ("xfade", _status_xfade(futures)),
-        ("state", _status_state(futures)),
+        ("volume", _status_volume(values)),
+        ("repeat", _status_repeat(values)),
+        ("random", _status_random(values)),
+        ("single", _status_single(values)),
+        ("consume", _status_consume(values)),
+        ("playlist", _status_playlist_version(values)),
+        ("playlistlength", _status_playlist_length(values)),
+        ("xfade", _status_xfade(values)),
+        ("state", _status_state(values)),
     ]
-    if futures["playback.current_tl_track"].get() is not None:
-        result.append(("song", _status_songpos(futures)))
-        result.append(("songid", _status_songid(futures)))
-    if futures["tracklist.next_tlid"].get() is not None:
-        result.append(("nextsong", _status_nextsongpos(futures)))
-        result.append(("nextsongid", _status_nextsongid(futures)))
-    if futures["playback.state"].get() in (
+    if values["playback.current_tl_track"] is not None:
+        result.append(("song", _status_songpos(values)))
+        result.append(("songid", _status_songid(values)))
+    if values["tracklist.next_tlid"] is not None:
+        result.append(("nextsong", _status_nextsongpos(values)))
+        result.append(("nextsongid", _status_nextsongid(values)))
+    if values["playback.state"] in (
         PlaybackState.PLAYING,
         PlaybackState.PAUSED,
     ):
-        result.append(("time", _status_time(futures)))
-        result.append(("elapsed", _status_time_elapsed(futures)))
-        result.append(("bitrate", _status_bitrate(futures)))
+        result.append(("time", _status_time(values)))
+        result.append(("elapsed", _status_time_elapsed(values)))
+        result.append(("bitrate", _status_bitrate(values)))
     return result
 
 
-def _status_bitrate(futures):
-    current_tl_track = futures["playback.current_tl_track"].get()
+def _status_bitrate(values):
+    current_tl_track = values["playback.current_tl_track"]
     if current_tl_track is None:
         return 0
     if current_tl_track.track.bitrate is None:
@@ -238,55 +232,55 @@ def _status_bitrate(futures):
     return current_tl_track.track.bitrate
 
 
-def _status_consume(futures):
-    if futures["tracklist.consume"].get():
+def _status_consume(values):
+    if values["tracklist.consume"]:
         return 1
     else:
         return 0
 
 
-def _status_playlist_length(futures):
-    return futures["tracklist.length"].get()
+def _status_playlist_length(values):
+    return values["tracklist.length"]
 
 
-def _status_playlist_version(futures):
-    return futures["tracklist.version"].get()
+def _status_playlist_version(values):
+    return values["tracklist.version"]
 
 
-def _status_random(futures):
-    return int(futures["tracklist.random"].get())
+def _status_random(values):
+    return int(values["tracklist.random"])
 
 
-def _status_repeat(futures):
-    return int(futures["tracklist.repeat"].get())
+def _status_repeat(values):
+    return int(values["tracklist.repeat"])
 
 
-def _status_single(futures):
-    return int(futures["tracklist.single"].get())
+def _status_single(values):
+    return int(values["tracklist.single"])
 
 
-def _status_songid(futures):
-    current_tl_track = futures["playback.current_tl_track"].get()
+def _status_songid(values):
+    current_tl_track = values["playback.current_tl_track"]
     if current_tl_track is not None:
         return current_tl_track.tlid
     else:
-        return _status_songpos(futures)
+        return _status_songpos(values)
 
 
-def _status_songpos(futures):
-    return futures["tracklist.index"].get()
+def _status_songpos(values):
+    return values["tracklist.index"]
 
 
-def _status_nextsongid(futures):
-    return futures["tracklist.next_tlid"].get()
+def _status_nextsongid(values):
+    return values["tracklist.next_tlid"]
 
 
-def _status_nextsongpos(futures):
-    return futures["tracklist.next_index"].get()
+def _status_nextsongpos(values):
+    return values["tracklist.next_index"]
 
 
-def _status_state(futures):
-    state = futures["playback.state"].get()
+def _status_state(values):
+    state = values["playback.state"]
     if state == PlaybackState.PLAYING:
         return "play"
     elif state == PlaybackState.STOPPED:
@@ -295,19 +289,19 @@ def _status_state(futures):
         return "pause"
 
 
-def _status_time(futures):
-    position = futures["playback.time_position"].get() // 1000
-    total = _status_time_total(futures) // 1000
+def _status_time(values):
+    position = values["playback.time_position"] // 1000
+    total = _status_time_total(values) // 1000
     return f"{position:d}:{total:d}"
 
 
-def _status_time_elapsed(futures):
-    elapsed = futures["playback.time_position"].get() / 1000.0
+def _status_time_elapsed(values):
+    elapsed = values["playback.time_position"] / 1000.0
     return f"{elapsed:.3f}"
 
 
-def _status_time_total(futures):
-    current_tl_track = futures["playback.current_tl_track"].get()
+def _status_time_total(values):
+    current_tl_track = values["playback.current_tl_track"]
     if current_tl_track is None:
         return 0
     elif current_tl_track.track.length is None:
@@ -316,13 +310,13 @@ def _status_time_total(futures):
         return current_tl_track.track.length
 
 
-def _status_volume(futures):
-    volume = futures["mixer.volume"].get()
+def _status_volume(values):
+    volume = values["mixer.volume"]
     if volume is not None:
         return volume
     else:
         return -1
 
 
-def _status_xfade(futures):
+def _status_xfade(values):
     return 0  # Not supported
@@ -4,6 +4,7 @@ import re
 import urllib
 
 from mopidy_mpd import exceptions, protocol, translator
+from mopidy_mpd.playlist_cache import PlaylistCache
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +40,7 @@ def listplaylist(context, name):
         file: relative/path/to/file3.mp3
     """
     playlist = _get_playlist(context, name)
-    return [f"file: {track.uri}" for track in playlist.tracks]
+    return (f"file: {track.uri}" for track in playlist.tracks)
 
 
 @protocol.commands.add("listplaylistinfo")
@@ -57,13 +58,16 @@ def listplaylistinfo(context, name):
         Album, Artist, Track
     """
     playlist = _get_playlist(context, name)
-    track_uris = [track.uri for track in playlist.tracks]
-    tracks_map = context.core.library.lookup(uris=track_uris).get()
-    tracks = []
-    for uri in track_uris:
-        tracks.extend(tracks_map[uri])
-    playlist = playlist.replace(tracks=tracks)
-    return translator.playlist_to_mpd_format(playlist, context.session.tagtypes)
+    tracks = _get_playlist_cache(context).get_tracks(playlist)
+    return translator.iter_tracks_to_mpd_format(
+        tracks, context.session.tagtypes
+    )
+
+
+def _get_playlist_cache(context):
+    if context.playlist_cache is not None:
+        return context.playlist_cache
+    return PlaylistCache(context.core, context.lookup_chunk_size)
 
 
 @protocol.commands.add("listplaylists")
@@ -91,15 +95,23 @@ def listplaylists(context):
 
     - ncmpcpp 0.5.10 segfaults if we return 'playlist: ' on a line, so we must
       ignore playlists without names, which isn't very useful anyway.
+    - Playlists without a known modification time are reported as modified
+      when Mopidy first lists them, or when they last changed.
     """
-    last_modified = _get_last_modified()
+    playlist_refs = [
+        playlist_ref
+        for playlist_ref in context.core.playlists.as_list().get()
+        if playlist_ref.name
+    ]
+    last_modified = _get_playlist_cache(context).get_last_modified(
+        [playlist_ref.uri for playlist_ref in playlist_refs]
+    )
     result = []
-    for playlist_ref in context.core.playlists.as_list().get():
-        if not playlist_ref.name:
-            continue
+    for playlist_ref in playlist_refs:
         name = context.lookup_playlist_name_from_uri(playlist_ref.uri)
+        modified = _get_last_modified(last_modified[playlist_ref.uri])
         result.append(("playlist", name))
-        result.append(("Last-Modified", last_modified))
+        result.append(("Last-Modified", modified))
     return result
 
 
@@ -197,6 +209,7 @@ def _create_playlist(context, name, tracks):
         if new_playlist is None:
             logger.debug("Backend for scheme %s can't create playlists", scheme)
             continue  # Backend can't create playlists at all
+        context.playlist_changed(new_playlist)
         new_playlist = new_playlist.replace(tracks=tracks)
         saved_playlist = context.core.playlists.save(new_playlist).get()
         if saved_playlist is not None:
@@ -210,6 +223,7 @@ def _create_playlist(context, name, tracks):
         # If even MPD's default backend can't save playlist, everything is lost
         logger.warning("MPD's default backend can't create playlists")
         raise exceptions.MpdFailedToSavePlaylist(default_scheme)
+    context.playlist_changed(new_playlist)
     new_playlist = new_playlist.replace(tracks=tracks)
     saved_playlist = context.core.playlists.save(new_playlist).get()
     if saved_playlist is None:
@@ -232,6 +246,7 @@ def playlistclear(context, name):
     playlist = _get_playlist(context, name, must_exist=False)
     if not playlist:
         playlist = context.core.playlists.create(name).get()
+        context.playlist_changed(playlist)
 
     # Just replace tracks with empty list and save
     playlist = playlist.replace(tracks=[])
@@ -333,12 +348,14 @@ def rename(context, old_name, new_name):
     # Create copy of the playlist and remove original
     uri_scheme = urllib.parse.urlparse(old_playlist.uri).scheme
     new_playlist = context.core.playlists.create(new_name, uri_scheme).get()
+    context.playlist_changed(new_playlist)
     new_playlist = new_playlist.replace(tracks=old_playlist.tracks)
     saved_playlist = context.core.playlists.save(new_playlist).get()
 
     if saved_playlist is None:
         raise exceptions.MpdFailedToSavePlaylist(uri_scheme)
     context.core.playlists.delete(old_playlist.uri).get()
+    context.playlist_deleted(old_playlist.uri)
 
 
 @protocol.commands.add("rm")
@@ -355,6 +372,7 @@ def rm(context, name):
     if not uri:
         raise exceptions.MpdNoExistError("No such playlist")
     context.core.playlists.delete(uri).get()
+    context.playlist_deleted(uri)
 
 
 @protocol.commands.add("save")
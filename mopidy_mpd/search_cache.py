@@ -0,0 +1,91 @@
+import collections
+import threading
+import time
+
+#: Default maximum number of queries to cache the results of.
+DEFAULT_MAX_SIZE = 256
+
+#: Default number of seconds to cache the results of a query for.
+DEFAULT_TTL = 300
+
+
+class SearchCache:
+
+    """
+    Caches the results of library queries, least recently used first out.
+
+    The cache is shared between all MPD sessions, so clients browsing the
+    same artists and albums only query the library once. It is cleared when
+    the library is updated or rescanned through MPD. Mopidy has no event for
+    library changes, such as those made by ``mopidy local scan`` or by online
+    backends, so results also expire once older than the TTL.
+
+    Hits, misses, expirations and evictions are counted, to help tune the
+    size and TTL of the cache.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._results = collections.OrderedDict()
+        # Bumped on every invalidation, so results fetched while the library
+        # changed are not cached.
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._evictions = 0
+
+    def get(self, key, fetch):
+        """
+        Return the cached results for ``key``, or the results of calling
+        ``fetch``, which are then cached.
+
+        ``key`` must be hashable, and the results must not be modified by
+        the callers, as they are shared.
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                expires, results = entry
+                if expires > time.monotonic():
+                    self._results.move_to_end(key)
+                    self._hits += 1
+                    return results
+                del self._results[key]
+                self._expirations += 1
+            self._misses += 1
+            generation = self._generation
+
+        results = fetch()
+
+        with self._lock:
+            if generation == self._generation and self.max_size > 0:
+                self._results[key] = (time.monotonic() + self.ttl, results)
+                self._results.move_to_end(key)
+                while len(self._results) > self.max_size:
+                    self._results.popitem(last=False)
+                    self._evictions += 1
+        return results
+
+    def invalidate(self):
+        """Forget all cached results."""
+        with self._lock:
+            self._generation += 1
+            self._results.clear()
+
+    def metrics(self):
+        """
+        Return a dict with the number of cached queries, and the number of
+        hits, misses, expirations and evictions so far.
+        """
+        with self._lock:
+            return {
+                "size": len(self._results),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "expirations": self._expirations,
+                "evictions": self._evictions,
+            }
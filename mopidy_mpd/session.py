@@ -1,3 +1,5 @@
+import inspect
+import itertools
 import logging
 
 from mopidy_mpd import dispatcher, formatting, network, protocol
@@ -5,6 +7,9 @@ from mopidy_mpd.protocol import tagtype_list
 
 logger = logging.getLogger(__name__)
 
+#: Maximum number of response lines to encode and send in one go.
+RESPONSE_BATCH_SIZE = 1000
+
 
 class MpdSession(network.LineProtocol):
 
@@ -17,10 +22,33 @@ class MpdSession(network.LineProtocol):
     encoding = protocol.ENCODING
     delimiter = rb"\r?\n"
 
-    def __init__(self, connection, config=None, core=None, uri_map=None):
+    def __init__(
+        self,
+        connection,
+        config=None,
+        core=None,
+        uri_map=None,
+        tracklist_journal=None,
+        tracklist_index=None,
+        idle_notifier=None,
+        library_stats=None,
+        status_cache=None,
+        search_cache=None,
+        playlist_cache=None,
+    ):
         super().__init__(connection)
         self.dispatcher = dispatcher.MpdDispatcher(
-            session=self, config=config, core=core, uri_map=uri_map
+            session=self,
+            config=config,
+            core=core,
+            uri_map=uri_map,
+            tracklist_journal=tracklist_journal,
+            tracklist_index=tracklist_index,
+            idle_notifier=idle_notifier,
+            library_stats=library_stats,
+            status_cache=status_cache,
+            search_cache=search_cache,
+            playlist_cache=playlist_cache,
         )
         self.tagtypes = tagtype_list.TAGTYPE_LIST.copy()
 
@@ -42,13 +70,33 @@ class MpdSession(network.LineProtocol):
         if not response:
             return
 
-        logger.debug(
-            "Response to %s: %s",
-            self.connection,
-            formatting.indent(self.decode(self.terminator).join(response)),
-        )
+        # Streamed responses are sent in batches as they are generated
+        for lines in _batched(response, RESPONSE_BATCH_SIZE):
+            logger.debug(
+                "Response to %s: %s",
+                self.connection,
+                formatting.indent(self.decode(self.terminator).join(lines)),
+            )
 
-        self.send_lines(response)
+            self.send_lines(lines)
+
+            if self.connection.stopping:
+                # Stop generating the rest of the response for a client that
+                # is gone, e.g. a recursive browse of the entire library.
+                logger.debug("Aborting response to %s", self.connection)
+                if inspect.isgenerator(response):
+                    response.close()
+                break
+
+    def on_receive(self, message):
+        if "idle" in message:
+            self.dispatcher.handle_idle()
+            return
+        super().on_receive(message)
+
+    def on_stop(self):
+        self.dispatcher.context.unregister_idle()
+        super().on_stop()
 
     def on_event(self, subsystem):
         self.dispatcher.handle_idle(subsystem)
@@ -65,3 +113,11 @@ class MpdSession(network.LineProtocol):
 
     def close(self):
         self.stop()
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    batch = list(itertools.islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(iterator, size))
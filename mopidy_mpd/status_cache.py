@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pykka
+
+from mopidy.core import PlaybackState
+
+#: Commands that never change what the ``status`` command reports.
+READ_ONLY_COMMANDS = frozenset(
+    [
+        "channels",
+        "commands",
+        "config",
+        "count",
+        "currentsong",
+        "decoders",
+        "find",
+        "idle",
+        "list",
+        "listall",
+        "listallinfo",
+        "listfiles",
+        "listmounts",
+        "listneighbors",
+        "listplaylist",
+        "listplaylistinfo",
+        "listplaylists",
+        "lsinfo",
+        "noidle",
+        "notcommands",
+        "outputs",
+        "ping",
+        "playlist",
+        "playlistfind",
+        "playlistid",
+        "playlistinfo",
+        "playlistsearch",
+        "plchanges",
+        "plchangesposid",
+        "readmessages",
+        "replay_gain_status",
+        "search",
+        "stats",
+        "status",
+        "tagtypes",
+        "urlhandlers",
+    ]
+)
+
+
+class StatusCache:
+
+    """
+    Keeps a snapshot of the player state reported by the ``status`` command.
+
+    The snapshot is shared between all MPD sessions and is invalidated by the
+    frontend on core events, and by sessions running commands that may change
+    the player state. Only the time position is computed for every call,
+    extrapolated from the snapshot while playing.
+    """
+
+    #: The Mopidy core API. An instance of :class:`mopidy.core.Core`.
+    core = None
+
+    def __init__(self, core=None):
+        self.core = core
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_time = None
+        # Bumped on every invalidation, so a snapshot fetched while the state
+        # changed is not cached.
+        self._generation = 0
+
+    def invalidate(self):
+        """Fetch the state from core again the next time it is used."""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def get(self):
+        """
+        Return a dict with the player state, including the current
+        ``playback.time_position``.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            snapshot_time = self._snapshot_time
+            generation = self._generation
+
+        if snapshot is None:
+            snapshot = self._fetch()
+            snapshot_time = time.monotonic()
+            with self._lock:
+                if generation == self._generation:
+                    self._snapshot = snapshot
+                    self._snapshot_time = snapshot_time
+
+        result = dict(snapshot)
+        if result["playback.state"] == PlaybackState.PLAYING:
+            elapsed = int((time.monotonic() - snapshot_time) * 1000)
+            position = result["playback.time_position"] + elapsed
+            tl_track = result["playback.current_tl_track"]
+            if tl_track is not None and tl_track.track.length is not None:
+                position = min(position, tl_track.track.length)
+            result["playback.time_position"] = position
+        return result
+
+    def _fetch(self):
+        futures = {
+            "tracklist.length": self.core.tracklist.get_length(),
+            "tracklist.version": self.core.tracklist.get_version(),
+            "mixer.volume": self.core.mixer.get_volume(),
+            "tracklist.consume": self.core.tracklist.get_consume(),
+            "tracklist.random": self.core.tracklist.get_random(),
+            "tracklist.repeat": self.core.tracklist.get_repeat(),
+            "tracklist.single": self.core.tracklist.get_single(),
+            "playback.state": self.core.playback.get_state(),
+            "playback.current_tl_track": (
+                self.core.playback.get_current_tl_track()
+            ),
+            "tracklist.next_tlid": self.core.tracklist.get_next_tlid(),
+            "playback.time_position": self.core.playback.get_time_position(),
+        }
+        values = dict(zip(futures.keys(), pykka.get_all(futures.values())))
+
+        # The positions depend on the tracks, so they are looked up together
+        # in a second round trip.
+        tl_track = values["playback.current_tl_track"]
+        futures = {
+            "tracklist.index": self.core.tracklist.index(tl_track),
+            "tracklist.next_index": self.core.tracklist.index(
+                tlid=values["tracklist.next_tlid"]
+            ),
+        }
+        values.update(zip(futures.keys(), pykka.get_all(futures.values())))
+        return values
@@ -1,3 +1,4 @@
+import functools
 import re
 
 from mopidy_mpd import exceptions
@@ -8,22 +9,21 @@ WORD_RE = re.compile(
     (\s*)             # Leading whitespace not allowed, capture it to report.
     ([a-z][a-z0-9_]*) # A command name
     (?:\s+|$)         # trailing whitespace or EOS
-    (.*)              # Possibly a remainder to be parsed
     """,
     re.VERBOSE,
 )
 
 # Quotes matching is an unrolled version of "(?:[^"\\]|\\.)*"
+# Matched at the position of each parameter, so the rest of the line is never
+# copied.
 PARAM_RE = re.compile(
     r"""
-    ^                               # Leading whitespace is not allowed
     (?:
         ([^%(unprintable)s"']+)     # ord(char) < 0x20, not ", not '
         |                           # or
         "([^"\\]*(?:\\.[^"\\]*)*)"  # anything surrounded by quotes
     )
     (?:\s+|$)                       # trailing whitespace or EOS
-    (.*)                            # Possibly a remainder to be parsed
     """
     % {"unprintable": "".join(map(chr, range(0x21)))},
     re.VERBOSE,
@@ -44,6 +44,13 @@ BAD_QUOTED_PARAM_RE = re.compile(
 
 UNESCAPE_RE = re.compile(r"\\(.)")  # Backslash escapes any following char.
 
+# Number of recently split lines to keep the tokens of.
+_CACHE_SIZE = 128
+
+# Longest line to keep the tokens of. Longer lines are split every time, so
+# clients sending long lines do not pin them in the cache.
+_MAX_CACHED_LINE_LENGTH = 1024
+
 
 def split(line):
     """Splits a line into tokens using same rules as MPD.
@@ -62,25 +69,49 @@ def split(line):
       character.
 
     For examples see the tests for this function.
+
+    The tokens of recently split short lines are cached, as clients tend to
+    poll with the same few requests.
     """
+    if len(line) > _MAX_CACHED_LINE_LENGTH:
+        return list(_tokenize(line))
+    return list(_split(line))
+
+
+def _tokenize(line):
     if not line.strip():
         raise exceptions.MpdNoCommand("No command given")
     match = WORD_RE.match(line)
     if not match:
         raise exceptions.MpdUnknownError("Invalid word character")
-    whitespace, command, remainder = match.groups()
+    whitespace, command = match.groups()
     if whitespace:
         raise exceptions.MpdUnknownError("Letter expected")
 
+    # The parameters end at the first newline.
+    pos = match.end()
+    end = line.find("\n", pos)
+    if end == -1:
+        end = len(line)
+
     result = [command]
-    while remainder:
-        match = PARAM_RE.match(remainder)
+    while pos < end:
+        match = PARAM_RE.match(line, pos, end)
         if not match:
-            msg = _determine_error_message(remainder)
+            msg = _determine_error_message(line[pos:end])
             raise exceptions.MpdArgError(msg, command=command)
-        unquoted, quoted, remainder = match.groups()
-        result.append(unquoted or UNESCAPE_RE.sub(r"\g<1>", quoted))
-    return result
+        unquoted, quoted = match.groups()
+        if unquoted is not None:
+            result.append(unquoted)
+        elif "\\" in quoted:
+            result.append(UNESCAPE_RE.sub(r"\g<1>", quoted))
+        else:
+            result.append(quoted)
+        pos = match.end()
+    return tuple(result)
+
+
+_split = functools.lru_cache(maxsize=_CACHE_SIZE)(_tokenize)
 
 
 def _determine_error_message(remainder):
@@ -0,0 +1,161 @@
+import collections
+import threading
+
+#: MPD tags that can be searched for, and aliases for them.
+TAG_ALIASES = {
+    "album": "album",
+    "albumartist": "albumartist",
+    "any": "any",
+    "artist": "artist",
+    "comment": "comment",
+    "composer": "composer",
+    "date": "date",
+    "disc": "disc",
+    "file": "file",
+    "filename": "file",
+    "genre": "genre",
+    "musicbrainz_albumid": "musicbrainz_albumid",
+    "musicbrainz_artistid": "musicbrainz_artistid",
+    "musicbrainz_trackid": "musicbrainz_trackid",
+    "performer": "performer",
+    "title": "title",
+    "track": "track",
+}
+
+
+class TracklistIndex:
+
+    """
+    Indexes the tracks of the current tracklist by their MPD tag values.
+
+    For every tag, each value maps to the tlids of the tracks having it, both
+    as is for exact matching and lowercased for case-insensitive partial
+    matching. Partial matching only has to look at each distinct value once,
+    instead of at every track.
+
+    The index is shared between all MPD sessions. It is dropped on
+    ``tracklist_changed`` events by the frontend, and only rebuilt when it is
+    next queried, so a burst of tracklist changes costs a single rebuild. It
+    is also synced with the core whenever it is queried, so it never answers
+    with stale data.
+    """
+
+    #: The Mopidy core API. An instance of :class:`mopidy.core.Core`.
+    core = None
+
+    def __init__(self, core=None):
+        self.core = core
+        self._lock = threading.Lock()
+        self._version = None
+        self._tl_tracks = []
+        self._positions = {}
+        self._exact = {}
+        self._folded = {}
+
+    def invalidate(self):
+        """Drop the index, to be rebuilt when it is next queried."""
+        with self._lock:
+            self._version = None
+            self._tl_tracks = []
+            self._positions = {}
+            self._exact = {}
+            self._folded = {}
+
+    def update(self):
+        """
+        Rebuild the index if the tracklist changed since the last update.
+        """
+        with self._lock:
+            self._sync()
+
+    def find(self, tag, needle):
+        """
+        Return ``(position, tl_track)`` pairs for the tracks with the tag
+        value ``needle``, in tracklist order.
+
+        Raises :exc:`KeyError` if ``tag`` is not a known tag.
+        """
+        tag = TAG_ALIASES[tag.lower()]
+        with self._lock:
+            self._sync()
+            return self._tracks_by_tlids(self._exact[tag].get(needle, []))
+
+    def search(self, tag, needle):
+        """
+        Return ``(position, tl_track)`` pairs for the tracks with a tag value
+        containing ``needle``, ignoring case, in tracklist order.
+
+        Raises :exc:`KeyError` if ``tag`` is not a known tag.
+        """
+        tag = TAG_ALIASES[tag.lower()]
+        needle = needle.lower()
+        with self._lock:
+            self._sync()
+            tlids = [
+                tlid
+                for value, value_tlids in self._folded[tag].items()
+                if needle in value
+                for tlid in value_tlids
+            ]
+            return self._tracks_by_tlids(tlids)
+
+    def _tracks_by_tlids(self, tlids):
+        positions = sorted({self._positions[tlid] for tlid in tlids})
+        return [(position, self._tl_tracks[position]) for position in positions]
+
+    def _sync(self):
+        version = self.core.tracklist.get_version().get()
+        if version == self._version:
+            return
+        tl_tracks = self.core.tracklist.get_tl_tracks().get()
+
+        exact = {tag: collections.defaultdict(list) for tag in TAG_ALIASES}
+        folded = {tag: collections.defaultdict(list) for tag in TAG_ALIASES}
+        for tl_track in tl_tracks:
+            for tag, values in _track_tag_values(tl_track.track).items():
+                for value in values:
+                    for index, key in ((exact, value), (folded, value.lower())):
+                        index[tag][key].append(tl_track.tlid)
+                        index["any"][key].append(tl_track.tlid)
+
+        self._version = version
+        self._tl_tracks = tl_tracks
+        self._positions = {
+            tl_track.tlid: position
+            for position, tl_track in enumerate(tl_tracks)
+        }
+        self._exact = exact
+        self._folded = folded
+
+
+def _track_tag_values(track):
+    album = track.album
+    return {
+        "album": [album.name] if album and album.name else [],
+        "albumartist": _names(album.artists if album else ()),
+        "artist": _names(track.artists),
+        "comment": [track.comment] if track.comment else [],
+        "composer": _names(track.composers),
+        "date": [track.date] if track.date else [],
+        "disc": [str(track.disc_no)] if track.disc_no else [],
+        "file": [track.uri] if track.uri else [],
+        "genre": [track.genre] if track.genre else [],
+        "musicbrainz_albumid": (
+            [album.musicbrainz_id] if album and album.musicbrainz_id else []
+        ),
+        "musicbrainz_artistid": [
+            artist.musicbrainz_id
+            for artist in track.artists
+            if artist.musicbrainz_id
+        ],
+        "musicbrainz_trackid": (
+            [track.musicbrainz_id] if track.musicbrainz_id else []
+        ),
+        "performer": _names(track.performers),
+        "title": [track.name] if track.name else [],
+        "track": [str(track.track_no)] if track.track_no else [],
+    }
+
+
+def _names(models):
+    return [model.name for model in models if model.name]
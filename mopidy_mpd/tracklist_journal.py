@@ -0,0 +1,123 @@
+import collections
+import itertools
+import threading
+
+#: Number of tracklist versions to remember changes for.
+DEFAULT_MAX_ENTRIES = 64
+
+
+class TracklistJournal:
+
+    """
+    Keeps a bounded journal of which tracklist positions changed between
+    tracklist versions.
+
+    The journal is shared between all MPD sessions. It is marked as dirty on
+    ``tracklist_changed`` events by the frontend, and only records the changes
+    when a client asks for the status, so the versions clients know of are
+    journaled. It is also synced with the core whenever it is queried, so it
+    never answers with stale data.
+
+    Changes are only known between the recorded versions, so asking for the
+    changes since any other version returns the entire tracklist.
+    """
+
+    #: The Mopidy core API. An instance of :class:`mopidy.core.Core`.
+    core = None
+
+    def __init__(self, core=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.core = core
+        self._lock = threading.Lock()
+        self._version = None
+        self._tl_tracks = []
+        self._dirty = True
+        # Each entry is a tuple ``(from_version, to_version, ranges)`` where
+        # ``ranges`` are the ``(start, stop)`` position ranges that changed.
+        self._entries = collections.deque(maxlen=max_entries)
+
+    def invalidate(self):
+        """Mark the tracklist as changed since the last update."""
+        with self._lock:
+            self._dirty = True
+
+    def update(self):
+        """
+        Record the changes made to the tracklist since the last update, if it
+        was marked as changed.
+        """
+        with self._lock:
+            if self._dirty:
+                self._sync()
+
+    def changes_since(self, version):
+        """
+        Return ``(position, tl_track)`` pairs for all positions in the current
+        tracklist that changed after the given tracklist version.
+
+        If the version was not recorded by the journal, because it is too old,
+        newer than the current version, or was never seen by the journal, the
+        entire tracklist is returned.
+        """
+        with self._lock:
+            self._sync()
+            tl_tracks = self._tl_tracks
+            if version == self._version:
+                return []
+            if version in {from_ for from_, _to, _ranges in self._entries}:
+                ranges = _merge_ranges(
+                    itertools.chain.from_iterable(
+                        entry_ranges
+                        for from_, _to, entry_ranges in self._entries
+                        if from_ >= version
+                    )
+                )
+            else:
+                ranges = [(0, len(tl_tracks))]
+
+        return [
+            (position, tl_tracks[position])
+            for start, stop in ranges
+            for position in range(start, min(stop, len(tl_tracks)))
+        ]
+
+    def _sync(self):
+        self._dirty = False
+        version = self.core.tracklist.get_version().get()
+        if version == self._version:
+            return
+        tl_tracks = self.core.tracklist.get_tl_tracks().get()
+
+        if self._version is not None:
+            ranges = _changed_ranges(self._tl_tracks, tl_tracks)
+            self._entries.append((self._version, version, ranges))
+        self._version = version
+        self._tl_tracks = tl_tracks
+
+
+def _changed_ranges(old_tl_tracks, new_tl_tracks):
+    """Return position ranges where the tracks differ, by tlid."""
+    ranges = []
+    start = None
+    for position, tl_track in enumerate(new_tl_tracks):
+        changed = (
+            position >= len(old_tl_tracks)
+            or old_tl_tracks[position].tlid != tl_track.tlid
+        )
+        if changed and start is None:
+            start = position
+        elif not changed and start is not None:
+            ranges.append((start, position))
+            start = None
+    if start is not None:
+        ranges.append((start, len(new_tl_tracks)))
+    return ranges
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
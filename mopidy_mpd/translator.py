@@ -1,4 +1,5 @@
 import datetime
+import functools
 import logging
 import re
 
@@ -18,6 +19,10 @@ def normalize_path(path, relative=False):
     return "/".join(parts)
 
 
+#: Number of formatted tracks kept in the cache shared by all sessions.
+TRACK_CACHE_SIZE = 10000
+
+
 def track_to_mpd_format(track, tagtypes, position=None, stream_title=None):
     """
     Format track for output to MPD client.
@@ -39,7 +44,23 @@ def track_to_mpd_format(track, tagtypes, position=None, stream_title=None):
         logger.warning("Ignoring track without uri")
         return []
 
-    result = [
+    head, tail = _format_track(track, frozenset(tagtypes), stream_title)
+    if position is not None and tlid is not None:
+        return [*head, ("Pos", position), ("Id", tlid), *tail]
+    return [*head, *tail]
+
+
+@functools.lru_cache(maxsize=TRACK_CACHE_SIZE)
+def _format_track(track, tagtypes, stream_title):
+    """
+    Format the parts of a track that do not depend on its tracklist position.
+
+    As tracks are immutable, the result is cached for all sessions. The
+    position and tlid of a track goes between the two returned parts.
+
+    :rtype: two-tuple of tuples of two-tuples
+    """
+    head = [
         ("file", track.uri),
         ("Time", track.length and (track.length // 1000) or 0),
         *multi_tag_list(track.artists, "name", "Artist"),
@@ -47,66 +68,82 @@ def track_to_mpd_format(track, tagtypes, position=None, stream_title=None):
     ]
 
     if stream_title is not None:
-        result.append(("Title", stream_title))
+        head.append(("Title", stream_title))
         if track.name:
-            result.append(("Name", track.name))
+            head.append(("Name", track.name))
     else:
-        result.append(("Title", track.name or ""))
+        head.append(("Title", track.name or ""))
 
     if track.date:
-        result.append(("Date", track.date))
+        head.append(("Date", track.date))
 
     if track.album is not None and track.album.num_tracks is not None:
-        result.append(
+        head.append(
             ("Track", f"{track.track_no or 0}/{track.album.num_tracks}")
         )
     else:
-        result.append(("Track", track.track_no or 0))
-    if position is not None and tlid is not None:
-        result.append(("Pos", position))
-        result.append(("Id", tlid))
+        head.append(("Track", track.track_no or 0))
+
+    tail = []
     if track.album is not None and track.album.musicbrainz_id is not None:
-        result.append(("MUSICBRAINZ_ALBUMID", track.album.musicbrainz_id))
+        tail.append(("MUSICBRAINZ_ALBUMID", track.album.musicbrainz_id))
 
     if track.album is not None and track.album.artists:
-        result += multi_tag_list(track.album.artists, "name", "AlbumArtist")
+        tail += multi_tag_list(track.album.artists, "name", "AlbumArtist")
 
         musicbrainz_ids = concat_multi_values(
             track.album.artists, "musicbrainz_id"
         )
         if musicbrainz_ids:
-            result.append(("MUSICBRAINZ_ALBUMARTISTID", musicbrainz_ids))
+            tail.append(("MUSICBRAINZ_ALBUMARTISTID", musicbrainz_ids))
 
     if track.artists:
         musicbrainz_ids = concat_multi_values(track.artists, "musicbrainz_id")
         if musicbrainz_ids:
-            result.append(("MUSICBRAINZ_ARTISTID", musicbrainz_ids))
+            tail.append(("MUSICBRAINZ_ARTISTID", musicbrainz_ids))
 
     if track.composers:
-        result += multi_tag_list(track.composers, "name", "Composer")
+        tail += multi_tag_list(track.composers, "name", "Composer")
 
     if track.performers:
-        result += multi_tag_list(track.performers, "name", "Performer")
+        tail += multi_tag_list(track.performers, "name", "Performer")
 
     if track.genre:
-        result.append(("Genre", track.genre))
+        tail.append(("Genre", track.genre))
 
     if track.disc_no:
-        result.append(("Disc", track.disc_no))
+        tail.append(("Disc", track.disc_no))
 
     if track.last_modified:
         datestring = datetime.datetime.utcfromtimestamp(
             track.last_modified // 1000
         ).isoformat()
-        result.append(("Last-Modified", datestring + "Z"))
+        tail.append(("Last-Modified", datestring + "Z"))
 
     if track.musicbrainz_id is not None:
-        result.append(("MUSICBRAINZ_TRACKID", track.musicbrainz_id))
+        tail.append(("MUSICBRAINZ_TRACKID", track.musicbrainz_id))
 
     if track.album and track.album.uri:
-        result.append(("X-AlbumUri", track.album.uri))
+        tail.append(("X-AlbumUri", track.album.uri))
 
-    return [element for element in result if _has_value(tagtypes, *element)]
+    return (
+        tuple(element for element in head if _has_value(tagtypes, *element)),
+        tuple(element for element in tail if _has_value(tagtypes, *element)),
+    )
+
+
+def track_cache_info():
+    """
+    Return hit and miss statistics for the shared track format cache.
+
+    :rtype: :func:`functools.lru_cache` cache info named tuple
+    """
+    return _format_track.cache_info()
+
+
+def clear_track_cache():
+    """Empty the shared track format cache and reset its statistics."""
+    _format_track.cache_clear()
 
 
 def _has_value(tagtypes, tagtype, value):
@@ -187,17 +224,27 @@ def tracks_to_mpd_format(tracks, tagtypes, start=0, end=None):
     :type end: int (positive or negative) or :class:`None` for end of list
     :rtype: list of lists of two-tuples
     """
+    return list(iter_tracks_to_mpd_format(tracks, tagtypes, start, end))
+
+
+def iter_tracks_to_mpd_format(tracks, tagtypes, start=0, end=None):
+    """
+    Lazily format list of tracks for output to MPD client.
+
+    Arguments as for :func:`tracks_to_mpd_format`.
+
+    :rtype: generator of lists of two-tuples
+    """
     if end is None:
         end = len(tracks)
     tracks = tracks[start:end]
     positions = range(start, end)
     assert len(tracks) == len(positions)
-    result = []
+    tagtypes = frozenset(tagtypes)
     for track, position in zip(tracks, positions):
         formatted_track = track_to_mpd_format(track, tagtypes, position)
         if formatted_track:
-            result.append(formatted_track)
-    return result
+            yield formatted_track
 
 
 def playlist_to_mpd_format(playlist, tagtypes, *args, **kwargs):
@@ -1,13 +1,33 @@
+import collections
+import contextlib
+import heapq
+import logging
+import os
 import re
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
 
 # TOOD: refactor this into a generic mapper that does not know about browse
 # or playlists and then use one instance for each case?
 
+#: Default maximum number of browse paths to keep mappings for.
+DEFAULT_MAX_BROWSE_ENTRIES = 100000
+
 
 class MpdUriMapper:
 
     """
     Maintains the mappings between uniquified MPD names and URIs.
+
+    Browse paths are kept in an index of bounded size, evicting the least
+    recently used paths first. The index can be saved to and loaded from disk,
+    so paths can be resolved without browsing down to them after a restart.
+
+    Playlists are loaded from core once, and then kept current by passing on
+    the ``playlists_loaded``, ``playlist_changed`` and ``playlist_deleted``
+    core events to the methods of the same names.
     """
 
     #: The Mopidy core API. An instance of :class:`mopidy.core.Core`.
@@ -15,41 +35,169 @@ class MpdUriMapper:
 
     _invalid_browse_chars = re.compile(r"[\n\r]")
     _invalid_playlist_chars = re.compile(r"[/]")
+    _unique_name_re = re.compile(r"^(.*) \[(\d+)\]$")
 
-    def __init__(self, core=None):
+    def __init__(
+        self, core=None, max_browse_entries=DEFAULT_MAX_BROWSE_ENTRIES
+    ):
         self.core = core
+        self.max_browse_entries = max_browse_entries
+        self._lock = threading.RLock()
         self._uri_from_name = {}
-        self._browse_name_from_uri = {}
         self._playlist_name_from_uri = {}
+        # Once loaded, the playlist mapping is kept current by events, so a
+        # name missing from it is unknown and is not looked up in core again.
+        self._playlists_loaded = False
+        # Browse paths are kept in least recently used order
+        self._browse_uri_from_name = collections.OrderedDict()
+        self._browse_name_from_uri = {}
+        # The numeric suffixes in use to make names unique, by the original
+        # name. They are released when the names are evicted or removed, and
+        # forgotten once no name uses them.
+        self._suffixes = {}
 
-    def _create_unique_name(self, name, uri):
+    def _create_unique_name(self, name, uri, uri_from_name, name_from_uri):
         stripped_name = self._invalid_browse_chars.sub(" ", name)
-        name = stripped_name
-        i = 2
-        while name in self._uri_from_name:
-            if self._uri_from_name[name] == uri:
-                return name
-            name = f"{stripped_name} [{i:d}]"
-            i += 1
-        return name
+        name = name_from_uri.get(uri)
+        if (
+            name is not None
+            and uri_from_name.get(name) == uri
+            and self._strip_unique_suffix(name) == stripped_name
+        ):
+            return name
+
+        if uri_from_name.get(stripped_name, uri) == uri:
+            return stripped_name
+
+        suffixes = self._suffixes.setdefault(stripped_name, _Suffixes())
+        i = suffixes.allocate(
+            lambda i: f"{stripped_name} [{i:d}]" not in uri_from_name
+        )
+        return f"{stripped_name} [{i:d}]"
+
+    def _strip_unique_suffix(self, name):
+        match = self._unique_name_re.match(name)
+        if match is None:
+            return name
+        return match.group(1)
+
+    def _remember_unique_name(self, name):
+        match = self._unique_name_re.match(name)
+        if match is None:
+            return
+        stripped_name, i = match.group(1), int(match.group(2))
+        self._suffixes.setdefault(stripped_name, _Suffixes()).take(i)
+
+    def _release_unique_name(self, name):
+        match = self._unique_name_re.match(name)
+        if match is None:
+            return
+        stripped_name, i = match.group(1), int(match.group(2))
+        suffixes = self._suffixes.get(stripped_name)
+        if suffixes is not None and suffixes.release(i):
+            del self._suffixes[stripped_name]
 
     def insert(self, name, uri, playlist=False):
         """
         Create a unique and MPD compatible name that maps to the given URI.
         """
-        name = self._create_unique_name(name, uri)
-        self._uri_from_name[name] = uri
-        if playlist:
-            self._playlist_name_from_uri[uri] = name
-        else:
-            self._browse_name_from_uri[uri] = name
-        return name
+        with self._lock:
+            if playlist:
+                name = self._create_unique_name(
+                    name,
+                    uri,
+                    self._uri_from_name,
+                    self._playlist_name_from_uri,
+                )
+                self._uri_from_name[name] = uri
+                self._playlist_name_from_uri[uri] = name
+            else:
+                name = self._create_unique_name(
+                    name,
+                    uri,
+                    self._browse_uri_from_name,
+                    self._browse_name_from_uri,
+                )
+                self._insert_browse_path(name, uri)
+            return name
+
+    def _insert_browse_path(self, name, uri):
+        old_uri = self._browse_uri_from_name.get(name)
+        if old_uri not in (None, uri):
+            if self._browse_name_from_uri.get(old_uri) == name:
+                del self._browse_name_from_uri[old_uri]
+        self._browse_uri_from_name[name] = uri
+        self._browse_uri_from_name.move_to_end(name)
+        self._browse_name_from_uri[uri] = name
+        while len(self._browse_uri_from_name) > self.max_browse_entries:
+            old_name, old_uri = self._browse_uri_from_name.popitem(last=False)
+            if self._browse_name_from_uri.get(old_uri) == old_name:
+                del self._browse_name_from_uri[old_uri]
+            self._release_unique_name(old_name)
 
     def uri_from_name(self, name):
         """
         Return the uri for the given MPD name.
         """
-        return self._uri_from_name.get(name)
+        with self._lock:
+            uri = self._browse_uri_from_name.get(name)
+            if uri is not None:
+                self._browse_uri_from_name.move_to_end(name)
+                return uri
+            return self._uri_from_name.get(name)
+
+    def load_browse_index(self, path):
+        """
+        Load browse paths saved with :meth:`save_browse_index`.
+
+        Paths already known are kept, and count as more recently used than the
+        loaded ones.
+        """
+        if not os.path.exists(path):
+            return
+
+        try:
+            connection = sqlite3.connect(str(path))
+            with contextlib.closing(connection), connection:
+                rows = connection.execute(
+                    "SELECT name, uri FROM browse_index ORDER BY position"
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("Failed to load MPD browse index: %s", exc)
+            return
+
+        with self._lock:
+            known = list(self._browse_uri_from_name.items())
+            for name, uri in rows[-self.max_browse_entries :]:
+                self._insert_browse_path(name, uri)
+                self._remember_unique_name(name)
+            for name, uri in known:
+                self._insert_browse_path(name, uri)
+        logger.debug("Loaded %d MPD browse paths from %s", len(rows), path)
+
+    def save_browse_index(self, path):
+        """
+        Save the browse paths to disk, replacing any previously saved paths.
+        """
+        with self._lock:
+            rows = list(enumerate(self._browse_uri_from_name.items()))
+
+        try:
+            connection = sqlite3.connect(str(path))
+            with contextlib.closing(connection), connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS browse_index "
+                    "(position INTEGER PRIMARY KEY, name TEXT, uri TEXT)"
+                )
+                connection.execute("DELETE FROM browse_index")
+                connection.executemany(
+                    "INSERT INTO browse_index VALUES (?, ?, ?)",
+                    ((position, name, uri) for position, (name, uri) in rows),
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Failed to save MPD browse index: %s", exc)
+            return
+        logger.debug("Saved %d MPD browse paths to %s", len(rows), path)
 
     def refresh_playlists_mapping(self):
         """
@@ -59,24 +207,114 @@ class MpdUriMapper:
         if self.core is None:
             return
 
-        for playlist_ref in self.core.playlists.as_list().get():
-            if not playlist_ref.name:
-                continue
-            name = self._invalid_playlist_chars.sub("|", playlist_ref.name)
-            self.insert(name, playlist_ref.uri, playlist=True)
+        playlist_refs = self.core.playlists.as_list().get()
+        with self._lock:
+            self._uri_from_name.clear()
+            self._playlist_name_from_uri.clear()
+            for playlist_ref in playlist_refs:
+                self._insert_playlist(playlist_ref)
+            self._playlists_loaded = True
+
+    def _insert_playlist(self, playlist):
+        if not playlist.name:
+            return
+        name = self._invalid_playlist_chars.sub("|", playlist.name)
+        self.insert(name, playlist.uri, playlist=True)
+
+    def _remove_playlist(self, uri):
+        name = self._playlist_name_from_uri.pop(uri, None)
+        if name is not None and self._uri_from_name.get(name) == uri:
+            del self._uri_from_name[name]
+            self._release_unique_name(name)
+
+    def playlists_loaded(self):
+        """
+        Reload all playlists from core the next time a playlist is not found.
+        """
+        with self._lock:
+            self._playlists_loaded = False
+
+    def playlist_changed(self, playlist):
+        """
+        Update the mapping for a created, changed or renamed playlist.
+        """
+        with self._lock:
+            # Removing the old name first lets the playlist keep it if its
+            # name did not change.
+            self._remove_playlist(playlist.uri)
+            self._insert_playlist(playlist)
+
+    def playlist_deleted(self, uri):
+        """
+        Remove the mapping for a deleted playlist.
+        """
+        with self._lock:
+            self._remove_playlist(uri)
 
     def playlist_uri_from_name(self, name):
         """
         Helper function to retrieve a playlist URI from its unique MPD name.
         """
-        if name not in self._uri_from_name:
-            self.refresh_playlists_mapping()
+        with self._lock:
+            if name in self._uri_from_name or self._playlists_loaded:
+                return self._uri_from_name.get(name)
+        self.refresh_playlists_mapping()
         return self._uri_from_name.get(name)
 
     def playlist_name_from_uri(self, uri):
         """
         Helper function to retrieve the unique MPD playlist name from its URI.
         """
-        if uri not in self._playlist_name_from_uri:
-            self.refresh_playlists_mapping()
+        with self._lock:
+            if uri in self._playlist_name_from_uri:
+                return self._playlist_name_from_uri[uri]
+        # The URI comes from core, so the playlist exists even if the event
+        # about it has not been seen yet.
+        self.refresh_playlists_mapping()
         return self._playlist_name_from_uri[uri]
+
+
+class _Suffixes:
+
+    """
+    The numeric suffixes used to make one name unique.
+
+    Released suffixes are reused lowest first, so paths browsed again in the
+    same order after being evicted get the same names. New suffixes continue
+    from the last one, instead of probing all of them, to keep this fast for
+    thousands of identical names.
+    """
+
+    def __init__(self):
+        self._last = 1
+        self._used = set()
+        self._released = []
+
+    def allocate(self, is_free):
+        """
+        Return the lowest released suffix, or else the next new one, for which
+        ``is_free`` returns true.
+        """
+        while self._released:
+            i = heapq.heappop(self._released)
+            if i not in self._used and is_free(i):
+                self._used.add(i)
+                return i
+        i = self._last + 1
+        while not is_free(i):
+            i += 1
+        self._last = i
+        self._used.add(i)
+        return i
+
+    def take(self, i):
+        """Mark a suffix as used, like one loaded from disk."""
+        self._used.add(i)
+        self._last = max(self._last, i)
+
+    def release(self, i):
+        """Release a suffix, and return true if no suffixes are used anymore."""
+        if i in self._used:
+            self._used.remove(i)
+            heapq.heappush(self._released, i)
+        return not self._used
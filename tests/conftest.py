@@ -0,0 +1,36 @@
+import pykka
+import pytest
+
+from mopidy import core
+
+from tests import dummy_audio, dummy_backend, dummy_mixer
+
+
+@pytest.fixture
+def library():
+    """The tracks in the library of the dummy backend."""
+    return []
+
+
+@pytest.fixture
+def tracklist_uris():
+    """The URIs to add to the tracklist when starting the core."""
+    return []
+
+
+@pytest.fixture
+def mopidy_core(library, tracklist_uris):
+    """A running core with a dummy backend, audio and mixer."""
+    audio = dummy_audio.create_proxy()
+    backend = dummy_backend.create_proxy(audio=audio)
+    backend.library.dummy_library = library
+    mopidy_core = core.Core.start(
+        config={"core": {"max_tracklist_length": 10000}},
+        audio=audio,
+        mixer=dummy_mixer.create_proxy(),
+        backends=[backend],
+    ).proxy()
+    if tracklist_uris:
+        mopidy_core.tracklist.add(uris=tracklist_uris).get()
+    yield mopidy_core
+    pykka.ActorRegistry.stop_all()
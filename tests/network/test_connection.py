@@ -1,6 +1,8 @@
+import collections
 import errno
 import logging
 import socket
+import threading
 import unittest
 from unittest.mock import Mock, call, patch, sentinel
 
@@ -9,12 +11,13 @@ from gi.repository import GLib
 
 from mopidy_mpd import network
 
-from tests import any_int, any_unicode
+from tests import IsA, any_int, any_unicode
 
 
 class ConnectionTest(unittest.TestCase):
     def setUp(self):  # noqa: N802
         self.mock = Mock(spec=network.Connection)
+        self.mock.send_drained = Mock()
 
     def test_init_ensure_nonblocking_io(self):
         sock = Mock(spec=socket.SocketType)
@@ -351,43 +354,96 @@ class ConnectionTest(unittest.TestCase):
         assert 0 == GLib.source_remove.call_count
         assert self.mock.timeout_id is None
 
+    def prepare_send_buffer(self, *chunks):
+        self.mock.send_buffer = collections.deque(map(memoryview, chunks))
+        self.mock.send_buffer_size = sum(len(chunk) for chunk in chunks)
+
+    def test_init_creates_empty_send_buffer(self):
+        network.Connection.__init__(
+            self.mock,
+            Mock(),
+            {},
+            Mock(),
+            (sentinel.host, sentinel.port),
+            sentinel.timeout,
+        )
+        assert not self.mock.send_buffer
+        assert 0 == self.mock.send_buffer_size
+        assert self.mock.send_drained.is_set()
+
     def test_queue_send_acquires_and_releases_lock(self):
         self.mock.send_lock = Mock()
-        self.mock.send_buffer = b""
+        self.prepare_send_buffer()
 
         network.Connection.queue_send(self.mock, b"data")
         self.mock.send_lock.acquire.assert_called_once_with(True)
         self.mock.send_lock.release.assert_called_once_with()
 
-    def test_queue_send_calls_send(self):
-        self.mock.send_buffer = b""
+    def test_queue_send_appends_to_buffer_and_calls_send(self):
         self.mock.send_lock = Mock()
-        self.mock.send.return_value = b""
+        self.prepare_send_buffer(b"foo")
 
-        network.Connection.queue_send(self.mock, b"data")
-        self.mock.send.assert_called_once_with(b"data")
-        assert 0 == self.mock.enable_send.call_count
-        assert b"" == self.mock.send_buffer
+        network.Connection.queue_send(self.mock, b"bar")
+        self.mock.send.assert_called_once_with()
+        assert [b"foo", b"bar"] == list(self.mock.send_buffer)
+        assert 6 == self.mock.send_buffer_size
 
     def test_queue_send_calls_enable_send_for_partial_send(self):
-        self.mock.send_buffer = b""
         self.mock.send_lock = Mock()
-        self.mock.send.return_value = b"ta"
+        self.prepare_send_buffer()
 
         network.Connection.queue_send(self.mock, b"data")
-        self.mock.send.assert_called_once_with(b"data")
         self.mock.enable_send.assert_called_once_with()
-        assert b"ta" == self.mock.send_buffer
 
-    def test_queue_send_calls_send_with_existing_buffer(self):
-        self.mock.send_buffer = b"foo"
+    def test_queue_send_does_not_enable_send_when_all_is_sent(self):
         self.mock.send_lock = Mock()
-        self.mock.send.return_value = b""
+        self.prepare_send_buffer()
+        self.mock.send.side_effect = lambda: self.mock.send_buffer.clear()
 
-        network.Connection.queue_send(self.mock, b"bar")
-        self.mock.send.assert_called_once_with(b"foobar")
+        network.Connection.queue_send(self.mock, b"data")
         assert 0 == self.mock.enable_send.call_count
-        assert b"" == self.mock.send_buffer
+
+    def test_queue_send_waits_above_high_water_mark(self):
+        self.mock.send_lock = Mock()
+        self.mock.send_drained = threading.Event()
+        self.prepare_send_buffer(b"x" * network.SEND_BUFFER_HIGH_WATER_MARK)
+
+        network.Connection.queue_send(self.mock, b"data")
+        assert not self.mock.send_drained.is_set()
+        self.mock.wait_for_send_drained.assert_called_once_with()
+
+    def test_queue_send_does_not_wait_below_high_water_mark(self):
+        self.mock.send_lock = Mock()
+        self.mock.send_drained = threading.Event()
+        self.mock.send_drained.set()
+        self.prepare_send_buffer()
+
+        network.Connection.queue_send(self.mock, b"data")
+        assert 0 == self.mock.wait_for_send_drained.call_count
+
+    def test_wait_for_send_drained_stops_after_timeout(self):
+        self.mock.timeout = 10
+        self.mock.send_drained.wait.return_value = False
+
+        network.Connection.wait_for_send_drained(self.mock)
+        self.mock.send_drained.wait.assert_called_once_with(10)
+        self.mock.stop.assert_called_once_with(any_unicode)
+
+    def test_wait_for_send_drained_without_timeout(self):
+        self.mock.timeout = None
+        self.mock.send_drained.wait.return_value = True
+
+        network.Connection.wait_for_send_drained(self.mock)
+        self.mock.send_drained.wait.assert_called_once_with(None)
+        assert 0 == self.mock.stop.call_count
+
+    def test_stop_releases_blocked_sender(self):
+        self.mock.stopping = False
+        self.mock.actor_ref = Mock()
+        self.mock._sock = Mock(spec=socket.SocketType)
+
+        network.Connection.stop(self.mock, sentinel.reason)
+        self.mock.send_drained.set.assert_called_once_with()
 
     def test_recv_callback_respects_io_err(self):
         self.mock._sock = Mock(spec=socket.SocketType)
@@ -416,20 +472,68 @@ class ConnectionTest(unittest.TestCase):
         )
         self.mock.stop.assert_called_once_with(any_unicode)
 
-    def test_recv_callback_sends_data_to_actor(self):
+    def prepare_recv_test(self, *results, buffer_size=4096):
         self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.recv.return_value = b"data"
         self.mock.actor_ref = Mock()
+        self.mock.recv_buffer = memoryview(bytearray(buffer_size))
+        results = iter(results)
+
+        def recv_into(buffer):
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            buffer[: len(result)] = result
+            return len(result)
+
+        self.mock._sock.recv_into.side_effect = recv_into
+
+    def test_recv_callback_sends_data_to_actor(self):
+        self.prepare_recv_test(b"data", socket.error(errno.EWOULDBLOCK, ""))
 
         assert network.Connection.recv_callback(
             self.mock, sentinel.fd, GLib.IO_IN
         )
         self.mock.actor_ref.tell.assert_called_once_with({"received": b"data"})
 
+    def test_recv_callback_drains_socket_into_one_message(self):
+        self.prepare_recv_test(
+            b"line1\n", b"line2\n", socket.error(errno.EWOULDBLOCK, "")
+        )
+
+        assert network.Connection.recv_callback(
+            self.mock, sentinel.fd, GLib.IO_IN
+        )
+        self.mock.actor_ref.tell.assert_called_once_with(
+            {"received": b"line1\nline2\n"}
+        )
+
+    def test_recv_callback_reads_at_most_buffer_size(self):
+        self.prepare_recv_test(b"abc", b"def", b"ghi", buffer_size=6)
+
+        assert network.Connection.recv_callback(
+            self.mock, sentinel.fd, GLib.IO_IN
+        )
+        assert 2 == self.mock._sock.recv_into.call_count
+        self.mock.actor_ref.tell.assert_called_once_with(
+            {"received": b"abcdef"}
+        )
+
+    def test_recv_callback_sends_data_before_close(self):
+        self.prepare_recv_test(b"data", b"")
+
+        assert network.Connection.recv_callback(
+            self.mock, sentinel.fd, GLib.IO_IN
+        )
+        assert self.mock.mock_calls == [
+            call._sock.recv_into(IsA(memoryview)),
+            call._sock.recv_into(IsA(memoryview)),
+            call.actor_ref.tell({"received": b"data"}),
+            call.disable_recv(),
+            call.actor_ref.tell({"close": True}),
+        ]
+
     def test_recv_callback_handles_dead_actors(self):
-        self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.recv.return_value = b"data"
-        self.mock.actor_ref = Mock()
+        self.prepare_recv_test(b"data", socket.error(errno.EWOULDBLOCK, ""))
         self.mock.actor_ref.tell.side_effect = pykka.ActorDeadError()
 
         assert network.Connection.recv_callback(
@@ -438,32 +542,28 @@ class ConnectionTest(unittest.TestCase):
         self.mock.stop.assert_called_once_with(any_unicode)
 
     def test_recv_callback_gets_no_data(self):
-        self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.recv.return_value = b""
-        self.mock.actor_ref = Mock()
+        self.prepare_recv_test(b"")
 
         assert network.Connection.recv_callback(
             self.mock, sentinel.fd, GLib.IO_IN
         )
         assert self.mock.mock_calls == [
-            call._sock.recv(any_int),
+            call._sock.recv_into(IsA(memoryview)),
             call.disable_recv(),
             call.actor_ref.tell({"close": True}),
         ]
 
     def test_recv_callback_recoverable_error(self):
-        self.mock._sock = Mock(spec=socket.SocketType)
-
         for error in (errno.EWOULDBLOCK, errno.EINTR):
-            self.mock._sock.recv.side_effect = socket.error(error, "")
+            self.prepare_recv_test(socket.error(error, ""))
             assert network.Connection.recv_callback(
                 self.mock, sentinel.fd, GLib.IO_IN
             )
             assert 0 == self.mock.stop.call_count
+            assert 0 == self.mock.actor_ref.tell.call_count
 
     def test_recv_callback_unrecoverable_error(self):
-        self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.recv.side_effect = socket.error
+        self.prepare_recv_test(socket.error())
 
         assert network.Connection.recv_callback(
             self.mock, sentinel.fd, GLib.IO_IN
@@ -472,10 +572,9 @@ class ConnectionTest(unittest.TestCase):
 
     def test_send_callback_respects_io_err(self):
         self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.send.return_value = 1
         self.mock.send_lock = Mock()
         self.mock.actor_ref = Mock()
-        self.mock.send_buffer = b""
+        self.prepare_send_buffer()
 
         assert network.Connection.send_callback(
             self.mock, sentinel.fd, (GLib.IO_IN | GLib.IO_ERR)
@@ -484,10 +583,9 @@ class ConnectionTest(unittest.TestCase):
 
     def test_send_callback_respects_io_hup(self):
         self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.send.return_value = 1
         self.mock.send_lock = Mock()
         self.mock.actor_ref = Mock()
-        self.mock.send_buffer = b""
+        self.prepare_send_buffer()
 
         assert network.Connection.send_callback(
             self.mock, sentinel.fd, (GLib.IO_IN | GLib.IO_HUP)
@@ -496,10 +594,9 @@ class ConnectionTest(unittest.TestCase):
 
     def test_send_callback_respects_io_hup_and_io_err(self):
         self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.send.return_value = 1
         self.mock.send_lock = Mock()
         self.mock.actor_ref = Mock()
-        self.mock.send_buffer = b""
+        self.prepare_send_buffer()
 
         assert network.Connection.send_callback(
             self.mock, sentinel.fd, ((GLib.IO_IN | GLib.IO_HUP) | GLib.IO_ERR)
@@ -509,9 +606,7 @@ class ConnectionTest(unittest.TestCase):
     def test_send_callback_acquires_and_releases_lock(self):
         self.mock.send_lock = Mock()
         self.mock.send_lock.acquire.return_value = True
-        self.mock.send_buffer = b""
-        self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.send.return_value = 0
+        self.prepare_send_buffer()
 
         assert network.Connection.send_callback(
             self.mock, sentinel.fd, GLib.IO_IN
@@ -522,70 +617,125 @@ class ConnectionTest(unittest.TestCase):
     def test_send_callback_fails_to_acquire_lock(self):
         self.mock.send_lock = Mock()
         self.mock.send_lock.acquire.return_value = False
-        self.mock.send_buffer = b""
-        self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.send.return_value = 0
+        self.prepare_send_buffer(b"data")
 
         assert network.Connection.send_callback(
             self.mock, sentinel.fd, GLib.IO_IN
         )
         self.mock.send_lock.acquire.assert_called_once_with(False)
-        assert 0 == self.mock._sock.send.call_count
+        assert 0 == self.mock.send.call_count
 
     def test_send_callback_sends_all_data(self):
         self.mock.send_lock = Mock()
         self.mock.send_lock.acquire.return_value = True
-        self.mock.send_buffer = b"data"
-        self.mock.send.return_value = b""
+        self.prepare_send_buffer(b"data")
+
+        def send():
+            self.prepare_send_buffer()
+
+        self.mock.send.side_effect = send
 
         assert network.Connection.send_callback(
             self.mock, sentinel.fd, GLib.IO_IN
         )
+        self.mock.send.assert_called_once_with()
         self.mock.disable_send.assert_called_once_with()
-        self.mock.send.assert_called_once_with(b"data")
-        assert b"" == self.mock.send_buffer
+        self.mock.send_drained.set.assert_called_once_with()
 
     def test_send_callback_sends_partial_data(self):
         self.mock.send_lock = Mock()
         self.mock.send_lock.acquire.return_value = True
-        self.mock.send_buffer = b"data"
-        self.mock.send.return_value = b"ta"
+        self.prepare_send_buffer(b"data")
 
         assert network.Connection.send_callback(
             self.mock, sentinel.fd, GLib.IO_IN
         )
-        self.mock.send.assert_called_once_with(b"data")
-        assert b"ta" == self.mock.send_buffer
+        self.mock.send.assert_called_once_with()
+        assert 0 == self.mock.disable_send.call_count
+
+    def test_send_callback_keeps_sender_blocked_above_low_water_mark(self):
+        self.mock.send_lock = Mock()
+        self.mock.send_lock.acquire.return_value = True
+        self.prepare_send_buffer(
+            b"x" * (network.SEND_BUFFER_LOW_WATER_MARK + 1)
+        )
+
+        assert network.Connection.send_callback(
+            self.mock, sentinel.fd, GLib.IO_IN
+        )
+        assert 0 == self.mock.send_drained.set.call_count
 
     def test_send_recoverable_error(self):
         self.mock._sock = Mock(spec=socket.SocketType)
 
         for error in (errno.EWOULDBLOCK, errno.EINTR):
-            self.mock._sock.send.side_effect = socket.error(error, "")
+            self.mock._sock.sendmsg.side_effect = socket.error(error, "")
+            self.prepare_send_buffer(b"data")
 
-            network.Connection.send(self.mock, b"data")
+            network.Connection.send(self.mock)
             assert 0 == self.mock.stop.call_count
+            assert [b"data"] == list(self.mock.send_buffer)
+
+    def test_send_calls_socket_sendmsg_with_all_chunks(self):
+        self.mock._sock = Mock(spec=socket.SocketType)
+        self.mock._sock.sendmsg.return_value = 7
+        self.mock.consume_send_buffer.side_effect = (
+            lambda sent: network.Connection.consume_send_buffer(self.mock, sent)
+        )
+        self.prepare_send_buffer(b"data", b"foo")
+
+        network.Connection.send(self.mock)
+        self.mock._sock.sendmsg.assert_called_once_with([b"data", b"foo"])
+        self.mock.consume_send_buffer.assert_called_once_with(7)
 
-    def test_send_calls_socket_send(self):
+    def test_send_stops_after_partial_send(self):
         self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.send.return_value = 4
+        self.mock._sock.sendmsg.return_value = 2
+        self.prepare_send_buffer(b"data")
 
-        assert b"" == network.Connection.send(self.mock, b"data")
-        self.mock._sock.send.assert_called_once_with(b"data")
+        network.Connection.send(self.mock)
+        self.mock._sock.sendmsg.assert_called_once_with([b"data"])
+        self.mock.consume_send_buffer.assert_called_once_with(2)
 
-    def test_send_calls_socket_send_partial_send(self):
+    def test_send_limits_number_of_chunks_per_call(self):
         self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.send.return_value = 2
+        self.mock._sock.sendmsg.return_value = 0
+        self.prepare_send_buffer(*[b"x"] * (network.MAX_SEND_CHUNKS + 1))
 
-        assert b"ta" == network.Connection.send(self.mock, b"data")
-        self.mock._sock.send.assert_called_once_with(b"data")
+        network.Connection.send(self.mock)
+        chunks = self.mock._sock.sendmsg.call_args[0][0]
+        assert network.MAX_SEND_CHUNKS == len(chunks)
 
     def test_send_unrecoverable_error(self):
         self.mock._sock = Mock(spec=socket.SocketType)
-        self.mock._sock.send.side_effect = socket.error
+        self.mock._sock.sendmsg.side_effect = socket.error
+        self.prepare_send_buffer(b"data")
 
-        assert b"" == network.Connection.send(self.mock, b"data")
+        network.Connection.send(self.mock)
         self.mock.stop.assert_called_once_with(any_unicode)
+        assert not self.mock.send_buffer
+        assert 0 == self.mock.send_buffer_size
+
+    def test_consume_send_buffer_partial_chunk(self):
+        self.prepare_send_buffer(b"data", b"foo")
+
+        network.Connection.consume_send_buffer(self.mock, 2)
+        assert [b"ta", b"foo"] == list(self.mock.send_buffer)
+        assert 5 == self.mock.send_buffer_size
+
+    def test_consume_send_buffer_whole_chunks(self):
+        self.prepare_send_buffer(b"data", b"foo", b"bar")
+
+        network.Connection.consume_send_buffer(self.mock, 8)
+        assert [b"ar"] == list(self.mock.send_buffer)
+        assert 2 == self.mock.send_buffer_size
+
+    def test_consume_send_buffer_everything(self):
+        self.prepare_send_buffer(b"data", b"foo")
+
+        network.Connection.consume_send_buffer(self.mock, 7)
+        assert not self.mock.send_buffer
+        assert 0 == self.mock.send_buffer_size
 
     def test_timeout_callback(self):
         self.mock.timeout = 10
@@ -109,9 +109,12 @@ class LineProtocolTest(unittest.TestCase):
         self.mock.connection.stop.assert_called_once_with("Actor failed.")
 
     def prepare_parse_lines_test(self, recv_data=""):
+        self.mock.connection = Mock(spec=network.Connection)
         self.mock.terminator = b"\n"
         self.mock.delimiter = re.compile(rb"\n")
-        self.mock.recv_buffer = recv_data.encode()
+        self.mock.max_line_length = network.LineProtocol.max_line_length
+        self.mock.recv_buffer = bytearray(recv_data.encode())
+        self.mock.recv_scan_offset = 0
 
     def test_parse_lines_emtpy_buffer(self):
         self.prepare_parse_lines_test()
@@ -200,6 +203,75 @@ class LineProtocolTest(unittest.TestCase):
             next(lines)
         assert b"data2" == self.mock.recv_buffer
 
+    def test_parse_lines_terminator_split_across_calls(self):
+        self.prepare_parse_lines_test("data1\r")
+        self.mock.delimiter = re.compile(rb"\r?\n")
+
+        assert [] == list(network.LineProtocol.parse_lines(self.mock))
+
+        self.mock.recv_buffer += b"\ndata2\r\n"
+
+        lines = network.LineProtocol.parse_lines(self.mock)
+        assert [b"data1", b"data2"] == list(lines)
+        assert b"" == self.mock.recv_buffer
+
+    def test_parse_lines_line_too_long_stops_connection(self):
+        self.prepare_parse_lines_test("abcd\nefghijk\nlmn\n")
+        self.mock.max_line_length = 5
+
+        lines = network.LineProtocol.parse_lines(self.mock)
+        assert [b"abcd"] == list(lines)
+        self.mock.connection.stop.assert_called_once_with(any_unicode)
+        assert b"" == self.mock.recv_buffer
+
+    def test_parse_lines_unterminated_line_too_long_stops_connection(self):
+        self.prepare_parse_lines_test("abcdefghijk")
+        self.mock.max_line_length = 5
+
+        assert [] == list(network.LineProtocol.parse_lines(self.mock))
+        self.mock.connection.stop.assert_called_once_with(any_unicode)
+
+    def test_parse_lines_without_max_line_length(self):
+        self.prepare_parse_lines_test("abcdefghijk\n")
+        self.mock.max_line_length = None
+
+        lines = network.LineProtocol.parse_lines(self.mock)
+        assert [b"abcdefghijk"] == list(lines)
+        assert 0 == self.mock.connection.stop.call_count
+
+    def test_parse_lines_in_chunks(self):
+        self.prepare_parse_lines_test()
+        self.mock.delimiter = re.compile(rb"\r?\n")
+        data = b"".join(b'add "dummy:/track/%d"\r\n' % i for i in range(5000))
+        chunks = [data[i : i + 1000] for i in range(0, len(data), 1000)]
+
+        lines = []
+        for chunk in [data] + chunks:
+            self.mock.recv_buffer += chunk
+            lines.extend(network.LineProtocol.parse_lines(self.mock))
+
+        assert 10000 == len(lines)
+        assert b'add "dummy:/track/4999"' == lines[-1]
+
+    def test_parse_lines_does_not_rescan_data(self):
+        class RecordingBuffer(bytearray):
+            def find(self, sub, start=0, *args):
+                self.starts.append(start)
+                return super().find(sub, start, *args)
+
+        self.prepare_parse_lines_test()
+        self.mock.recv_buffer = RecordingBuffer()
+        self.mock.recv_buffer.starts = []
+
+        lines = []
+        for chunk in [b"a" * 1000, b"a" * 1000, b"\nb"]:
+            self.mock.recv_buffer += chunk
+            lines.extend(network.LineProtocol.parse_lines(self.mock))
+
+        assert [b"a" * 2000] == lines
+        assert [0, 1000, 2000, 2001] == self.mock.recv_buffer.starts
+        assert 1 == self.mock.recv_scan_offset
+
     def test_send_lines_called_with_no_lines(self):
         self.mock.connection = Mock(spec=network.Connection)
 
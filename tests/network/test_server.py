@@ -72,10 +72,12 @@ class ServerTest(unittest.TestCase):
             sentinel.protocol,
             max_connections=sentinel.max_connections,
             timeout=sentinel.timeout,
+            recv_buffer_size=sentinel.recv_buffer_size,
         )
         assert sentinel.protocol == self.mock.protocol
         assert sentinel.max_connections == self.mock.max_connections
         assert sentinel.timeout == self.mock.timeout
+        assert sentinel.recv_buffer_size == self.mock.recv_buffer_size
         assert sock == self.mock.server_socket
         assert (str(sentinel.host), sentinel.port) == self.mock.address
 
@@ -288,6 +290,7 @@ class ServerTest(unittest.TestCase):
         self.mock.protocol = sentinel.protocol
         self.mock.protocol_kwargs = {}
         self.mock.timeout = sentinel.timeout
+        self.mock.recv_buffer_size = sentinel.recv_buffer_size
 
         network.Server.init_connection(self.mock, sentinel.sock, sentinel.addr)
         network.Connection.assert_called_once_with(
@@ -296,6 +299,7 @@ class ServerTest(unittest.TestCase):
             sentinel.sock,
             sentinel.addr,
             sentinel.timeout,
+            sentinel.recv_buffer_size,
         )
 
     def test_reject_connection(self):
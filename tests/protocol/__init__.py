@@ -4,7 +4,13 @@ from unittest import mock
 import pykka
 
 from mopidy import core
-from mopidy_mpd import session, uri_mapper
+from mopidy_mpd import (
+    idle_notifier,
+    session,
+    tracklist_index,
+    tracklist_journal,
+    uri_mapper,
+)
 
 from tests import dummy_audio, dummy_backend, dummy_mixer
 
@@ -14,6 +20,7 @@ class MockConnection(mock.Mock):
         super().__init__(*args, **kwargs)
         self.host = mock.sentinel.host
         self.port = mock.sentinel.port
+        self.stopping = False
         self.response = []
 
     def queue_send(self, data):
@@ -47,12 +54,18 @@ class BaseTestCase(unittest.TestCase):
         ).proxy()
 
         self.uri_map = uri_mapper.MpdUriMapper(self.core)
+        self.tracklist_journal = tracklist_journal.TracklistJournal(self.core)
+        self.tracklist_index = tracklist_index.TracklistIndex(self.core)
+        self.idle_notifier = idle_notifier.IdleNotifier(window=0)
         self.connection = MockConnection()
         self.session = session.MpdSession(
             self.connection,
             config=self.get_config(),
             core=self.core,
             uri_map=self.uri_map,
+            tracklist_journal=self.tracklist_journal,
+            tracklist_index=self.tracklist_index,
+            idle_notifier=self.idle_notifier,
         )
         self.dispatcher = self.session.dispatcher
         self.context = self.dispatcher.context
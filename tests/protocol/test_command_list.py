@@ -1,3 +1,5 @@
+from mopidy.models import Ref, Track
+
 from tests import protocol
 
 
@@ -62,3 +64,126 @@ class CommandListsTest(protocol.BaseTestCase):
     # FIXME this should also include the special handling of idle within a
     # command list. That is that once a idle/noidle command is found inside a
     # commad list, the rest of the list seems to be ignored.
+
+
+class CommandListBatchingTest(protocol.BaseTestCase):
+    def setUp(self):  # noqa: N802
+        super().setUp()
+        self.tracks = [Track(uri=f"dummy:/{x}", name=x) for x in "abcde"]
+        self.backend.library.dummy_library = self.tracks
+
+    def send_command_list(self, *commands):
+        self.send_request("command_list_ok_begin")
+        for command in commands:
+            self.send_request(command)
+        return self.send_request("command_list_end")
+
+    def tlids(self):
+        return [tlid for tlid, _ in self.core.tracklist.get_tl_tracks().get()]
+
+    def uris(self):
+        return [t.uri for t in self.core.tracklist.get_tracks().get()]
+
+    def test_add_is_batched(self):
+        version = self.core.tracklist.get_version().get()
+
+        response = self.send_command_list(
+            *[f'add "{track.uri}"' for track in self.tracks]
+        )
+
+        assert response == ["list_OK"] * 5 + ["OK"]
+        assert self.uris() == [track.uri for track in self.tracks]
+        assert self.core.tracklist.get_version().get() == version + 1
+
+    def test_add_batch_stops_at_unknown_uri(self):
+        response = self.send_command_list(
+            'add "dummy:/a"',
+            'add "dummy:/b"',
+            'add "dummy:/x"',
+            'add "dummy:/c"',
+        )
+
+        assert response == [
+            "list_OK",
+            "list_OK",
+            "ACK [50@2] {add} directory or file not found",
+        ]
+        assert self.uris() == ["dummy:/a", "dummy:/b"]
+
+    def test_add_batch_leaves_paths_to_add(self):
+        self.backend.library.dummy_browse_result = {
+            "dummy:/": [Ref.directory(uri="dummy:/foo", name="foo")],
+            "dummy:/foo": [Ref.track(uri="dummy:/c", name="c")],
+        }
+
+        response = self.send_command_list(
+            'add "dummy:/a"', 'add "/dummy/foo"', 'add "dummy:/b"'
+        )
+
+        assert response == ["list_OK"] * 3 + ["OK"]
+        assert self.uris() == ["dummy:/a", "dummy:/c", "dummy:/b"]
+
+    def test_addid_is_batched(self):
+        version = self.core.tracklist.get_version().get()
+
+        response = self.send_command_list(
+            'addid "dummy:/a"', 'addid "dummy:/b"', 'addid "dummy:/c"'
+        )
+
+        assert response == [
+            "Id: 1",
+            "list_OK",
+            "Id: 2",
+            "list_OK",
+            "Id: 3",
+            "list_OK",
+            "OK",
+        ]
+        assert self.core.tracklist.get_version().get() == version + 1
+
+    def test_addid_batch_leaves_positions_to_addid(self):
+        response = self.send_command_list(
+            'addid "dummy:/a"', 'addid "dummy:/b" "0"', 'addid "dummy:/x"'
+        )
+
+        assert response == [
+            "Id: 1",
+            "list_OK",
+            "Id: 2",
+            "list_OK",
+            "ACK [50@2] {addid} No such song",
+        ]
+        assert self.uris() == ["dummy:/b", "dummy:/a"]
+
+    def test_moveid_is_batched(self):
+        self.core.tracklist.add(uris=[track.uri for track in self.tracks])
+
+        response = self.send_command_list(
+            'moveid "5" "0"', 'moveid "1" "4"', 'moveid "3" "1"'
+        )
+
+        assert response == ["list_OK"] * 3 + ["OK"]
+        assert self.tlids() == [5, 3, 2, 4, 1]
+
+    def test_moveid_batch_stops_at_unknown_song(self):
+        self.core.tracklist.add(uris=[track.uri for track in self.tracks])
+
+        response = self.send_command_list(
+            'moveid "5" "0"', 'moveid "9" "4"', 'moveid "3" "1"'
+        )
+
+        assert response == ["list_OK", "ACK [50@1] {moveid} No such song"]
+        assert self.tlids() == [5, 1, 2, 3, 4]
+
+    def test_blacklisted_commands_are_not_batched(self):
+        self.dispatcher.config = dict(
+            self.dispatcher.config,
+            mpd=dict(self.dispatcher.config["mpd"], command_blacklist=["add"]),
+        )
+
+        response = self.send_command_list('add "dummy:/a"', 'add "dummy:/b"')
+
+        assert response == [
+            'ACK [0@0] {add} "add" has been disabled in the server'
+        ]
+        assert self.uris() == []
@@ -1,4 +1,4 @@
-from mopidy.models import Ref, Track
+from mopidy.models import Album, Artist, Ref, Track
 
 from tests import protocol
 
@@ -146,6 +146,15 @@ class DeleteCommandsTest(BasePopulatedTracklistTestCase):
         assert len(self.core.tracklist.get_tracks().get()) == 4
         self.assertInResponse("OK")
 
+    def test_delete_range_changes_tracklist_once(self):
+        version = self.core.tracklist.get_version().get()
+
+        self.send_request('delete "0:5"')
+
+        assert len(self.core.tracklist.get_tracks().get()) == 1
+        assert self.core.tracklist.get_version().get() == version + 1
+        self.assertInResponse("OK")
+
     def test_delete_entire_range_out_of_bounds(self):
         self.send_request('delete "8:9"')
         assert len(self.core.tracklist.get_tracks().get()) == 6
@@ -166,6 +175,42 @@ class DeleteCommandsTest(BasePopulatedTracklistTestCase):
         assert len(self.core.tracklist.get_tracks().get()) == 6
         self.assertEqualResponse("ACK [50@0] {deleteid} No such song")
 
+    def test_deleteid_in_command_list_changes_tracklist_once(self):
+        version = self.core.tracklist.get_version().get()
+
+        self.send_request("command_list_ok_begin")
+        for tlid in (1, 3, 5):
+            self.send_request(f'deleteid "{tlid}"')
+        self.send_request("command_list_end")
+
+        assert [
+            tl_track.tlid
+            for tl_track in self.core.tracklist.get_tl_tracks().get()
+        ] == [2, 4, 6]
+        assert self.core.tracklist.get_version().get() == version + 1
+        assert self.connection.response == [
+            "list_OK",
+            "list_OK",
+            "list_OK",
+            "OK",
+        ]
+
+    def test_deleteid_in_command_list_stops_at_missing_song(self):
+        self.send_request("command_list_ok_begin")
+        for tlid in (1, 3, 3, 5):
+            self.send_request(f'deleteid "{tlid}"')
+        self.send_request("command_list_end")
+
+        assert [
+            tl_track.tlid
+            for tl_track in self.core.tracklist.get_tl_tracks().get()
+        ] == [2, 4, 5, 6]
+        assert self.connection.response == [
+            "list_OK",
+            "list_OK",
+            "ACK [50@2] {deleteid} No such song",
+        ]
+
 
 class MoveCommandsTest(BasePopulatedTracklistTestCase):
     def test_move_songpos(self):
@@ -198,9 +243,34 @@ class MoveCommandsTest(BasePopulatedTracklistTestCase):
 
 
 class PlaylistFindCommandTest(protocol.BaseTestCase):
-    def test_playlistfind(self):
+    def test_playlistfind_with_unknown_tag_acks(self):
         self.send_request('playlistfind "tag" "needle"')
-        self.assertEqualResponse("ACK [0@0] {playlistfind} Not implemented")
+        self.assertEqualResponse("ACK [2@0] {playlistfind} incorrect arguments")
+
+    def test_playlistfind_by_tag(self):
+        self.backend.library.dummy_library = [
+            Track(uri="dummy:/a", name="a", artists=[Artist(name="Foo")]),
+            Track(uri="dummy:/b", name="b", artists=[Artist(name="foo")]),
+            Track(uri="dummy:/c", name="c", artists=[Artist(name="Foo")]),
+        ]
+        self.core.tracklist.add(uris=["dummy:/a", "dummy:/b", "dummy:/c"])
+
+        self.send_request('playlistfind artist "Foo"')
+        assert self.connection.response == [
+            "file: dummy:/a",
+            "Time: 0",
+            "Artist: Foo",
+            "Title: a",
+            "Pos: 0",
+            "Id: 1",
+            "file: dummy:/c",
+            "Time: 0",
+            "Artist: Foo",
+            "Title: c",
+            "Pos: 2",
+            "Id: 3",
+            "OK",
+        ]
 
     def test_playlistfind_by_filename_not_in_tracklist(self):
         self.send_request('playlistfind "filename" "file:///dev/null"')
@@ -329,13 +399,54 @@ class PlaylistInfoCommandTest(BasePopulatedTracklistTestCase):
 
 
 class PlaylistSearchCommandTest(protocol.BaseTestCase):
+    def setUp(self):  # noqa: N802
+        super().setUp()
+        self.backend.library.dummy_library = [
+            Track(uri="dummy:/a", name="Needles", album=Album(name="x")),
+            Track(uri="dummy:/b", name="b", album=Album(name="needle")),
+            Track(uri="dummy:/c", name="c"),
+        ]
+        self.core.tracklist.add(uris=["dummy:/a", "dummy:/b", "dummy:/c"])
+
     def test_playlistsearch(self):
         self.send_request('playlistsearch "any" "needle"')
-        self.assertEqualResponse("ACK [0@0] {playlistsearch} Not implemented")
+        self.assertInResponse("file: dummy:/a")
+        self.assertInResponse("file: dummy:/b")
+        self.assertNotInResponse("file: dummy:/c")
+        self.assertInResponse("OK")
 
     def test_playlistsearch_without_quotes(self):
         self.send_request('playlistsearch any "needle"')
-        self.assertEqualResponse("ACK [0@0] {playlistsearch} Not implemented")
+        self.assertInResponse("file: dummy:/a")
+        self.assertInResponse("OK")
+
+    def test_playlistsearch_by_tag_ignores_case(self):
+        self.send_request('playlistsearch title "NEEDLE"')
+        self.assertInResponse("file: dummy:/a")
+        self.assertNotInResponse("file: dummy:/b")
+        self.assertInResponse("Pos: 0")
+        self.assertInResponse("OK")
+
+    def test_playlistsearch_by_filename(self):
+        self.send_request('playlistsearch filename "/c"')
+        self.assertInResponse("file: dummy:/c")
+        self.assertNotInResponse("file: dummy:/a")
+        self.assertInResponse("OK")
+
+    def test_playlistsearch_sees_tracklist_changes(self):
+        self.send_request('playlistsearch any "needle"')
+        self.core.tracklist.remove({"uri": ["dummy:/a"]}).get()
+
+        self.send_request('playlistsearch any "needle"')
+        self.assertNotInResponse("file: dummy:/a")
+        self.assertInResponse("file: dummy:/b")
+        self.assertInResponse("Pos: 0")
+
+    def test_playlistsearch_with_unknown_tag_acks(self):
+        self.send_request('playlistsearch "tag" "needle"')
+        self.assertEqualResponse(
+            "ACK [2@0] {playlistsearch} incorrect arguments"
+        )
 
 
 class PlChangeCommandTest(BasePopulatedTracklistTestCase):
@@ -376,6 +487,18 @@ class PlChangeCommandTest(BasePopulatedTracklistTestCase):
         self.assertInResponse("Title: c")
         self.assertInResponse("OK")
 
+    def test_plchanges_since_version_reported_by_status(self):
+        self.send_request("status")
+        version = self.core.tracklist.get_version().get()
+        self.core.tracklist.add(uris=["dummy:/a"]).get()
+        self.tracklist_journal.invalidate()
+
+        self.send_request(f'plchanges "{version:d}"')
+        self.assertNotInResponse("Title: b")
+        self.assertInResponse("Title: a")
+        self.assertInResponse("Pos: 6")
+        self.assertInResponse("OK")
+
     def test_plchangesposid(self):
         self.send_request('plchangesposid "0"')
         tl_tracks = self.core.tracklist.get_tl_tracks().get()
@@ -387,6 +510,35 @@ class PlChangeCommandTest(BasePopulatedTracklistTestCase):
         self.assertInResponse(f"Id: {tl_tracks[2].tlid:d}")
         self.assertInResponse("OK")
 
+    def test_plchanges_only_returns_tracks_changed_since_version(self):
+        self.send_request('plchanges "0"')
+        version = self.core.tracklist.get_version().get()
+        self.core.tracklist.add(uris=["dummy:/a"]).get()
+
+        self.send_request(f'plchanges "{version:d}"')
+        self.assertNotInResponse("Title: b")
+        self.assertNotInResponse("Title: c")
+        self.assertInResponse("Title: a")
+        self.assertInResponse("Pos: 6")
+        self.assertInResponse("OK")
+
+    def test_plchangesposid_only_returns_tracks_changed_since_version(self):
+        self.send_request('plchangesposid "0"')
+        version = self.core.tracklist.get_version().get()
+        self.core.tracklist.move(0, 1, 2).get()
+
+        self.send_request(f'plchangesposid "{version:d}"')
+        tl_tracks = self.core.tracklist.get_tl_tracks().get()
+        assert self.connection.response == [
+            "cpos: 0",
+            f"Id: {tl_tracks[0].tlid:d}",
+            "cpos: 1",
+            f"Id: {tl_tracks[1].tlid:d}",
+            "cpos: 2",
+            f"Id: {tl_tracks[2].tlid:d}",
+            "OK",
+        ]
+
 
 class PrioCommandTest(protocol.BaseTestCase):
     def test_prio(self):
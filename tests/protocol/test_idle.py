@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+from mopidy_mpd import idle_notifier
 from mopidy_mpd.protocol.status import SUBSYSTEMS
 
 from tests import protocol
@@ -234,3 +235,83 @@ class IdleHandlerTest(protocol.BaseTestCase):
         self.assertNoSubscriptions()
         self.assertOnceInResponse("changed: output")
         self.assertOnceInResponse("OK")
+
+
+class IdleNotifierTest(protocol.BaseTestCase):
+    def setUp(self):  # noqa: N802
+        super().setUp()
+        patcher = patch.object(self.session.actor_ref, "tell")
+        self.tell_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def idle_events(self, *subsystems):
+        for subsystem in subsystems:
+            self.idle_notifier.notify(subsystem)
+        if self.tell_mock.called:
+            self.session.on_receive(self.tell_mock.call_args[0][0])
+
+    def test_events_are_not_told_to_sessions_not_in_idle(self):
+        self.idle_events("player")
+
+        self.tell_mock.assert_not_called()
+        self.assertNoResponse()
+
+    def test_events_before_idle_are_collected_by_idle(self):
+        self.idle_events("player", "playlist")
+
+        self.send_request("idle")
+
+        self.assertOnceInResponse("changed: player")
+        self.assertOnceInResponse("changed: playlist")
+        self.assertOnceInResponse("OK")
+        self.tell_mock.assert_not_called()
+
+    def test_events_after_idle_are_told_to_session(self):
+        self.send_request("idle")
+
+        self.idle_events("player")
+
+        self.tell_mock.assert_called_once_with(idle_notifier.IDLE_MESSAGE)
+        self.assertOnceInResponse("changed: player")
+        self.assertOnceInResponse("OK")
+
+    def test_burst_of_events_is_delivered_once(self):
+        self.idle_notifier.window = 10
+        self.send_request("idle")
+
+        with patch.object(idle_notifier.GLib, "timeout_add") as timeout_mock:
+            self.idle_events("playlist", "player", "playlist")
+        self.tell_mock.assert_not_called()
+
+        callback = timeout_mock.call_args[0][1]
+        assert callback() is False
+        self.session.on_receive(self.tell_mock.call_args[0][0])
+
+        self.tell_mock.assert_called_once_with(idle_notifier.IDLE_MESSAGE)
+        self.assertOnceInResponse("changed: player")
+        self.assertOnceInResponse("changed: playlist")
+        self.assertOnceInResponse("OK")
+
+    def test_unsubscribed_event_keeps_session_in_idle(self):
+        self.send_request("idle playlist")
+
+        self.idle_events("player")
+
+        self.assertNoResponse()
+        assert self.context.subscriptions == {"playlist"}
+        assert self.context.events == {"player"}
+
+    def test_events_are_only_delivered_once(self):
+        self.idle_events("player")
+        self.send_request("idle")
+        self.send_request("idle")
+
+        self.assertNoResponse()
+
+    def test_noidle_stops_notifications(self):
+        self.send_request("idle")
+        self.send_request("noidle")
+
+        self.idle_events("player")
+
+        self.tell_mock.assert_not_called()
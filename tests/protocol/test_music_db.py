@@ -3,6 +3,7 @@ from unittest import mock
 
 from mopidy.models import Album, Artist, Playlist, Ref, SearchResult, Track
 from mopidy_mpd.protocol import music_db, stored_playlists
+from mopidy_mpd.search_cache import SearchCache
 
 from tests import protocol
 
@@ -518,6 +519,28 @@ class MusicDatabaseHandlerTest(protocol.BaseTestCase):
         self.assertInResponse("directory: dummy/a")
         self.assertInResponse("directory: dummy/a [2]")
 
+    def test_lsinfo_duplicate_after_eviction(self):
+        self.uri_map.max_browse_entries = 5
+        self.backend.library.dummy_browse_result = {
+            "dummy:/": [
+                Ref.directory(uri="dummy:/d1", name="Disc"),
+                Ref.directory(uri="dummy:/d2", name="Disc"),
+            ]
+            + [
+                Ref.directory(uri=f"dummy:/x{i}", name=f"x{i}")
+                for i in range(5)
+            ],
+            "dummy:/d2": [Ref.directory(uri="dummy:/d2/s", name="s")],
+        }
+
+        self.send_request('lsinfo "/dummy"')
+        self.assertInResponse("directory: dummy/Disc [2]")
+        assert self.uri_map.uri_from_name("/dummy/Disc [2]") is None
+
+        self.send_request('lsinfo "/dummy/Disc [2]"')
+        self.assertInResponse("directory: dummy/Disc [2]/s")
+        self.assertInResponse("OK")
+
     def test_update_without_uri(self):
         self.send_request("update")
         self.assertInResponse("updating_db: 0")
@@ -539,6 +562,65 @@ class MusicDatabaseHandlerTest(protocol.BaseTestCase):
         self.assertInResponse("OK")
 
 
+class MusicDatabaseSearchCacheTest(protocol.BaseTestCase):
+    def setUp(self):  # noqa: N802
+        super().setUp()
+        self.context.search_cache = SearchCache()
+
+    def test_find_is_served_from_the_cache(self):
+        self.backend.library.dummy_find_exact_result = SearchResult(
+            tracks=[Track(uri="dummy:a")]
+        )
+        self.send_request('find "title" "foo" "artist" "bar"')
+        self.backend.library.dummy_find_exact_result = SearchResult()
+
+        self.send_request('find "Artist" "bar" "title" "foo"')
+
+        self.assertInResponse("file: dummy:a")
+        assert self.context.search_cache.metrics()["hits"] == 1
+
+    def test_count_shares_the_cache_with_find(self):
+        self.backend.library.dummy_find_exact_result = SearchResult(
+            tracks=[Track(uri="dummy:a", length=2000)]
+        )
+        self.send_request('find "title" "foo"')
+        self.backend.library.dummy_find_exact_result = SearchResult()
+
+        self.send_request('count "title" "foo"')
+
+        self.assertInResponse("songs: 1")
+        self.assertInResponse("playtime: 2")
+
+    def test_search_is_not_served_from_find_results(self):
+        self.backend.library.dummy_find_exact_result = SearchResult(
+            tracks=[Track(uri="dummy:a")]
+        )
+        self.send_request('find "title" "foo"')
+
+        self.send_request('search "title" "foo"')
+
+        self.assertNotInResponse("file: dummy:a")
+
+    def test_list_is_served_from_the_cache(self):
+        self.backend.library.dummy_get_distinct_result = {"artist": {"A"}}
+        self.send_request('list "artist"')
+        self.backend.library.dummy_get_distinct_result = {}
+
+        self.send_request('list "artist"')
+
+        self.assertInResponse("Artist: A")
+
+    def test_update_invalidates_the_cache(self):
+        self.backend.library.dummy_get_distinct_result = {"artist": {"A"}}
+        self.send_request('list "artist"')
+        self.backend.library.dummy_get_distinct_result = {}
+
+        self.send_request("update")
+        self.send_request('list "artist"')
+
+        self.assertNotInResponse("Artist: A")
+
+
 class MusicDatabaseFindTest(protocol.BaseTestCase):
     def test_find_includes_fake_artist_and_album_tracks(self):
         self.backend.library.dummy_find_exact_result = SearchResult(
@@ -732,6 +814,99 @@ class MusicDatabaseFindTest(protocol.BaseTestCase):
         self.send_request('find "album" ""')
         self.assertInResponse("OK")
 
+    def test_find_with_window(self):
+        self.backend.library.dummy_find_exact_result = SearchResult(
+            tracks=[Track(uri=f"dummy:{i}", name=f"{i}") for i in range(5)]
+        )
+
+        self.send_request('find "title" "foo" window 1:3')
+
+        self.assertNotInResponse("file: dummy:0")
+        self.assertInResponse("file: dummy:1")
+        self.assertInResponse("file: dummy:2")
+        self.assertNotInResponse("file: dummy:3")
+        self.assertInResponse("OK")
+
+    def test_find_with_open_ended_window(self):
+        self.backend.library.dummy_find_exact_result = SearchResult(
+            tracks=[Track(uri=f"dummy:{i}") for i in range(5)]
+        )
+
+        self.send_request('find "title" "foo" window 3:')
+
+        self.assertNotInResponse("file: dummy:2")
+        self.assertInResponse("file: dummy:3")
+        self.assertInResponse("file: dummy:4")
+        self.assertInResponse("OK")
+
+    def test_find_with_window_past_the_end(self):
+        self.backend.library.dummy_find_exact_result = SearchResult(
+            tracks=[Track(uri=f"dummy:{i}") for i in range(2)]
+        )
+
+        self.send_request('find "title" "foo" window 1:10')
+
+        self.assertNotInResponse("file: dummy:0")
+        self.assertInResponse("file: dummy:1")
+        self.assertInResponse("OK")
+
+    def test_find_with_invalid_window(self):
+        self.send_request('find "title" "foo" window "a:b"')
+        self.assertEqualResponse("ACK [2@0] {find} Bad window")
+
+    def test_find_window_value_is_searched_for(self):
+        self.send_request('find "title" "window"')
+        self.assertInResponse("OK")
+
+    def test_find_pages_are_served_from_the_session(self):
+        self.backend.library.dummy_find_exact_result = SearchResult(
+            tracks=[Track(uri=f"dummy:{i}") for i in range(4)]
+        )
+        self.send_request('find "title" "foo" window 0:2')
+        self.backend.library.dummy_find_exact_result = SearchResult()
+
+        self.send_request('find "title" "foo" window 2:4')
+
+        self.assertNotInResponse("file: dummy:1")
+        self.assertInResponse("file: dummy:2")
+        self.assertInResponse("file: dummy:3")
+        self.assertInResponse("OK")
+
+    def test_find_pages_expire(self):
+        self.backend.library.dummy_find_exact_result = SearchResult(
+            tracks=[Track(uri=f"dummy:{i}") for i in range(4)]
+        )
+        with mock.patch.object(music_db.time, "monotonic", return_value=0):
+            self.send_request('find "title" "foo" window 0:2')
+        self.backend.library.dummy_find_exact_result = SearchResult()
+
+        with mock.patch.object(
+            music_db.time,
+            "monotonic",
+            return_value=music_db.QUERY_RESULTS_TTL,
+        ):
+            self.send_request('find "title" "foo" window 2:4')
+
+        self.assertEqualResponse("OK")
+
+    def test_find_without_window_is_not_served_from_the_session(self):
+        self.backend.library.dummy_find_exact_result = SearchResult(
+            tracks=[Track(uri="dummy:a")]
+        )
+        self.send_request('find "title" "foo" window 0:1')
+        self.backend.library.dummy_find_exact_result = SearchResult()
+
+        self.send_request('find "title" "foo"')
+
+        self.assertEqualResponse("OK")
+
+    def test_session_keeps_a_limited_number_of_queries(self):
+        for i in range(music_db.MAX_QUERY_RESULTS + 1):
+            self.send_request(f'find "title" "{i}" window 0:1')
+
+        assert len(self.context.query_results) == music_db.MAX_QUERY_RESULTS
+        assert ("find", "title", "0") not in self.context.query_results
+
 
 class MusicDatabaseListTest(protocol.BaseTestCase):
     def test_list(self):
@@ -1225,6 +1400,24 @@ class MusicDatabaseListTest(protocol.BaseTestCase):
         self.send_request('list "genre" "artist" ""')
         self.assertInResponse("OK")
 
+    def test_list_with_window(self):
+        self.backend.library.dummy_get_distinct_result = {
+            "artist": ["A", "B", "C"]
+        }
+
+        self.send_request('list "artist" window 1:2')
+
+        assert self.connection.response == ["Artist: B", "OK"]
+
+    def test_list_with_filter_and_window(self):
+        self.backend.library.dummy_get_distinct_result = {
+            "album": ["A", "B", "C"]
+        }
+
+        self.send_request('list "album" "artist" "foo" window 0:2')
+
+        assert self.connection.response == ["Album: A", "Album: B", "OK"]
+
 
 class MusicDatabaseSearchTest(protocol.BaseTestCase):
     def test_search(self):
@@ -1245,6 +1438,20 @@ class MusicDatabaseSearchTest(protocol.BaseTestCase):
 
         self.assertInResponse("OK")
 
+    def test_search_with_window(self):
+        self.backend.library.dummy_search_result = SearchResult(
+            albums=[Album(uri="dummy:album:a", name="A")],
+            artists=[Artist(uri="dummy:artist:b", name="B")],
+            tracks=[Track(uri="dummy:track:c", name="C")],
+        )
+
+        self.send_request('search "any" "foo" window 1:3')
+
+        self.assertNotInResponse("file: dummy:artist:b")
+        self.assertInResponse("file: dummy:album:a")
+        self.assertInResponse("file: dummy:track:c")
+        self.assertInResponse("OK")
+
     def test_search_album(self):
         self.send_request('search "album" "analbum"')
         self.assertInResponse("OK")
@@ -1,6 +1,8 @@
 from unittest import mock
 
 from mopidy.models import Playlist, Track
+from mopidy_mpd import playlist_cache
+from mopidy_mpd.playlist_cache import PlaylistCache
 from mopidy_mpd.protocol import stored_playlists
 
 from tests import protocol
@@ -101,6 +103,22 @@ class PlaylistsHandlerTest(protocol.BaseTestCase):
         self.assertNotInResponse("Pos: 0")
         self.assertInResponse("OK")
 
+    def test_listplaylistinfo_uses_playlist_cache(self):
+        tracks = [Track(uri="dummy:a", name="Track A")]
+        self.backend.library.dummy_library = tracks
+        playlist = Playlist(
+            name="name", uri="dummy:name", tracks=tracks, last_modified=1
+        )
+        self.backend.playlists.set_dummy_playlists([playlist])
+        self.context.playlist_cache = PlaylistCache(self.core)
+        self.send_request('listplaylistinfo "name"')
+        self.backend.library.dummy_library = []
+
+        self.send_request('listplaylistinfo "name"')
+
+        self.assertInResponse("Title: Track A")
+        self.assertInResponse("OK")
+
     def test_listplaylistinfo_fails_if_no_playlist_is_found(self):
         self.send_request('listplaylistinfo "name"')
 
@@ -143,6 +161,32 @@ class PlaylistsHandlerTest(protocol.BaseTestCase):
         self.assertInResponse("Last-Modified: 2015-08-05T22:51:06Z")
         self.assertInResponse("OK")
 
+    def test_listplaylists_reports_last_modified(self):
+        self.backend.playlists.set_dummy_playlists(
+            [Playlist(name="a", uri="dummy:a", last_modified=1390942873222)]
+        )
+
+        self.send_request("listplaylists")
+
+        self.assertInResponse("playlist: a")
+        self.assertInResponse("Last-Modified: 2014-01-28T21:01:13Z")
+        self.assertInResponse("OK")
+
+    def test_listplaylists_unknown_last_modified_is_stable(self):
+        self.backend.playlists.set_dummy_playlists(
+            [Playlist(name="a", uri="dummy:a")]
+        )
+        self.context.playlist_cache = PlaylistCache(self.core)
+        self.send_request("listplaylists")
+        response = self.connection.response
+
+        with mock.patch.object(
+            playlist_cache.time, "time", return_value=2000000000
+        ):
+            self.send_request("listplaylists")
+
+        assert self.connection.response == response
+
     def test_listplaylists_duplicate(self):
         playlist1 = Playlist(name="a", uri="dummy:a1")
         playlist2 = Playlist(name="a", uri="dummy:a2")
@@ -510,6 +554,17 @@ class PlaylistsHandlerTest(protocol.BaseTestCase):
         self.assertInResponse("OK")
         assert self.backend.playlists.lookup("dummy:new_namé").get() is not None
 
+    def test_rename_updates_playlist_names(self):
+        self.backend.playlists.set_dummy_playlists(
+            [Playlist(name="old_name", uri="dummy:a1", tracks=[Track(uri="b")])]
+        )
+
+        self.send_request('rename "old_name" "new_name"')
+        self.send_request('listplaylist "new_name"')
+        self.assertInResponse("file: b")
+        self.send_request('listplaylist "old_name"')
+        self.assertInResponse("ACK [50@0] {listplaylist} No such playlist")
+
     def test_rename_save_fails(self):
         self.backend.playlists.set_dummy_playlists(
             [Playlist(name="old_name", uri="dummy:a1", tracks=[Track(uri="b")])]
@@ -560,6 +615,15 @@ class PlaylistsHandlerTest(protocol.BaseTestCase):
         self.assertInResponse("OK")
         assert self.backend.playlists.lookup("dummy:à1").get() is None
 
+    def test_rm_then_save_reuses_name(self):
+        self.send_request('save "name"')
+        self.send_request('rm "name"')
+        self.send_request('save "name"')
+
+        self.send_request("listplaylists")
+        self.assertInResponse("playlist: name")
+        self.assertNotInResponse("playlist: name [2]")
+
     def test_rm_unknown_playlist_acks(self):
         self.send_request('rm "name"')
         self.assertInResponse("ACK [50@0] {rm} No such playlist")
@@ -34,16 +34,181 @@ def test_idle_hooked_up_correctly(event, expected):
             "zeroconf": None,
             "max_connections": None,
             "connection_timeout": None,
+            "idle_batch_window": 0,
+            "browse_index_size": 1000,
+            "persist_browse_index": False,
+            "stats_cache_ttl": 3600,
+            "search_cache_size": 256,
+            "search_cache_ttl": 300,
+            "lookup_chunk_size": 100,
         }
     }
 
     with mock.patch.object(actor.MpdFrontend, "_setup_server"):
         frontend = actor.MpdFrontend(core=mock.Mock(), config=config)
 
-    with mock.patch("mopidy.listener.send") as send_mock:
+    with mock.patch.object(
+        frontend.idle_notifier, "notify"
+    ) as notify_mock, mock.patch.object(
+        frontend.tracklist_journal, "invalidate"
+    ), mock.patch.object(
+        frontend.tracklist_index, "invalidate"
+    ), mock.patch.object(
+        frontend, "uri_map"
+    ), mock.patch.object(
+        frontend, "playlist_cache"
+    ):
         frontend.on_event(event[0], **{e: None for e in event[1:]})
 
     if expected is None:
-        assert not send_mock.call_args
+        assert not notify_mock.call_args
     else:
-        send_mock.assert_called_once_with(mock.ANY, expected)
+        notify_mock.assert_called_once_with(expected)
+
+
+def test_tracklist_changed_invalidates_tracklist_journal():
+    config = {
+        "mpd": {
+            "hostname": "foobar",
+            "port": 1234,
+            "zeroconf": None,
+            "max_connections": None,
+            "connection_timeout": None,
+            "idle_batch_window": 0,
+            "browse_index_size": 1000,
+            "persist_browse_index": False,
+            "stats_cache_ttl": 3600,
+            "search_cache_size": 256,
+            "search_cache_ttl": 300,
+            "lookup_chunk_size": 100,
+        }
+    }
+
+    with mock.patch.object(actor.MpdFrontend, "_setup_server"):
+        frontend = actor.MpdFrontend(core=mock.Mock(), config=config)
+
+    with mock.patch.object(frontend.idle_notifier, "notify"), mock.patch.object(
+        frontend.tracklist_journal, "invalidate"
+    ) as journal_invalidate_mock, mock.patch.object(
+        frontend.tracklist_index, "invalidate"
+    ) as index_invalidate_mock:
+        frontend.on_event("tracklist_changed")
+
+    journal_invalidate_mock.assert_called_once_with()
+    index_invalidate_mock.assert_called_once_with()
+
+
+@pytest.mark.parametrize(
+    "event,kwargs,expected_call",
+    [
+        ("playlists_loaded", {}, mock.call.playlists_loaded()),
+        (
+            "playlist_changed",
+            {"playlist": mock.sentinel.playlist},
+            mock.call.playlist_changed(mock.sentinel.playlist),
+        ),
+        (
+            "playlist_deleted",
+            {"uri": "dummy:a"},
+            mock.call.playlist_deleted("dummy:a"),
+        ),
+    ],
+)
+def test_playlist_events_update_uri_map_and_playlist_cache(
+    event, kwargs, expected_call
+):
+    config = {
+        "mpd": {
+            "hostname": "foobar",
+            "port": 1234,
+            "zeroconf": None,
+            "max_connections": None,
+            "connection_timeout": None,
+            "idle_batch_window": 0,
+            "browse_index_size": 1000,
+            "persist_browse_index": False,
+            "stats_cache_ttl": 3600,
+            "search_cache_size": 256,
+            "search_cache_ttl": 300,
+            "lookup_chunk_size": 100,
+        }
+    }
+
+    with mock.patch.object(actor.MpdFrontend, "_setup_server"):
+        frontend = actor.MpdFrontend(core=mock.Mock(), config=config)
+
+    with mock.patch.object(frontend.idle_notifier, "notify"), mock.patch.object(
+        frontend, "uri_map"
+    ) as uri_map_mock, mock.patch.object(
+        frontend, "playlist_cache"
+    ) as playlist_cache_mock:
+        frontend.on_event(event, **kwargs)
+
+    assert uri_map_mock.mock_calls == [expected_call]
+    assert playlist_cache_mock.mock_calls == [expected_call]
+
+
+@pytest.mark.parametrize(
+    "event,expected_call",
+    [
+        ("track_playback_started", mock.call.playback_started()),
+        ("track_playback_resumed", mock.call.playback_started()),
+        ("track_playback_paused", mock.call.playback_stopped()),
+        ("track_playback_ended", mock.call.playback_stopped()),
+    ],
+)
+def test_playback_events_update_library_stats(event, expected_call):
+    config = {
+        "mpd": {
+            "hostname": "foobar",
+            "port": 1234,
+            "zeroconf": None,
+            "max_connections": None,
+            "connection_timeout": None,
+            "idle_batch_window": 0,
+            "browse_index_size": 1000,
+            "persist_browse_index": False,
+            "stats_cache_ttl": 3600,
+            "search_cache_size": 256,
+            "search_cache_ttl": 300,
+            "lookup_chunk_size": 100,
+        }
+    }
+
+    with mock.patch.object(actor.MpdFrontend, "_setup_server"):
+        frontend = actor.MpdFrontend(core=mock.Mock(), config=config)
+
+    with mock.patch.object(frontend, "library_stats") as library_stats_mock:
+        frontend.on_event(event, tl_track=None, time_position=0)
+
+    assert library_stats_mock.mock_calls == [expected_call]
+
+
+def test_core_events_invalidate_status_cache():
+    config = {
+        "mpd": {
+            "hostname": "foobar",
+            "port": 1234,
+            "zeroconf": None,
+            "max_connections": None,
+            "connection_timeout": None,
+            "idle_batch_window": 0,
+            "browse_index_size": 1000,
+            "persist_browse_index": False,
+            "stats_cache_ttl": 3600,
+            "search_cache_size": 256,
+            "search_cache_ttl": 300,
+            "lookup_chunk_size": 100,
+        }
+    }
+
+    with mock.patch.object(actor.MpdFrontend, "_setup_server"):
+        frontend = actor.MpdFrontend(core=mock.Mock(), config=config)
+
+    with mock.patch.object(frontend.idle_notifier, "notify"), mock.patch.object(
+        frontend.status_cache, "invalidate"
+    ) as invalidate_mock:
+        frontend.on_event("options_changed")
+        frontend.on_event("seeked", time_position=1000)
+
+    assert invalidate_mock.call_count == 2
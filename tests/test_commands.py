@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 
 from mopidy_mpd import exceptions, protocol
 
@@ -270,3 +271,25 @@ class TestCommands(unittest.TestCase):
 
         assert self.commands.handlers["foo"].list_command
         assert not self.commands.handlers["bar"].list_command
+
+
+class TestCompiledCommandDispatch(unittest.TestCase):
+    def setUp(self):  # noqa: N802
+        self.commands = protocol.Commands()
+
+        def func(context, songpos=None):
+            return songpos
+
+        self.commands.add("foo", songpos=protocol.UINT)(func)
+
+    def test_call_does_not_inspect_handler(self):
+        with mock.patch.object(
+            protocol.inspect, "signature"
+        ) as signature_mock, mock.patch.object(
+            protocol.inspect, "getfullargspec"
+        ) as getfullargspec_mock:
+            assert self.commands.call(["foo", "3"]) == 3
+            assert self.commands.call(["foo"]) is None
+
+        signature_mock.assert_not_called()
+        getfullargspec_mock.assert_not_called()
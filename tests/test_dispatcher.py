@@ -1,12 +1,18 @@
 import unittest
+from unittest import mock
 
 import pykka
 import pytest
 
 from mopidy import core
-from mopidy.models import Ref
+from mopidy.models import Ref, Track
+from mopidy_mpd import protocol
 from mopidy_mpd.dispatcher import MpdContext, MpdDispatcher
-from mopidy_mpd.exceptions import MpdAckError
+from mopidy_mpd.exceptions import (
+    MpdAckError,
+    MpdNoExistError,
+    MpdSystemError,
+)
 from mopidy_mpd.uri_mapper import MpdUriMapper
 
 from tests import dummy_backend
@@ -43,6 +49,73 @@ class MpdDispatcherTest(unittest.TestCase):
             == 'ACK [0@0] {disabled} "disabled" has been disabled in the server'
         )
 
+    def test_handling_streamed_response(self):
+        def handler_result():
+            yield ("foo", 1)
+            yield [("bar", 2), ("baz", 3)]
+
+        with mock.patch.object(
+            protocol.commands, "call", return_value=handler_result()
+        ):
+            result = self.dispatcher.handle_request("streaming")
+
+        assert not isinstance(result, list)
+        assert list(result) == ["foo: 1", "bar: 2", "baz: 3", "OK"]
+
+    def test_handling_error_in_streamed_response(self):
+        def handler_result():
+            yield ("foo", 1)
+            raise MpdNoExistError("Not found")
+
+        with mock.patch.object(
+            protocol.commands, "call", return_value=handler_result()
+        ):
+            result = self.dispatcher.handle_request("streaming")
+
+        assert list(result) == [
+            "foo: 1",
+            "ACK [50@0] {streaming} Not found",
+        ]
+
+    def test_handling_streamed_response_in_command_list(self):
+        def handler_result():
+            yield ("foo", 1)
+            raise MpdNoExistError("Not found")
+
+        with mock.patch.object(
+            protocol.commands, "call", return_value=handler_result()
+        ):
+            result = self.dispatcher.handle_request(
+                "streaming", current_command_list_index=3
+            )
+
+        assert result == ["ACK [50@3] {streaming} Not found"]
+
+    def test_commands_changing_state_invalidate_status_cache(self):
+        self.dispatcher.context.status_cache = mock.Mock()
+
+        with mock.patch.object(protocol.commands, "call"):
+            self.dispatcher.handle_request("status")
+            self.dispatcher.handle_request("currentsong")
+            self.dispatcher.handle_request('find "artist" "foo"')
+            self.dispatcher.handle_request('search "any" "foo"')
+            self.dispatcher.handle_request('list "album"')
+            self.dispatcher.handle_request('count "artist" "foo"')
+            self.dispatcher.handle_request('lsinfo "/"')
+            assert not self.dispatcher.context.status_cache.invalidate.called
+
+            self.dispatcher.handle_request("random 1")
+        self.dispatcher.context.status_cache.invalidate.assert_called_once_with()
+
+    def test_failing_commands_invalidate_status_cache(self):
+        self.dispatcher.context.status_cache = mock.Mock()
+
+        with mock.patch.object(
+            protocol.commands, "call", side_effect=MpdNoExistError("Not found")
+        ):
+            self.dispatcher.handle_request("deleteid 1")
+        self.dispatcher.context.status_cache.invalidate.assert_called_once_with()
+
 
 @pytest.fixture
 def a_track():
@@ -91,6 +164,98 @@ class TestMpdContext:
             ("/dummy/foo/b", b_track),
         ] == list(results)
 
+    def test_browse_looks_up_tracks_in_chunks(
+        self, backend_to_browse, mpd_context
+    ):
+        refs = [Ref.track(uri=f"dummy:/{i}", name=str(i)) for i in range(5)]
+        backend_to_browse.library.dummy_browse_result = {
+            "dummy:/": [*refs[:3], Ref.directory(uri="dummy:/foo", name="foo")],
+            "dummy:/foo": refs[3:],
+        }
+        backend_to_browse.library.dummy_library = [
+            Track(uri=ref.uri, name=ref.name) for ref in refs
+        ]
+        mpd_context.lookup_chunk_size = 2
+
+        with mock.patch.object(
+            mpd_context, "core", mock.Mock(wraps=mpd_context.core)
+        ) as core_mock:
+            results = [
+                (path, future.get() if future else None)
+                for path, future in mpd_context.browse("dummy")
+            ]
+
+        assert results == [
+            ("/dummy", None),
+            ("/dummy/0", {"dummy:/0": [Track(uri="dummy:/0", name="0")]}),
+            ("/dummy/1", {"dummy:/1": [Track(uri="dummy:/1", name="1")]}),
+            ("/dummy/2", {"dummy:/2": [Track(uri="dummy:/2", name="2")]}),
+            ("/dummy/foo", None),
+            ("/dummy/foo/3", {"dummy:/3": [Track(uri="dummy:/3", name="3")]}),
+            ("/dummy/foo/4", {"dummy:/4": [Track(uri="dummy:/4", name="4")]}),
+        ]
+        assert core_mock.library.lookup.call_args_list == [
+            mock.call(uris=["dummy:/0", "dummy:/1"]),
+            mock.call(uris=["dummy:/2"]),
+            mock.call(uris=["dummy:/3", "dummy:/4"]),
+        ]
+
+    def test_browse_recursive_is_breadth_first(
+        self, backend_to_browse, mpd_context
+    ):
+        backend_to_browse.library.dummy_browse_result = {
+            "dummy:/": [
+                Ref.directory(uri="dummy:/x", name="x"),
+                Ref.directory(uri="dummy:/y", name="y"),
+            ],
+            "dummy:/x": [Ref.directory(uri="dummy:/x/z", name="z")],
+            "dummy:/y": [Ref.track(uri="dummy:/y/b", name="b")],
+            "dummy:/x/z": [Ref.track(uri="dummy:/x/z/a", name="a")],
+        }
+
+        results = mpd_context.browse("dummy", recursive=True, lookup=False)
+
+        assert [path for path, _ in results] == [
+            "/dummy",
+            "/dummy/x",
+            "/dummy/y",
+            "/dummy/x/z",
+            "/dummy/y/b",
+            "/dummy/x/z/a",
+        ]
+
+    def test_browse_limits_browse_requests_in_flight(
+        self, backend_to_browse, mpd_context
+    ):
+        backend_to_browse.library.dummy_browse_result = {
+            "dummy:/": [
+                Ref.directory(uri=f"dummy:/{i}", name=str(i)) for i in range(5)
+            ],
+        }
+        mpd_context.browse_concurrency = 2
+
+        with mock.patch.object(
+            mpd_context, "core", mock.Mock(wraps=mpd_context.core)
+        ) as core_mock:
+            results = mpd_context.browse("dummy", recursive=True, lookup=False)
+            for _ in range(6):
+                next(results)
+
+        # Root and its five subdirectories yielded, two of them requested
+        assert core_mock.library.browse.call_args_list[-3:] == [
+            mock.call("dummy:/"),
+            mock.call("dummy:/0"),
+            mock.call("dummy:/1"),
+        ]
+
+    def test_browse_fails_when_exceeding_max_entries(
+        self, backend_to_browse, mpd_context
+    ):
+        mpd_context.browse_max_entries = 2
+
+        with pytest.raises(MpdSystemError):
+            list(mpd_context.browse("dummy", recursive=True, lookup=False))
+
     @pytest.mark.parametrize(
         "bad_ref",
         [
@@ -23,3 +23,13 @@ def test_get_config_schema():
     assert "zeroconf" in schema
     assert "command_blacklist" in schema
     assert "default_playlist_scheme" in schema
+    assert "idle_batch_window" in schema
+    assert "lookup_chunk_size" in schema
+    assert "browse_concurrency" in schema
+    assert "browse_max_entries" in schema
+    assert "browse_index_size" in schema
+    assert "persist_browse_index" in schema
+    assert "stats_cache_ttl" in schema
+    assert "search_cache_size" in schema
+    assert "search_cache_ttl" in schema
+    assert "recv_buffer_size" in schema
@@ -0,0 +1,114 @@
+from unittest import mock
+
+import pykka
+import pytest
+
+from mopidy_mpd import idle_notifier
+from mopidy_mpd.idle_notifier import IDLE_MESSAGE, IdleNotifier
+
+
+@pytest.fixture
+def glib():
+    with mock.patch.object(idle_notifier, "GLib") as glib:
+        yield glib
+
+
+def actor_ref(urn):
+    return mock.Mock(spec=pykka.ActorRef, actor_urn=urn)
+
+
+def test_notify_without_window_delivers_right_away():
+    notifier = IdleNotifier(window=0)
+    session = actor_ref("a")
+    notifier.register(session)
+
+    notifier.notify("player")
+
+    session.tell.assert_called_once_with(IDLE_MESSAGE)
+    assert notifier.changes_since(0) == ({"player"}, 1)
+
+
+def test_notify_within_window_is_coalesced(glib):
+    notifier = IdleNotifier(window=10)
+    session = actor_ref("a")
+    notifier.register(session)
+
+    for subsystem in ["playlist", "player", "playlist"]:
+        notifier.notify(subsystem)
+
+    glib.timeout_add.assert_called_once_with(10, mock.ANY)
+    session.tell.assert_not_called()
+
+    callback = glib.timeout_add.call_args[0][1]
+    assert callback() is False
+
+    session.tell.assert_called_once_with(IDLE_MESSAGE)
+    assert notifier.changes_since(0) == ({"player", "playlist"}, 1)
+
+
+def test_flush_cancels_pending_timeout(glib):
+    notifier = IdleNotifier(window=10)
+    notifier.notify("player")
+
+    notifier.flush()
+
+    glib.source_remove.assert_called_once_with(glib.timeout_add.return_value)
+    assert notifier.version == 1
+
+
+def test_flush_without_changes_does_nothing():
+    notifier = IdleNotifier(window=0)
+    session = actor_ref("a")
+    notifier.register(session)
+
+    notifier.flush()
+
+    session.tell.assert_not_called()
+    assert notifier.version == 0
+
+
+def test_only_registered_sessions_are_told():
+    notifier = IdleNotifier(window=0)
+    idle_session, busy_session = actor_ref("a"), actor_ref("b")
+    notifier.register(idle_session)
+    notifier.register(busy_session)
+    notifier.unregister(busy_session)
+
+    notifier.notify("mixer")
+
+    idle_session.tell.assert_called_once_with(IDLE_MESSAGE)
+    busy_session.tell.assert_not_called()
+
+
+def test_dead_sessions_are_unregistered():
+    notifier = IdleNotifier(window=0)
+    session = actor_ref("a")
+    session.tell.side_effect = pykka.ActorDeadError
+    notifier.register(session)
+
+    notifier.notify("mixer")
+    notifier.notify("output")
+
+    assert session.tell.call_count == 1
+
+
+def test_changes_since_only_returns_newer_changes():
+    notifier = IdleNotifier(window=0)
+    notifier.notify("player")
+    notifier.notify("mixer")
+    notifier.notify("player")
+
+    assert notifier.changes_since(0) == ({"player", "mixer"}, 3)
+    assert notifier.changes_since(2) == ({"player"}, 3)
+    assert notifier.changes_since(3) == (set(), 3)
+
+
+def test_stop_drops_pending_changes(glib):
+    notifier = IdleNotifier(window=10)
+    notifier.notify("player")
+
+    notifier.stop()
+    notifier.flush()
+
+    glib.source_remove.assert_called_once_with(glib.timeout_add.return_value)
+    assert notifier.version == 0
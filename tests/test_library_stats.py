@@ -0,0 +1,151 @@
+import time
+from unittest import mock
+
+import pytest
+
+from mopidy.models import Track
+from mopidy_mpd import library_stats
+from mopidy_mpd.library_stats import LibraryStats
+
+
+@pytest.fixture
+def clock():
+    with mock.patch.object(library_stats.time, "monotonic") as monotonic:
+        monotonic.return_value = 1000.0
+        yield monotonic
+
+
+@pytest.fixture
+def core():
+    core = mock.Mock()
+    distinct = {
+        "artist": {"a", "b"},
+        "album": {"x", "y", ""},
+        "uri": {"dummy:1", "dummy:2", "dummy:3", "dummy:4"},
+    }
+    tracks = {
+        "dummy:1": [Track(uri="dummy:1", length=60000)],
+        "dummy:2": [Track(uri="dummy:2", length=30000)],
+        "dummy:3": [Track(uri="dummy:3")],
+        "dummy:4": [],
+    }
+    core.library.get_distinct.side_effect = lambda field: mock.Mock(
+        get=mock.Mock(return_value=distinct[field])
+    )
+    core.library.lookup.side_effect = lambda uris: mock.Mock(
+        get=mock.Mock(return_value={uri: tracks[uri] for uri in uris})
+    )
+    return core
+
+
+def wait_for_refresh_thread(stats):
+    deadline = time.monotonic() + 5
+    while stats._refresh_thread is not None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_refresh_counts_library(core):
+    stats = LibraryStats(core)
+
+    stats.refresh()
+
+    with mock.patch.object(stats, "refresh_in_background"):
+        result = stats.get()
+    assert result["artists"] == 2
+    assert result["albums"] == 2
+    assert result["songs"] == 4
+    assert result["db_playtime"] == 90
+    assert result["db_update"] > 0
+    core.library.search.assert_not_called()
+
+
+def test_refresh_looks_up_songs_in_chunks(core):
+    stats = LibraryStats(core, lookup_chunk_size=3)
+
+    stats.refresh()
+
+    assert core.library.lookup.call_args_list == [
+        mock.call(uris=["dummy:1", "dummy:2", "dummy:3"]),
+        mock.call(uris=["dummy:4"]),
+    ]
+
+
+def test_get_refreshes_stale_statistics_in_background(core, clock):
+    stats = LibraryStats(core, ttl=60)
+    stats.refresh()
+
+    with mock.patch.object(stats, "refresh_in_background") as refresh_mock:
+        stats.get()
+        clock.return_value += 30
+        stats.get()
+        clock.return_value += 30
+        stats.get()
+
+    assert refresh_mock.call_count == 1
+
+
+def test_first_get_waits_for_library_to_be_counted(core):
+    stats = LibraryStats(core)
+
+    result = stats.get()
+
+    assert result["songs"] == 4
+    assert result["db_playtime"] == 90
+
+
+def test_first_get_reports_empty_library_on_timeout(core):
+    stats = LibraryStats(core, first_count_timeout=0.01)
+
+    with mock.patch.object(stats, "refresh_in_background") as refresh_mock:
+        result = stats.get()
+
+    assert refresh_mock.called
+    assert result["songs"] == 0
+
+
+def test_invalidate_makes_statistics_stale(core):
+    stats = LibraryStats(core)
+    stats.refresh()
+
+    stats.invalidate()
+
+    with mock.patch.object(stats, "refresh_in_background") as refresh_mock:
+        stats.get()
+    refresh_mock.assert_called_once_with()
+
+
+def test_refresh_in_background(core):
+    stats = LibraryStats(core)
+
+    stats.refresh_in_background()
+
+    wait_for_refresh_thread(stats)
+    assert stats._refreshed_at is not None
+
+
+def test_failed_background_refresh_is_logged(core, caplog):
+    core.library.get_distinct.side_effect = Exception("foo")
+    stats = LibraryStats(core)
+
+    stats.refresh_in_background()
+
+    wait_for_refresh_thread(stats)
+    assert "Failed to count MPD library statistics: foo" in caplog.text
+
+
+def test_uptime_and_playtime(clock):
+    stats = LibraryStats()
+
+    clock.return_value += 10
+    stats.playback_started()
+    clock.return_value += 20
+    stats.playback_stopped()
+    clock.return_value += 5
+    stats.playback_started()
+    stats.playback_started()
+    clock.return_value += 3
+
+    result = stats.get()
+    assert result["uptime"] == 38
+    assert result["playtime"] == 23
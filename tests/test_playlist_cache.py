@@ -0,0 +1,155 @@
+from unittest import mock
+
+import pytest
+
+from mopidy.models import Playlist, Track
+from mopidy_mpd import playlist_cache
+from mopidy_mpd.playlist_cache import PlaylistCache
+
+
+@pytest.fixture
+def library():
+    return [Track(uri=f"dummy:/{i}", name=f"Track {i}") for i in range(10)]
+
+
+def make_playlist(uris, last_modified=1):
+    return Playlist(
+        uri="dummy:playlist",
+        name="playlist",
+        tracks=[Track(uri=uri) for uri in uris],
+        last_modified=last_modified,
+    )
+
+
+def test_get_tracks_looks_up_tracks_in_playlist_order(mopidy_core):
+    cache = PlaylistCache(mopidy_core, lookup_chunk_size=3)
+    uris = [f"dummy:/{i}" for i in reversed(range(10))] + ["dummy:/9"]
+
+    tracks = cache.get_tracks(make_playlist(uris + ["dummy:/missing"]))
+
+    assert [track.uri for track in tracks] == uris
+    assert tracks[0].name == "Track 9"
+
+
+def test_get_tracks_looks_up_in_chunks():
+    mock_core = mock.Mock()
+    mock_core.library.lookup.side_effect = lambda uris: mock.Mock(
+        get=mock.Mock(return_value={uri: [Track(uri=uri)] for uri in uris})
+    )
+    cache = PlaylistCache(mock_core, lookup_chunk_size=4)
+    uris = [f"dummy:/{i}" for i in range(10)]
+
+    tracks = cache.get_tracks(make_playlist(uris))
+
+    assert [track.uri for track in tracks] == uris
+    assert [
+        c.kwargs["uris"] for c in mock_core.library.lookup.call_args_list
+    ] == [uris[0:4], uris[4:8], uris[8:10]]
+
+
+def test_get_tracks_is_cached_until_playlist_is_modified(mopidy_core):
+    cache = PlaylistCache(mopidy_core)
+    playlist = make_playlist(["dummy:/1"])
+    tracks = cache.get_tracks(playlist)
+
+    with mock.patch.object(cache, "_lookup") as lookup_mock:
+        assert cache.get_tracks(playlist) is tracks
+        cache.get_tracks(playlist.replace(last_modified=2))
+
+    lookup_mock.assert_called_once_with(("dummy:/1",))
+
+
+def test_get_tracks_is_not_served_for_other_tracks(mopidy_core):
+    cache = PlaylistCache(mopidy_core)
+    cache.get_tracks(make_playlist(["dummy:/1"], last_modified=None))
+
+    tracks = cache.get_tracks(make_playlist(["dummy:/2"], last_modified=None))
+
+    assert [track.uri for track in tracks] == ["dummy:/2"]
+
+
+@pytest.mark.parametrize(
+    "invalidate",
+    [
+        lambda cache, playlist: cache.playlists_loaded(),
+        lambda cache, playlist: cache.playlist_changed(playlist),
+        lambda cache, playlist: cache.playlist_deleted(playlist.uri),
+    ],
+)
+def test_playlist_events_invalidate_tracks(mopidy_core, invalidate):
+    cache = PlaylistCache(mopidy_core)
+    playlist = make_playlist(["dummy:/1"])
+    tracks = cache.get_tracks(playlist)
+
+    invalidate(cache, playlist)
+
+    assert cache.get_tracks(playlist) is not tracks
+
+
+def test_least_recently_used_playlists_are_evicted(mopidy_core):
+    cache = PlaylistCache(mopidy_core, max_size=1)
+    playlist1 = make_playlist(["dummy:/1"])
+    playlist2 = make_playlist(["dummy:/2"]).replace(uri="dummy:other")
+    tracks = cache.get_tracks(playlist1)
+
+    cache.get_tracks(playlist2)
+
+    assert cache.get_tracks(playlist1) is not tracks
+
+
+def test_get_last_modified_looks_up_playlists_once():
+    mock_core = mock.Mock()
+    mock_core.playlists.lookup.side_effect = lambda uri: mock.Mock(
+        get=mock.Mock(return_value=Playlist(uri=uri, last_modified=len(uri)))
+    )
+    cache = PlaylistCache(mock_core)
+    uris = [f"dummy:{'a' * i}" for i in range(10)]
+
+    assert cache.get_last_modified(uris) == {uri: len(uri) for uri in uris}
+    assert cache.get_last_modified(uris[:2]) == {
+        uri: len(uri) for uri in uris[:2]
+    }
+
+    assert mock_core.playlists.lookup.call_count == 10
+
+
+def test_unknown_last_modified_is_time_first_seen():
+    mock_core = mock.Mock()
+    mock_core.playlists.lookup.return_value.get.return_value = None
+    cache = PlaylistCache(mock_core)
+
+    with mock.patch.object(playlist_cache.time, "time", return_value=1000):
+        assert cache.get_last_modified(["dummy:a"]) == {"dummy:a": 1000000}
+    with mock.patch.object(playlist_cache.time, "time", return_value=2000):
+        assert cache.get_last_modified(["dummy:a"]) == {"dummy:a": 1000000}
+
+
+def test_playlist_changed_updates_last_modified(mopidy_core):
+    cache = PlaylistCache(mopidy_core)
+    playlist = make_playlist([], last_modified=1)
+    cache.playlist_changed(playlist)
+
+    cache.playlist_changed(playlist.replace(last_modified=2))
+
+    assert cache.get_last_modified([playlist.uri]) == {playlist.uri: 2}
+
+
+@pytest.mark.parametrize(
+    "invalidate",
+    [
+        lambda cache, uri: cache.playlists_loaded(),
+        lambda cache, uri: cache.playlist_deleted(uri),
+    ],
+)
+def test_playlist_events_invalidate_last_modified(invalidate):
+    mock_core = mock.Mock()
+    mock_core.playlists.lookup.return_value.get.return_value = Playlist(
+        uri="dummy:a", last_modified=1
+    )
+    cache = PlaylistCache(mock_core)
+    cache.get_last_modified(["dummy:a"])
+
+    invalidate(cache, "dummy:a")
+    cache.get_last_modified(["dummy:a"])
+
+    assert mock_core.playlists.lookup.call_count == 2
@@ -0,0 +1,82 @@
+from unittest import mock
+
+from mopidy_mpd import search_cache
+from mopidy_mpd.search_cache import SearchCache
+
+
+def test_get_fetches_results_once():
+    cache = SearchCache()
+    fetch = mock.Mock(return_value=["result"])
+
+    assert cache.get("key", fetch) == ["result"]
+    assert cache.get("key", fetch) == ["result"]
+
+    fetch.assert_called_once_with()
+
+
+def test_least_recently_used_results_are_evicted():
+    cache = SearchCache(max_size=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 1)
+
+    cache.get("c", lambda: 3)
+
+    assert cache.get("a", lambda: None) == 1
+    assert cache.get("b", lambda: None) is None
+
+
+def test_results_expire_after_ttl():
+    cache = SearchCache(ttl=10)
+    with mock.patch.object(search_cache.time, "monotonic", return_value=100):
+        cache.get("key", lambda: 1)
+    with mock.patch.object(search_cache.time, "monotonic", return_value=109):
+        assert cache.get("key", lambda: 2) == 1
+    with mock.patch.object(search_cache.time, "monotonic", return_value=110):
+        assert cache.get("key", lambda: 2) == 2
+
+    assert cache.metrics()["expirations"] == 1
+
+
+def test_invalidate_forgets_results():
+    cache = SearchCache()
+    cache.get("key", lambda: 1)
+
+    cache.invalidate()
+
+    assert cache.get("key", lambda: 2) == 2
+
+
+def test_results_fetched_while_invalidated_are_not_cached():
+    cache = SearchCache()
+
+    def fetch_and_invalidate():
+        cache.invalidate()
+        return 1
+
+    cache.get("key", fetch_and_invalidate)
+
+    assert cache.get("key", lambda: 2) == 2
+
+
+def test_zero_size_disables_caching():
+    cache = SearchCache(max_size=0)
+    cache.get("key", lambda: 1)
+
+    assert cache.get("key", lambda: 2) == 2
+
+
+def test_metrics_count_hits_misses_and_evictions():
+    cache = SearchCache(max_size=1)
+    cache.get("a", lambda: 1)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+
+    assert cache.metrics() == {
+        "size": 1,
+        "max_size": 1,
+        "hits": 1,
+        "misses": 2,
+        "expirations": 0,
+        "evictions": 1,
+    }
@@ -1,5 +1,5 @@
 import logging
-from unittest.mock import Mock, sentinel
+from unittest.mock import Mock, patch, sentinel
 
 from mopidy_mpd import dispatcher, network, session
 
@@ -16,6 +16,7 @@ def test_on_start_logged(caplog):
 def test_on_line_received_logged(caplog):
     caplog.set_level(logging.DEBUG)
     connection = Mock(spec=network.Connection)
+    connection.stopping = False
     mpd_session = session.MpdSession(connection)
     mpd_session.dispatcher = Mock(spec=dispatcher.MpdDispatcher)
     mpd_session.dispatcher.handle_request.return_value = [str(sentinel.resp)]
@@ -24,3 +25,49 @@ def test_on_line_received_logged(caplog):
 
     assert f"Request from {connection}: foobar" in caplog.text
     assert f"Response to {connection}:" in caplog.text
+
+
+def test_on_line_received_sends_streamed_response_in_batches():
+    connection = Mock(spec=network.Connection)
+    connection.stopping = False
+    mpd_session = session.MpdSession(connection)
+    mpd_session.dispatcher = Mock(spec=dispatcher.MpdDispatcher)
+    mpd_session.dispatcher.handle_request.return_value = (
+        f"line: {i}" for i in range(5)
+    )
+    mpd_session.send_lines = Mock()
+
+    with patch.object(session, "RESPONSE_BATCH_SIZE", 2):
+        mpd_session.on_line_received("foobar")
+
+    assert [c[0][0] for c in mpd_session.send_lines.call_args_list] == [
+        ["line: 0", "line: 1"],
+        ["line: 2", "line: 3"],
+        ["line: 4"],
+    ]
+
+
+def test_on_line_received_stops_streamed_response_when_stopping():
+    generated = []
+
+    def response():
+        for i in range(5):
+            generated.append(i)
+            yield f"line: {i}"
+
+    connection = Mock(spec=network.Connection)
+    connection.stopping = False
+    mpd_session = session.MpdSession(connection)
+    mpd_session.dispatcher = Mock(spec=dispatcher.MpdDispatcher)
+    mpd_session.dispatcher.handle_request.return_value = response()
+
+    def send_lines(lines):
+        connection.stopping = True
+
+    mpd_session.send_lines = Mock(side_effect=send_lines)
+
+    with patch.object(session, "RESPONSE_BATCH_SIZE", 2):
+        mpd_session.on_line_received("foobar")
+
+    assert mpd_session.send_lines.call_count == 1
+    assert generated == [0, 1]
@@ -5,7 +5,7 @@ import pykka
 from mopidy import core
 from mopidy.core import PlaybackState
 from mopidy.models import Track
-from mopidy_mpd import dispatcher
+from mopidy_mpd import dispatcher, library_stats
 from mopidy_mpd.protocol import status
 
 from tests import dummy_audio, dummy_backend, dummy_mixer
@@ -43,6 +43,26 @@ class StatusHandlerTest(unittest.TestCase):
         self.backend.library.dummy_library = tracks
         self.core.tracklist.add(uris=[track.uri for track in tracks]).get()
 
+    def test_stats_method_with_library_stats(self):
+        self.backend.library.dummy_get_distinct_result = {
+            "artist": {"an artist"},
+            "album": {"an album"},
+            "uri": {"dummy:a"},
+        }
+        self.backend.library.dummy_library = [
+            Track(uri="dummy:a", length=123000)
+        ]
+        self.context.library_stats = library_stats.LibraryStats(self.core)
+        self.context.library_stats.refresh()
+
+        result = status.stats(self.context)
+
+        assert result["artists"] == 1
+        assert result["albums"] == 1
+        assert result["songs"] == 1
+        assert result["db_playtime"] == 123
+        assert result["db_update"] > 0
+
     def test_stats_method(self):
         result = status.stats(self.context)
         assert "artists" in result
@@ -0,0 +1,86 @@
+from unittest import mock
+
+import pytest
+
+from mopidy.core import PlaybackState
+from mopidy.models import Track
+from mopidy_mpd import status_cache
+from mopidy_mpd.status_cache import StatusCache
+
+
+@pytest.fixture
+def clock():
+    with mock.patch.object(status_cache.time, "monotonic") as monotonic:
+        monotonic.return_value = 1000.0
+        yield monotonic
+
+
+@pytest.fixture
+def library():
+    return [Track(uri="dummy:/a", length=40000), Track(uri="dummy:/b")]
+
+
+@pytest.fixture
+def tracklist_uris():
+    return ["dummy:/a", "dummy:/b"]
+
+
+def test_get_returns_player_state(mopidy_core):
+    mopidy_core.playback.play().get()
+    cache = StatusCache(mopidy_core)
+
+    values = cache.get()
+
+    assert values["playback.state"] == PlaybackState.PLAYING
+    assert values["tracklist.length"] == 2
+    assert values["tracklist.index"] == 0
+    assert values["tracklist.next_tlid"] == 2
+    assert values["tracklist.next_index"] == 1
+
+
+def test_get_serves_snapshot_until_invalidated(mopidy_core):
+    cache = StatusCache(mopidy_core)
+    cache.get()
+
+    mopidy_core.tracklist.set_random(True).get()
+    assert cache.get()["tracklist.random"] is False
+
+    cache.invalidate()
+    assert cache.get()["tracklist.random"] is True
+
+
+def test_snapshot_fetched_while_invalidated_is_not_cached(mopidy_core):
+    cache = StatusCache(mopidy_core)
+    fetch = cache._fetch
+
+    def fetch_and_invalidate():
+        values = fetch()
+        cache.invalidate()
+        return values
+
+    with mock.patch.object(cache, "_fetch", side_effect=fetch_and_invalidate):
+        cache.get()
+
+    assert cache._snapshot is None
+
+
+def test_time_position_is_extrapolated_while_playing(mopidy_core, clock):
+    mopidy_core.playback.play().get()
+    cache = StatusCache(mopidy_core)
+    position = cache.get()["playback.time_position"]
+
+    clock.return_value += 1.5
+    assert cache.get()["playback.time_position"] == position + 1500
+
+    clock.return_value += 100
+    assert cache.get()["playback.time_position"] == 40000
+
+
+def test_time_position_is_not_extrapolated_while_paused(mopidy_core, clock):
+    mopidy_core.playback.play().get()
+    mopidy_core.playback.pause().get()
+    cache = StatusCache(mopidy_core)
+    position = cache.get()["playback.time_position"]
+
+    clock.return_value += 1.5
+    assert cache.get()["playback.time_position"] == position
@@ -145,3 +145,43 @@ class TestTokenizer(unittest.TestCase):
         msg = "Missing closing '\"'"
         self.assertTokenizeRaises(ex, msg, 'test "foo')
         self.assertTokenizeRaises(ex, msg, 'test "foo a ')
+
+    def test_params_end_at_newline(self):
+        self.assertTokenizeEquals(["test", "foo"], "test foo\nbar")
+
+    def test_cached_tokens_are_not_shared(self):
+        tokens = tokenize.split("test foo")
+        tokens.append("bar")
+
+        self.assertTokenizeEquals(["test", "foo"], "test foo")
+
+    def test_long_lines_are_not_cached(self):
+        tokenize._split.cache_clear()
+        value = "a" * tokenize._MAX_CACHED_LINE_LENGTH
+
+        assert tokenize.split(f"test {value}") == ["test", value]
+        assert tokenize._split.cache_info().currsize == 0
+
+    def test_errors_are_raised_for_repeated_lines(self):
+        ex = exceptions.MpdArgError
+        msg = "Missing closing '\"'"
+        self.assertTokenizeRaises(ex, msg, 'test "foo')
+        self.assertTokenizeRaises(ex, msg, 'test "foo')
+
+    def test_repeated_lines_hit_the_cache(self):
+        tokenize._split.cache_clear()
+
+        for _ in range(3):
+            self.assertTokenizeEquals(["test", "foo"], 'test "foo"')
+
+        assert tokenize._split.cache_info().misses == 1
+        assert tokenize._split.cache_info().hits == 2
+
+    def test_long_lines_with_many_params(self):
+        uri = "file:///" + "a" * 1000
+        line = "test " + " ".join(f'"{uri}/{i}"' for i in range(2000))
+
+        tokens = tokenize.split(line)
+
+        assert len(tokens) == 2001
+        assert tokens[-1] == f"{uri}/1999"
@@ -0,0 +1,138 @@
+from unittest import mock
+
+import pytest
+
+from mopidy.models import Album, Artist, TlTrack, Track
+from mopidy_mpd.tracklist_index import TracklistIndex
+
+
+@pytest.fixture
+def library():
+    return [
+        Track(
+            uri="dummy:/a",
+            name="Alpha",
+            artists=[Artist(name="Foo")],
+            album=Album(name="One", artists=[Artist(name="Bar")]),
+            track_no=1,
+        ),
+        Track(uri="dummy:/b", name="Beta", artists=[Artist(name="foo")]),
+        Track(uri="dummy:/c", name="Gamma", genre="Foo Rock"),
+    ]
+
+
+@pytest.fixture
+def tracklist_uris():
+    return ["dummy:/a", "dummy:/b", "dummy:/c"]
+
+
+def uris(matches):
+    return [tl_track.track.uri for _, tl_track in matches]
+
+
+def test_find_matches_exact_values(mopidy_core):
+    index = TracklistIndex(mopidy_core)
+
+    assert uris(index.find("artist", "Foo")) == ["dummy:/a"]
+    assert uris(index.find("Artist", "foo")) == ["dummy:/b"]
+    assert uris(index.find("albumartist", "Bar")) == ["dummy:/a"]
+    assert uris(index.find("track", "1")) == ["dummy:/a"]
+    assert uris(index.find("filename", "dummy:/c")) == ["dummy:/c"]
+    assert index.find("title", "alpha") == []
+
+
+def test_search_matches_partial_values_ignoring_case(mopidy_core):
+    index = TracklistIndex(mopidy_core)
+
+    assert uris(index.search("artist", "FO")) == ["dummy:/a", "dummy:/b"]
+    assert uris(index.search("any", "foo")) == [
+        "dummy:/a",
+        "dummy:/b",
+        "dummy:/c",
+    ]
+    assert uris(index.search("title", "mm")) == ["dummy:/c"]
+
+
+def test_matches_include_positions(mopidy_core):
+    index = TracklistIndex(mopidy_core)
+
+    assert [position for position, _ in index.search("title", "a")] == [
+        0,
+        1,
+        2,
+    ]
+
+
+def test_unknown_tag_raises_key_error(mopidy_core):
+    index = TracklistIndex(mopidy_core)
+
+    with pytest.raises(KeyError):
+        index.find("foo", "bar")
+
+
+def test_index_follows_tracklist_changes(mopidy_core):
+    index = TracklistIndex(mopidy_core)
+    index.update()
+
+    mopidy_core.tracklist.remove({"uri": ["dummy:/a"]}).get()
+
+    assert index.search("artist", "foo") == [
+        (0, mopidy_core.tracklist.get_tl_tracks().get()[0])
+    ]
+
+
+def test_tracklist_is_only_fetched_when_changed():
+    mock_core = mock.Mock()
+    mock_core.tracklist.get_version.return_value.get.return_value = 1
+    mock_core.tracklist.get_tl_tracks.return_value.get.return_value = [
+        TlTrack(1, Track(uri="dummy:/a"))
+    ]
+    index = TracklistIndex(mock_core)
+
+    index.update()
+    index.find("file", "dummy:/a")
+    index.search("file", "a")
+
+    assert mock_core.tracklist.get_tl_tracks.call_count == 1
+
+
+def test_invalidate_rebuilds_lazily_on_next_query():
+    mock_core = mock.Mock()
+    mock_core.tracklist.get_version.return_value.get.return_value = 1
+    mock_core.tracklist.get_tl_tracks.return_value.get.return_value = [
+        TlTrack(1, Track(uri="dummy:/a"))
+    ]
+    index = TracklistIndex(mock_core)
+    index.update()
+
+    index.invalidate()
+    index.invalidate()
+    assert mock_core.tracklist.get_tl_tracks.call_count == 1
+
+    assert uris(index.find("file", "dummy:/a")) == ["dummy:/a"]
+    assert mock_core.tracklist.get_tl_tracks.call_count == 2
+
+
+def test_find_in_large_tracklist_answers_from_index():
+    mock_core = mock.Mock()
+    mock_core.tracklist.get_version.return_value.get.return_value = 1
+    mock_core.tracklist.get_tl_tracks.return_value.get.return_value = [
+        TlTrack(
+            i,
+            Track(
+                uri=f"dummy:/{i}",
+                name=f"Track {i}",
+                artists=[Artist(name=f"Artist {i % 100}")],
+                album=Album(name=f"Album {i % 1000}"),
+            ),
+        )
+        for i in range(20000)
+    ]
+    index = TracklistIndex(mock_core)
+    index.update()
+
+    for _ in range(10):
+        matches = index.find("artist", "Artist 42")
+
+    assert len(matches) == 200
+    mock_core.tracklist.get_tl_tracks.assert_called_once_with()
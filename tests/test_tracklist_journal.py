@@ -0,0 +1,118 @@
+import pytest
+
+from mopidy.models import Track
+from mopidy_mpd.tracklist_journal import TracklistJournal
+
+
+@pytest.fixture
+def library():
+    return [Track(uri=f"dummy:/{x}", name=x) for x in "abcde"]
+
+
+@pytest.fixture
+def tracklist_uris():
+    return [f"dummy:/{x}" for x in "abc"]
+
+
+def positions(changes):
+    return [position for position, _ in changes]
+
+
+def test_unknown_version_returns_entire_tracklist(mopidy_core):
+    journal = TracklistJournal(mopidy_core)
+
+    assert positions(journal.changes_since(0)) == [0, 1, 2]
+
+
+def test_current_version_returns_nothing(mopidy_core):
+    journal = TracklistJournal(mopidy_core)
+    version = mopidy_core.tracklist.get_version().get()
+
+    assert journal.changes_since(version) == []
+
+
+def test_newer_version_returns_entire_tracklist(mopidy_core):
+    journal = TracklistJournal(mopidy_core)
+    version = mopidy_core.tracklist.get_version().get()
+
+    assert positions(journal.changes_since(version + 10)) == [0, 1, 2]
+
+
+def test_append_only_returns_new_positions(mopidy_core):
+    journal = TracklistJournal(mopidy_core)
+    journal.update()
+    version = mopidy_core.tracklist.get_version().get()
+    mopidy_core.tracklist.add(uris=["dummy:/d", "dummy:/e"]).get()
+
+    changes = journal.changes_since(version)
+
+    assert positions(changes) == [3, 4]
+    assert [tl_track.track.name for _, tl_track in changes] == ["d", "e"]
+
+
+def test_remove_returns_shifted_positions(mopidy_core):
+    journal = TracklistJournal(mopidy_core)
+    journal.update()
+    version = mopidy_core.tracklist.get_version().get()
+    mopidy_core.tracklist.remove({"uri": ["dummy:/a"]}).get()
+
+    assert positions(journal.changes_since(version)) == [0, 1]
+
+
+def test_changes_accumulate_over_multiple_versions(mopidy_core):
+    journal = TracklistJournal(mopidy_core)
+    journal.update()
+    version = mopidy_core.tracklist.get_version().get()
+    mopidy_core.tracklist.add(uris=["dummy:/d"]).get()
+    journal.invalidate()
+    journal.update()
+    mopidy_core.tracklist.move(0, 1, 1).get()
+    journal.invalidate()
+    journal.update()
+
+    assert positions(journal.changes_since(version)) == [0, 1, 3]
+    assert positions(journal.changes_since(version + 1)) == [0, 1]
+
+
+def test_aged_out_version_returns_entire_tracklist(mopidy_core):
+    journal = TracklistJournal(mopidy_core, max_entries=1)
+    journal.update()
+    version = mopidy_core.tracklist.get_version().get()
+    mopidy_core.tracklist.add(uris=["dummy:/d"]).get()
+    journal.invalidate()
+    journal.update()
+    mopidy_core.tracklist.add(uris=["dummy:/e"]).get()
+    journal.invalidate()
+    journal.update()
+
+    assert positions(journal.changes_since(version)) == [0, 1, 2, 3, 4]
+    assert positions(journal.changes_since(version + 1)) == [4]
+
+
+def test_version_between_recorded_versions_returns_entire_tracklist(
+    mopidy_core,
+):
+    journal = TracklistJournal(mopidy_core)
+    journal.update()
+    version = mopidy_core.tracklist.get_version().get()
+    mopidy_core.tracklist.move(0, 1, 1).get()
+    mopidy_core.tracklist.move(0, 1, 1).get()
+
+    assert positions(journal.changes_since(version)) == []
+    assert positions(journal.changes_since(version + 1)) == [0, 1, 2]
+
+
+def test_update_only_syncs_when_invalidated(mopidy_core):
+    journal = TracklistJournal(mopidy_core)
+    journal.update()
+    version = mopidy_core.tracklist.get_version().get()
+    mopidy_core.tracklist.add(uris=["dummy:/d"]).get()
+
+    journal.update()
+    mopidy_core.tracklist.add(uris=["dummy:/e"]).get()
+    journal.invalidate()
+    journal.update()
+
+    assert positions(journal.changes_since(version)) == [3, 4]
+    assert positions(journal.changes_since(version + 1)) == [0, 1, 2, 3, 4]
+    assert positions(journal.changes_since(version + 2)) == []
@@ -210,6 +210,45 @@ class TrackMpdFormatTest(unittest.TestCase):
         assert len(result) == 10
 
 
+class TrackCacheTest(unittest.TestCase):
+    track = Track(uri="a uri", name="a name", track_no=7, length=137000)
+
+    def setUp(self):  # noqa: N802
+        translator.clear_track_cache()
+
+    def test_same_track_is_formatted_once(self):
+        first = translator.track_to_mpd_format(
+            self.track, tagtype_list.TAGTYPE_LIST
+        )
+        second = translator.track_to_mpd_format(
+            TlTrack(1, self.track), tagtype_list.TAGTYPE_LIST, position=0
+        )
+
+        assert first == second[:4] + second[6:]
+        assert second[4:6] == [("Pos", 0), ("Id", 1)]
+        info = translator.track_cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_cache_is_keyed_on_tagtypes(self):
+        translator.track_to_mpd_format(self.track, tagtype_list.TAGTYPE_LIST)
+        result = translator.track_to_mpd_format(self.track, ["Title"])
+
+        assert ("Track", 7) not in result
+        assert ("Title", "a name") in result
+        assert translator.track_cache_info().misses == 2
+
+    def test_cached_result_is_not_shared_with_caller(self):
+        result = translator.track_to_mpd_format(
+            self.track, tagtype_list.TAGTYPE_LIST
+        )
+        result.append(("Extra", "value"))
+
+        assert ("Extra", "value") not in translator.track_to_mpd_format(
+            self.track, tagtype_list.TAGTYPE_LIST
+        )
+
+
 class PlaylistMpdFormatTest(unittest.TestCase):
     def test_mpd_format(self):
         playlist = Playlist(
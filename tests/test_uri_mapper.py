@@ -0,0 +1,207 @@
+import collections
+from unittest import mock
+
+from mopidy.models import Playlist, Ref
+from mopidy_mpd.uri_mapper import MpdUriMapper
+
+
+def test_insert_returns_unique_names():
+    uri_map = MpdUriMapper()
+
+    assert uri_map.insert("/dummy/a", "dummy:/a") == "/dummy/a"
+    assert uri_map.insert("/dummy/a", "dummy:/b") == "/dummy/a [2]"
+    assert uri_map.insert("/dummy/a", "dummy:/a") == "/dummy/a"
+    assert uri_map.uri_from_name("/dummy/a [2]") == "dummy:/b"
+
+
+def test_insert_skips_names_taken_by_other_paths():
+    uri_map = MpdUriMapper()
+    uri_map.insert("/dummy/a [3]", "dummy:/x")
+
+    names = [uri_map.insert("/dummy/a", f"dummy:/{i}") for i in range(4)]
+
+    assert names == ["/dummy/a", "/dummy/a [2]", "/dummy/a [4]", "/dummy/a [5]"]
+
+
+def test_insert_gives_evicted_paths_the_same_names():
+    uri_map = MpdUriMapper(max_browse_entries=3)
+    for i in range(3):
+        uri_map.insert("/dummy/a", f"dummy:/{i}")
+    uri_map.insert("/dummy/c", "dummy:/c")
+    uri_map.insert("/dummy/d", "dummy:/d")
+
+    names = [uri_map.insert("/dummy/a", f"dummy:/{i}") for i in range(3)]
+
+    assert names == ["/dummy/a", "/dummy/a [2]", "/dummy/a [3]"]
+
+
+def test_evicted_paths_release_their_suffixes():
+    uri_map = MpdUriMapper(max_browse_entries=2)
+    for i in range(3):
+        uri_map.insert("/dummy/a", f"dummy:/{i}")
+    assert uri_map._suffixes.keys() == {"/dummy/a"}
+
+    uri_map.insert("/dummy/c", "dummy:/c")
+    uri_map.insert("/dummy/d", "dummy:/d")
+
+    assert uri_map._suffixes == {}
+
+
+def test_insert_many_identical_names_does_not_probe_suffixes():
+    class CountingDict(collections.OrderedDict):
+        lookups = 0
+
+        def __contains__(self, key):
+            self.lookups += 1
+            return super().__contains__(key)
+
+    uri_map = MpdUriMapper()
+    uri_map._browse_uri_from_name = CountingDict()
+
+    for i in range(1000):
+        name = uri_map.insert("/dummy/Disc 1", f"dummy:/{i}")
+
+    assert name == "/dummy/Disc 1 [1000]"
+    assert (
+        uri_map.insert("/dummy/Disc 1", "dummy:/500") == "/dummy/Disc 1 [501]"
+    )
+    # One check per new suffix, instead of one per suffix already taken.
+    assert uri_map._browse_uri_from_name.lookups == 999
+
+
+def test_browse_paths_are_evicted_least_recently_used_first():
+    uri_map = MpdUriMapper(max_browse_entries=2)
+    uri_map.insert("/dummy/a", "dummy:/a")
+    uri_map.insert("/dummy/b", "dummy:/b")
+    uri_map.uri_from_name("/dummy/a")
+
+    uri_map.insert("/dummy/c", "dummy:/c")
+
+    assert uri_map.uri_from_name("/dummy/a") == "dummy:/a"
+    assert uri_map.uri_from_name("/dummy/b") is None
+    assert uri_map.uri_from_name("/dummy/c") == "dummy:/c"
+
+
+def test_playlists_are_not_evicted():
+    core = mock.Mock()
+    core.playlists.as_list.return_value.get.return_value = [
+        Ref.playlist(uri="dummy:/pl", name="pl")
+    ]
+    uri_map = MpdUriMapper(core, max_browse_entries=1)
+
+    assert uri_map.playlist_uri_from_name("pl") == "dummy:/pl"
+    uri_map.insert("/dummy/a", "dummy:/a")
+    uri_map.insert("/dummy/b", "dummy:/b")
+
+    assert uri_map.playlist_uri_from_name("pl") == "dummy:/pl"
+    assert core.playlists.as_list.call_count == 1
+
+
+def test_browse_index_can_be_saved_and_loaded(tmp_path):
+    path = tmp_path / "browse_index.sqlite3"
+    uri_map = MpdUriMapper()
+    uri_map.insert("/dummy/a", "dummy:/a")
+    uri_map.insert("/dummy/a", "dummy:/b")
+    uri_map.save_browse_index(path)
+
+    loaded = MpdUriMapper()
+    loaded.load_browse_index(path)
+
+    assert loaded.uri_from_name("/dummy/a") == "dummy:/a"
+    assert loaded.uri_from_name("/dummy/a [2]") == "dummy:/b"
+    assert loaded.insert("/dummy/a", "dummy:/b") == "/dummy/a [2]"
+
+
+def test_loaded_browse_index_is_bounded(tmp_path):
+    path = tmp_path / "browse_index.sqlite3"
+    uri_map = MpdUriMapper()
+    for name in "abc":
+        uri_map.insert(f"/dummy/{name}", f"dummy:/{name}")
+    uri_map.save_browse_index(path)
+
+    loaded = MpdUriMapper(max_browse_entries=2)
+    loaded.insert("/dummy/d", "dummy:/d")
+    loaded.load_browse_index(path)
+
+    assert loaded.uri_from_name("/dummy/a") is None
+    assert loaded.uri_from_name("/dummy/b") is None
+    assert loaded.uri_from_name("/dummy/c") == "dummy:/c"
+    assert loaded.uri_from_name("/dummy/d") == "dummy:/d"
+
+
+def test_loading_missing_browse_index_is_ignored(tmp_path):
+    uri_map = MpdUriMapper()
+
+    uri_map.load_browse_index(tmp_path / "missing" / "browse_index.sqlite3")
+
+    assert uri_map.uri_from_name("/dummy/a") is None
+
+
+def make_playlist_uri_map(*playlists):
+    core = mock.Mock()
+    core.playlists.as_list.return_value.get.return_value = [
+        Ref.playlist(uri=uri, name=name) for uri, name in playlists
+    ]
+    return MpdUriMapper(core), core
+
+
+def test_playlists_are_loaded_on_first_lookup():
+    uri_map, core = make_playlist_uri_map(("dummy:a", "a"), ("dummy:b", "a"))
+
+    assert uri_map.playlist_uri_from_name("a [2]") == "dummy:b"
+    assert uri_map.playlist_name_from_uri("dummy:a") == "a"
+    assert core.playlists.as_list.call_count == 1
+
+
+def test_unknown_playlist_names_do_not_reload_playlists():
+    uri_map, core = make_playlist_uri_map(("dummy:a", "a"))
+
+    assert uri_map.playlist_uri_from_name("b") is None
+    assert uri_map.playlist_uri_from_name("b") is None
+    assert core.playlists.as_list.call_count == 1
+
+
+def test_playlist_changed_adds_and_renames_playlists():
+    uri_map, core = make_playlist_uri_map(("dummy:a", "a"))
+    uri_map.playlist_uri_from_name("a")
+
+    uri_map.playlist_changed(Playlist(uri="dummy:b", name="b"))
+    uri_map.playlist_changed(Playlist(uri="dummy:a", name="c"))
+
+    assert uri_map.playlist_uri_from_name("a") is None
+    assert uri_map.playlist_uri_from_name("b") == "dummy:b"
+    assert uri_map.playlist_uri_from_name("c") == "dummy:a"
+    assert core.playlists.as_list.call_count == 1
+
+
+def test_playlist_changed_keeps_unique_name():
+    uri_map, core = make_playlist_uri_map(("dummy:a", "a"), ("dummy:b", "a"))
+    uri_map.playlist_uri_from_name("a")
+
+    uri_map.playlist_changed(Playlist(uri="dummy:b", name="a"))
+
+    assert uri_map.playlist_name_from_uri("dummy:b") == "a [2]"
+
+
+def test_playlist_deleted_removes_playlist():
+    uri_map, core = make_playlist_uri_map(("dummy:a", "a"))
+    uri_map.playlist_uri_from_name("a")
+
+    uri_map.playlist_deleted("dummy:a")
+
+    assert uri_map.playlist_uri_from_name("a") is None
+    assert core.playlists.as_list.call_count == 1
+
+
+def test_playlists_loaded_reloads_playlists_on_next_miss():
+    uri_map, core = make_playlist_uri_map(("dummy:a", "a"))
+    uri_map.playlist_uri_from_name("a")
+    core.playlists.as_list.return_value.get.return_value = [
+        Ref.playlist(uri="dummy:b", name="b")
+    ]
+
+    uri_map.playlists_loaded()
+
+    assert uri_map.playlist_uri_from_name("b") == "dummy:b"
+    assert uri_map.playlist_uri_from_name("a") is None
+    assert core.playlists.as_list.call_count == 2